@@ -0,0 +1,569 @@
+"""Read models kept in step with writes: view counts, rating aggregates, user
+stats, platform counters, the catalog watermark and tag usage.
+
+Importing this module registers the mapper event listeners; ``create_app``
+does that once.
+"""
+from datetime import datetime
+
+from sqlalchemy import event
+
+from extensions import db
+from models import (
+    RATING_VALUES, PlatformCounter, Request, Review, Skill, SkillTag, Tag, User, UserStats
+)
+from tags import parse_tags
+
+# Buffered skill view counts
+def flush_view_counts(app, counts):
+    """Apply ``{skill_id: delta}`` view increments for ``app`` in one transaction.
+
+    Called from the view counter's flush thread, outside any request.
+    """
+    skill = Skill.__table__
+    statement = skill.update().where(
+        skill.c.id == db.bindparam('skill_pk')
+    ).values(
+        view_count=skill.c.view_count + db.bindparam('delta'),
+        updated_at=skill.c.updated_at
+    )
+    with app.app_context():
+        with db.engine.begin() as connection:
+            connection.execute(statement, [
+                {'skill_pk': skill_id, 'delta': delta}
+                for skill_id, delta in sorted(counts.items())
+            ])
+
+# Rating aggregate maintenance
+def _apply_rating_delta(connection, model, row_id, rating, sign):
+    """Add (sign=1) or remove (sign=-1) one rating from a user/skill row.
+
+    Runs as an atomic ``col = col + n`` UPDATE on the flush connection, so the
+    aggregates commit or roll back together with the review itself.
+    """
+    if row_id is None or rating is None:
+        return
+    
+    table = model.__table__
+    values = {
+        'rating_sum': table.c.rating_sum + sign * rating,
+        'rating_count': table.c.rating_count + sign,
+        # Keep updated_at meaning "edited by the owner"
+        'updated_at': table.c.updated_at
+    }
+    if rating in RATING_VALUES:
+        column = f'rating_{rating}'
+        values[column] = table.c[column] + sign
+    
+    connection.execute(table.update().where(table.c.id == row_id).values(values))
+
+def _attribute_values(obj, keys, use_previous=False):
+    """Return the given attributes, optionally as they were before this flush."""
+    state = db.inspect(obj)
+    values = []
+    for key in keys:
+        history = state.attrs[key].history
+        if use_previous and history.deleted:
+            values.append(history.deleted[0])
+        else:
+            values.append(getattr(obj, key))
+    return tuple(values)
+
+def _review_targets(review, use_previous=False):
+    """Return (skill_id, reviewee_id, rating), optionally as they were before this flush."""
+    return _attribute_values(review, ('skill_id', 'reviewee_id', 'rating'), use_previous)
+
+@event.listens_for(Review, 'after_insert')
+def review_inserted(mapper, connection, review):
+    skill_id, reviewee_id, rating = _review_targets(review)
+    _apply_rating_delta(connection, Skill, skill_id, rating, 1)
+    _apply_rating_delta(connection, User, reviewee_id, rating, 1)
+
+@event.listens_for(Review, 'after_update')
+def review_updated(mapper, connection, review):
+    old = _review_targets(review, use_previous=True)
+    new = _review_targets(review)
+    if old == new:
+        return
+    
+    _apply_rating_delta(connection, Skill, old[0], old[2], -1)
+    _apply_rating_delta(connection, User, old[1], old[2], -1)
+    _apply_rating_delta(connection, Skill, new[0], new[2], 1)
+    _apply_rating_delta(connection, User, new[1], new[2], 1)
+
+@event.listens_for(Review, 'after_delete')
+def review_deleted(mapper, connection, review):
+    skill_id, reviewee_id, rating = _review_targets(review, use_previous=True)
+    _apply_rating_delta(connection, Skill, skill_id, rating, -1)
+    _apply_rating_delta(connection, User, reviewee_id, rating, -1)
+
+# Full rebuilds reset the target rows, then copy in GROUP BY results (UPDATE ... FROM),
+# so each source table is scanned once rather than probed per row and column
+def _reset_rows(table, key, ids, values):
+    statement = table.update().values(values)
+    if ids is not None:
+        statement = statement.where(key.in_(ids))
+    db.session.execute(statement)
+
+def _copy_grouped(table, key, grouped):
+    """Set ``table`` columns from a grouped subquery keyed by its ``row_id`` column."""
+    values = {column.name: column for column in grouped.c if column.name != 'row_id'}
+    if 'updated_at' in table.c:
+        values['updated_at'] = table.c.updated_at
+    db.session.execute(table.update().values(values).where(key == grouped.c.row_id))
+
+def rebuild_rating_aggregates(user_ids=None, skill_ids=None):
+    """Recompute stored rating aggregates from the review table.
+
+    With no ids every user and skill is rebuilt; otherwise only the given rows.
+    The caller is responsible for committing.
+    """
+    reviews = Review.__table__
+    rebuild_all = user_ids is None and skill_ids is None
+    for model, foreign_key, ids in (
+        (User, reviews.c.reviewee_id, user_ids),
+        (Skill, reviews.c.skill_id, skill_ids)
+    ):
+        if ids is None and not rebuild_all:
+            continue
+        
+        table = model.__table__
+        grouped = db.select(
+            foreign_key.label('row_id'),
+            db.func.sum(reviews.c.rating).label('rating_sum'),
+            db.func.count(reviews.c.id).label('rating_count'),
+            *[
+                db.func.sum(db.case((reviews.c.rating == value, 1), else_=0)).label(f'rating_{value}')
+                for value in RATING_VALUES
+            ]
+        ).group_by(foreign_key)
+        if ids is not None:
+            grouped = grouped.where(foreign_key.in_(ids))
+        reset = {'rating_sum': 0, 'rating_count': 0, 'updated_at': table.c.updated_at}
+        reset.update({f'rating_{value}': 0 for value in RATING_VALUES})
+        _reset_rows(table, table.c.id, ids, reset)
+        _copy_grouped(table, table.c.id, grouped.subquery())
+
+# User stats maintenance
+def _apply_user_stats_deltas(connection, contributions):
+    """Apply ``(target, column, delta)`` contributions to user_stats rows.
+
+    ``target`` is ``('user', user_id)`` or ``('skill', skill_id)``; the latter
+    resolves to the skill's owner inside the UPDATE. Contributions to the same
+    row are netted first, so e.g. a status change that doesn't touch
+    "completed" writes nothing.
+    """
+    deltas = {}
+    for target, column, delta in contributions:
+        if target[1] is None or not delta:
+            continue
+        columns = deltas.setdefault(target, {})
+        columns[column] = columns.get(column, 0) + delta
+    
+    table = UserStats.__table__
+    skills = Skill.__table__
+    for (kind, row_id), columns in deltas.items():
+        values = {column: table.c[column] + delta for column, delta in columns.items() if delta}
+        if not values:
+            continue
+        # Exactly one bump per write, even when a contribution targets 'version' itself
+        values['version'] = table.c.version + 1
+        
+        if kind == 'skill':
+            user_id = db.select(skills.c.owner_id).where(skills.c.id == row_id).scalar_subquery()
+        else:
+            user_id = row_id
+        connection.execute(table.update().where(table.c.user_id == user_id).values(values))
+
+def _skill_stats(skill, sign, use_previous=False):
+    owner_id, is_active = _attribute_values(skill, ('owner_id', 'is_active'), use_previous)
+    return [(('user', owner_id), 'skills_offered', sign * int(bool(is_active)))]
+
+def _request_stats(request_obj, sign, use_previous=False):
+    skill_id, requester_id, status = _attribute_values(
+        request_obj, ('skill_id', 'requester_id', 'status'), use_previous
+    )
+    return [
+        (('skill', skill_id), 'requests_received', sign),
+        (('user', requester_id), 'requests_sent', sign),
+        (('user', requester_id), 'completed_sessions', sign * int(status == 'completed'))
+    ]
+
+@event.listens_for(User, 'after_insert')
+def user_inserted(mapper, connection, user):
+    connection.execute(UserStats.__table__.insert().values(user_id=user.id))
+
+@event.listens_for(User, 'after_delete')
+def user_deleted(mapper, connection, user):
+    table = UserStats.__table__
+    connection.execute(table.delete().where(table.c.user_id == user.id))
+
+@event.listens_for(Skill, 'after_insert')
+def skill_inserted(mapper, connection, skill):
+    # The version bump covers the profile's skills_count, which includes inactive skills
+    touch = [(('user', skill.owner_id), 'version', 1)]
+    _apply_user_stats_deltas(connection, _skill_stats(skill, 1) + touch)
+
+@event.listens_for(Skill, 'after_update')
+def skill_updated(mapper, connection, skill):
+    _apply_user_stats_deltas(
+        connection, _skill_stats(skill, -1, use_previous=True) + _skill_stats(skill, 1)
+    )
+
+@event.listens_for(Skill, 'after_delete')
+def skill_deleted(mapper, connection, skill):
+    touch = [(('user', skill.owner_id), 'version', 1)]
+    _apply_user_stats_deltas(connection, _skill_stats(skill, -1, use_previous=True) + touch)
+
+@event.listens_for(Request, 'after_insert')
+def request_inserted(mapper, connection, request_obj):
+    _apply_user_stats_deltas(connection, _request_stats(request_obj, 1))
+
+@event.listens_for(Request, 'after_update')
+def request_updated(mapper, connection, request_obj):
+    _apply_user_stats_deltas(
+        connection, _request_stats(request_obj, -1, use_previous=True) + _request_stats(request_obj, 1)
+    )
+
+@event.listens_for(Request, 'after_delete')
+def request_deleted(mapper, connection, request_obj):
+    _apply_user_stats_deltas(connection, _request_stats(request_obj, -1, use_previous=True))
+
+def rebuild_user_stats(user_ids=None):
+    """Recompute user_stats rows from the skill and request tables.
+
+    Missing rows are created and rows of deleted users removed. With no ids
+    every user is rebuilt. The caller is responsible for committing.
+    """
+    table = UserStats.__table__
+    users = User.__table__
+    skills = Skill.__table__
+    requests = Request.__table__
+    
+    missing = db.select(users.c.id).where(
+        ~db.exists().where(table.c.user_id == users.c.id)
+    )
+    if user_ids is not None:
+        missing = missing.where(users.c.id.in_(user_ids))
+    db.session.execute(table.insert().from_select(['user_id'], missing))
+    if user_ids is None:
+        db.session.execute(table.delete().where(
+            ~db.exists().where(users.c.id == table.c.user_id)
+        ))
+    
+    _reset_rows(table, table.c.user_id, user_ids, {
+        'skills_offered': 0, 'requests_received': 0, 'requests_sent': 0, 'completed_sessions': 0,
+        'version': table.c.version + 1
+    })
+    
+    def grouped(user_column, from_, *columns, criteria=()):
+        query = db.select(user_column.label('row_id'), *columns).select_from(from_).where(
+            *criteria
+        ).group_by(user_column)
+        if user_ids is not None:
+            query = query.where(user_column.in_(user_ids))
+        _copy_grouped(table, table.c.user_id, query.subquery())
+    
+    grouped(
+        skills.c.owner_id, skills, db.func.count().label('skills_offered'),
+        criteria=[skills.c.is_active.is_(True)]
+    )
+    grouped(
+        skills.c.owner_id, requests.join(skills, skills.c.id == requests.c.skill_id),
+        db.func.count().label('requests_received')
+    )
+    grouped(
+        requests.c.requester_id, requests,
+        db.func.count().label('requests_sent'),
+        db.func.sum(db.case((requests.c.status == 'completed', 1), else_=0)).label('completed_sessions')
+    )
+
+# Platform counters
+COUNTER_NAMES = (
+    'users.total', 'users.active', 'skills.total', 'skills.active', 'requests.total'
+)
+# Written only by a full recount, so its absence means the counters were never seeded
+COUNTERS_SEEDED = 'counters.seeded'
+# Change markers, not counts: bumped on writes and never recounted
+WATERMARK_PREFIX = 'watermark:'
+CATALOG_WATERMARK = 'watermark:catalog'
+
+def _dialect_insert(dialect_name):
+    """``insert`` construct with ON CONFLICT support for this dialect, if it has one."""
+    if dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        return None
+    return insert
+
+def _apply_counter_deltas(connection, *contributions):
+    """Net ``{name: delta}`` dicts and add them to the counters with an upsert each."""
+    deltas = {}
+    for contribution in contributions:
+        for name, delta in contribution.items():
+            deltas[name] = deltas.get(name, 0) + delta
+    
+    table = PlatformCounter.__table__
+    insert = _dialect_insert(connection.dialect.name)
+    now = datetime.utcnow()
+    for name, delta in sorted(deltas.items()):
+        if not delta:
+            continue
+        if insert is not None:
+            statement = insert(table).values(name=name, value=delta, updated_at=now)
+            connection.execute(statement.on_conflict_do_update(
+                index_elements=[table.c.name], set_={'value': table.c.value + delta, 'updated_at': now}
+            ))
+            continue
+        result = connection.execute(
+            table.update().where(table.c.name == name).values(value=table.c.value + delta, updated_at=now)
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert().values(name=name, value=delta, updated_at=now))
+
+def _user_counters(user, sign, use_previous=False):
+    (is_active,) = _attribute_values(user, ('is_active',), use_previous)
+    return {'users.total': sign, 'users.active': sign * int(bool(is_active))}
+
+def _skill_counters(skill, sign, use_previous=False):
+    is_active, category = _attribute_values(skill, ('is_active', 'category'), use_previous)
+    return {
+        'skills.total': sign,
+        'skills.active': sign * int(bool(is_active)),
+        f'skills.category:{category}': sign
+    }
+
+def _request_counters(request_obj, sign, use_previous=False):
+    (status,) = _attribute_values(request_obj, ('status',), use_previous)
+    return {'requests.total': sign, f'requests.status:{status}': sign}
+
+def _install_counter_listeners(model, contributions):
+    @event.listens_for(model, 'after_insert')
+    def inserted(mapper, connection, target):
+        _apply_counter_deltas(connection, contributions(target, 1))
+    
+    @event.listens_for(model, 'after_update')
+    def updated(mapper, connection, target):
+        _apply_counter_deltas(
+            connection, contributions(target, -1, use_previous=True), contributions(target, 1)
+        )
+    
+    @event.listens_for(model, 'after_delete')
+    def deleted(mapper, connection, target):
+        _apply_counter_deltas(connection, contributions(target, -1, use_previous=True))
+
+_install_counter_listeners(User, _user_counters)
+_install_counter_listeners(Skill, _skill_counters)
+_install_counter_listeners(Request, _request_counters)
+
+# Catalog watermark: any change visible in skill listings, skill pages or categories
+CATALOG_USER_FIELDS = ('name', 'email', 'bio', 'role', 'avatar_url', 'is_active')
+
+def _bump_catalog_watermark(mapper, connection, target):
+    _apply_counter_deltas(connection, {CATALOG_WATERMARK: 1})
+
+for model, events in (
+    (Skill, ('after_insert', 'after_update', 'after_delete')),
+    # requests_count is part of every skill payload; status is not
+    (Request, ('after_insert', 'after_delete')),
+    (Review, ('after_insert', 'after_update', 'after_delete')),
+    (SkillTag, ('after_insert', 'after_delete'))
+):
+    for event_name in events:
+        event.listen(model, event_name, _bump_catalog_watermark)
+
+@event.listens_for(User, 'after_update')
+def user_catalog_fields_changed(mapper, connection, user):
+    # Owners are embedded in skill payloads; logins only touch last_login
+    state = db.inspect(user)
+    if any(state.attrs[key].history.has_changes() for key in CATALOG_USER_FIELDS):
+        _bump_catalog_watermark(mapper, connection, user)
+
+def compute_platform_counters():
+    """Count everything from the source tables (three grouped queries)."""
+    counters = dict.fromkeys(COUNTER_NAMES, 0)
+    counters[COUNTERS_SEEDED] = 1
+    
+    total, active = db.session.query(
+        db.func.count(User.id), db.func.sum(db.case((User.is_active.is_(True), 1), else_=0))
+    ).one()
+    counters['users.total'], counters['users.active'] = total, active or 0
+    
+    for category, is_active, count in db.session.query(
+        Skill.category, Skill.is_active, db.func.count(Skill.id)
+    ).group_by(Skill.category, Skill.is_active):
+        counters['skills.total'] += count
+        if is_active:
+            counters['skills.active'] += count
+        name = f'skills.category:{category}'
+        counters[name] = counters.get(name, 0) + count
+    
+    for status, count in db.session.query(Request.status, db.func.count(Request.id)).group_by(Request.status):
+        counters['requests.total'] += count
+        counters[f'requests.status:{status}'] = count
+    
+    return counters
+
+def read_platform_counters():
+    rows = db.session.query(PlatformCounter.name, PlatformCounter.value).filter(
+        ~PlatformCounter.name.startswith(WATERMARK_PREFIX)
+    )
+    return {name: value for name, value in rows}
+
+def diff_platform_counters():
+    """Return ``{name: (stored, expected)}`` for every counter that has drifted."""
+    stored = read_platform_counters()
+    expected = compute_platform_counters()
+    return {
+        name: (stored.get(name, 0), expected.get(name, 0))
+        for name in sorted(set(stored) | set(expected))
+        if stored.get(name, 0) != expected.get(name, 0)
+    }
+
+def repair_platform_counters():
+    """Replace every stored counter with a fresh count. The caller commits."""
+    table = PlatformCounter.__table__
+    # Deleting first takes the write lock, so no write can slip in between count and store
+    db.session.execute(table.delete().where(~table.c.name.startswith(WATERMARK_PREFIX)))
+    counters = compute_platform_counters()
+    now = datetime.utcnow()
+    db.session.execute(
+        table.insert(),
+        [{'name': name, 'value': value, 'updated_at': now} for name, value in counters.items()]
+    )
+
+def subtract_platform_counters(users=None, skills=None, requests=None):
+    """Take rows about to be bulk-deleted out of the counters.
+
+    Core DELETEs skip the mapper events, so callers pass the WHERE clause of
+    each delete here first (in the same transaction). Also bumps the catalog
+    watermark.
+    """
+    deltas = {}
+    
+    def subtract(name, count):
+        deltas[name] = deltas.get(name, 0) - count
+    
+    if users is not None:
+        for is_active, count in db.session.query(User.is_active, db.func.count(User.id)).filter(
+            users
+        ).group_by(User.is_active):
+            subtract('users.total', count)
+            if is_active:
+                subtract('users.active', count)
+    if skills is not None:
+        for category, is_active, count in db.session.query(
+            Skill.category, Skill.is_active, db.func.count(Skill.id)
+        ).filter(skills).group_by(Skill.category, Skill.is_active):
+            subtract('skills.total', count)
+            if is_active:
+                subtract('skills.active', count)
+            subtract(f'skills.category:{category}', count)
+    if requests is not None:
+        for status, count in db.session.query(Request.status, db.func.count(Request.id)).filter(
+            requests
+        ).group_by(Request.status):
+            subtract('requests.total', count)
+            subtract(f'requests.status:{status}', count)
+    
+    _apply_counter_deltas(db.session.connection(), deltas, {CATALOG_WATERMARK: 1})
+
+# Normalized tags
+def get_or_create_tags(names):
+    """Return Tag rows for ``names``, inserting the missing ones (safe against concurrent inserts)."""
+    if not names:
+        return []
+    
+    insert = _dialect_insert(db.engine.dialect.name)
+    if insert is not None:
+        db.session.execute(
+            insert(Tag.__table__).values([{'name': name} for name in names]).on_conflict_do_nothing(
+                index_elements=['name']
+            )
+        )
+        tags = Tag.query.filter(Tag.name.in_(names)).all()
+    else:
+        tags = Tag.query.filter(Tag.name.in_(names)).all()
+        known = {tag.name for tag in tags}
+        for name in names:
+            if name not in known:
+                tag = Tag(name=name)
+                db.session.add(tag)
+                tags.append(tag)
+    
+    by_name = {tag.name: tag for tag in tags}
+    return [by_name[name] for name in names]
+
+def sync_skill_tags(skill):
+    """Make ``skill.tag_links`` match the names parsed from ``skill.tags``.
+
+    Returns True if the set of tags changed.
+    """
+    names = parse_tags(skill.tags)
+    links = {link.tag.name: link for link in skill.tag_links}
+    
+    removed = [link for name, link in links.items() if name not in names]
+    added = [name for name in names if name not in links]
+    for link in removed:
+        skill.tag_links.remove(link)
+    for tag in get_or_create_tags(added):
+        skill.tag_links.append(SkillTag(tag=tag))
+    
+    return bool(removed or added)
+
+def _adjust_tag_usage(connection, tag_ids, delta):
+    """Add ``delta`` to the usage count of ``tag_ids`` (a list or subquery)."""
+    tags = Tag.__table__
+    connection.execute(
+        tags.update().where(tags.c.id.in_(tag_ids)).values(usage_count=tags.c.usage_count + delta)
+    )
+
+def _if_skill_active(skill_id, delta):
+    """``delta`` when the skill row is active and 0 otherwise, evaluated inside the UPDATE."""
+    skills = Skill.__table__
+    return db.func.coalesce(
+        db.select(db.case((skills.c.is_active.is_(True), delta), else_=0)).where(
+            skills.c.id == skill_id
+        ).scalar_subquery(),
+        0
+    )
+
+@event.listens_for(SkillTag, 'after_insert')
+def skill_tag_inserted(mapper, connection, link):
+    _adjust_tag_usage(connection, [link.tag_id], _if_skill_active(link.skill_id, 1))
+
+@event.listens_for(SkillTag, 'after_delete')
+def skill_tag_deleted(mapper, connection, link):
+    # Links are deleted before their skill, so the skill row is still there to check
+    _adjust_tag_usage(connection, [link.tag_id], _if_skill_active(link.skill_id, -1))
+
+@event.listens_for(Skill, 'after_update')
+def skill_activity_changed(mapper, connection, skill):
+    (was_active,) = _attribute_values(skill, ('is_active',), use_previous=True)
+    if bool(was_active) == bool(skill.is_active):
+        return
+    
+    # Links added or removed later in this flush see the new state through _if_skill_active
+    links = SkillTag.__table__
+    tag_ids = db.select(links.c.tag_id).where(links.c.skill_id == skill.id)
+    _adjust_tag_usage(connection, tag_ids, 1 if skill.is_active else -1)
+
+def rebuild_tag_usage(tag_ids=None):
+    """Recompute ``Tag.usage_count`` from the link table, for every tag or only ``tag_ids``.
+
+    The caller commits.
+    """
+    tags = Tag.__table__
+    links = SkillTag.__table__
+    skills = Skill.__table__
+    usage = db.select(
+        links.c.tag_id.label('row_id'), db.func.count().label('usage_count')
+    ).select_from(
+        links.join(skills, skills.c.id == links.c.skill_id)
+    ).where(skills.c.is_active.is_(True)).group_by(links.c.tag_id)
+    if tag_ids is not None:
+        usage = usage.where(links.c.tag_id.in_(tag_ids))
+    _reset_rows(tags, tags.c.id, tag_ids, {'usage_count': 0})
+    _copy_grouped(tags, tags.c.id, usage.subquery())
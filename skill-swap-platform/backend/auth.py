@@ -0,0 +1,85 @@
+"""JWT identity, token revocation and the admin guard."""
+import hmac
+from functools import wraps
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import create_access_token, get_jwt, verify_jwt_in_request
+
+from extensions import db, jwt, principal_cache
+from models import User
+
+# Authorization: identity claims in the JWT plus a short-lived principal cache
+
+def create_user_token(user):
+    """Issue an access token that carries the user's role, status and token version."""
+    return create_access_token(identity=user.id, additional_claims={
+        'role': user.role,
+        'active': bool(user.is_active),
+        'ver': user.token_version or 0
+    })
+
+def get_principal(user_id):
+    """Return ``(role, is_active, token_version)`` for a user, or None if they no longer exist.
+
+    Served from an in-process cache for PRINCIPAL_CACHE_TTL seconds, so verifying
+    a token normally costs no database round-trip.
+    """
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        row = db.session.query(User.role, User.is_active, User.token_version).filter(
+            User.id == user_id
+        ).first()
+        principal = tuple(row) if row else ()
+        principal_cache.set(user_id, principal)
+    return principal or None
+
+def revoke_user_tokens(user):
+    """Invalidate all tokens issued to ``user`` (takes effect when the caller commits).
+
+    Other worker processes notice within PRINCIPAL_CACHE_TTL seconds.
+    """
+    user.token_version = (user.token_version or 0) + 1
+    principal_cache.delete(user.id)
+
+@jwt.token_in_blocklist_loader
+def is_token_revoked(jwt_header, jwt_payload):
+    principal = get_principal(jwt_payload['sub'])
+    if principal is None:
+        return True
+    role, is_active, token_version = principal
+    # Tokens issued before these claims existed count as version 0 with the current role.
+    # They carry no admin claim, so admin_required still refuses them.
+    # A changed role also retires the token, so a demoted admin loses the admin claim
+    return (
+        not is_active
+        or jwt_payload.get('ver', 0) != token_version
+        or jwt_payload.get('role', role) != role
+    )
+
+@jwt.revoked_token_loader
+def revoked_token_response(jwt_header, jwt_payload):
+    return jsonify({'error': 'Token has been revoked'}), 401
+
+def admin_required(f):
+    """Require a valid token whose signed claims say the user is an active admin."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        verify_jwt_in_request()
+        claims = get_jwt()
+        if claims.get('role') != 'admin' or not claims.get('active'):
+            return jsonify({'error': 'Unauthorized'}), 403
+        return f(*args, **kwargs)
+    return decorated_function
+
+def metrics_access_required(f):
+    """Like ``admin_required``, but also accept ``Authorization: Bearer <METRICS_TOKEN>`` when it is set."""
+    admin_view = admin_required(f)
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        token = current_app.config['METRICS_TOKEN']
+        if token and hmac.compare_digest(
+            request.headers.get('Authorization', '').encode(), f'Bearer {token}'.encode()
+        ):
+            return f(*args, **kwargs)
+        return admin_view(*args, **kwargs)
+    return decorated_function
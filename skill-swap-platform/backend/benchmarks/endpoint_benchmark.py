@@ -0,0 +1,362 @@
+"""Latency and throughput of the main API endpoints, checked against a stored baseline.
+
+Seeds a throwaway SQLite database with ``synthetic.generate`` (or reuses one
+given with ``--database``), starts a local server and drives each scenario over
+real HTTP with concurrent keep-alive clients:
+
+- ``browse``: catalog pages, with and without category/level filters
+- ``search``: full-text skill search, plain and with facet counts
+- ``skill detail``: single skills, spread over the catalog
+- ``dashboard``, ``request inbox``: signed in as the users with the busiest inboxes
+- ``admin users``, ``admin skills``, ``admin requests``, ``admin stats``: signed in as the admin
+
+For every scenario it reports requests/s, p50/p95/p99 latency and the number of
+SQL statements per request (counted in-process with the Flask test client). The
+response cache is turned off, so every request does its real work.
+
+Results are compared with the baseline (``benchmarks/baseline.json``) recorded on
+the same dataset: more queries per request, a slower p95 or lower throughput
+beyond ``--tolerance``, or any failed request is a regression, and the script
+exits with status 1. Latency is only compared for scenarios with at least
+``MIN_SAMPLES`` timed requests in both runs; raise ``--duration`` for slow ones. ``--save-baseline`` records the current run instead.
+
+Usage:
+    python benchmarks/endpoint_benchmark.py --duration 10 --concurrency 8
+    python benchmarks/endpoint_benchmark.py --scenario browse --scenario search
+    python benchmarks/endpoint_benchmark.py --save-baseline
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from serving_benchmark import free_port, start_server, stop_server
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+SEARCH_TERMS = ('python', 'guitar piano', 'pyth', 'public speaking', 'kubernetes docker', 'spanish')
+# Fewer timed requests than this make p95 and throughput too noisy to compare
+MIN_SAMPLES = 20
+SCENARIOS = (
+    'browse', 'search', 'skill detail', 'dashboard', 'request inbox',
+    'admin users', 'admin skills', 'admin requests', 'admin stats',
+)
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def login(port, email, password):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    connection.request(
+        'POST', '/api/auth/login', body=json.dumps({'email': email, 'password': password}),
+        headers={'Content-Type': 'application/json'}
+    )
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    if response.status != 200:
+        raise RuntimeError(f'Login as {email} failed: {response.status} {body[:200]!r}')
+    return json.loads(body)['access_token']
+
+
+def pick_targets(db, seed, user_count=5, skill_count=50):
+    """Ids and emails the scenarios are built from: skills to open and users to sign in as."""
+    from models import Skill, User, UserStats
+    rng = random.Random(seed)
+    skill_ids = db.session.execute(
+        db.select(Skill.id).where(Skill.is_active.is_(True)).order_by(Skill.id).limit(skill_count * 20)
+    ).scalars().all()
+    emails = db.session.execute(
+        db.select(User.email).join(UserStats, UserStats.user_id == User.id).where(
+            User.is_active.is_(True), User.role == 'user'
+        ).order_by(UserStats.requests_received.desc(), User.id).limit(user_count)
+    ).scalars().all()
+    if not skill_ids or not emails:
+        raise RuntimeError('The database needs active skills and users; seed it with init_db.py first')
+    return rng.sample(skill_ids, min(skill_count, len(skill_ids))), emails
+
+
+def build_scenarios(skill_ids, user_tokens, admin_token):
+    """``{scenario: [(path, headers), ...]}``; clients cycle through each scenario's requests."""
+    def bearer(token):
+        return {'Authorization': f'Bearer {token}'}
+
+    users = [bearer(token) for token in user_tokens]
+    admin = bearer(admin_token)
+    return {
+        'browse': [(f'/api/skills?page={page}&per_page=20', {}) for page in range(1, 6)] + [
+            ('/api/skills?category=programming&per_page=20', {}),
+            ('/api/skills?category=music&level=beginner&per_page=20', {}),
+        ],
+        'search': [(f'/api/skills?search={term}&per_page=20', {}) for term in SEARCH_TERMS] + [
+            (f'/api/skills/search?search={term}&per_page=20', {}) for term in SEARCH_TERMS[:3]
+        ],
+        'skill detail': [(f'/api/skills/{skill_id}', {}) for skill_id in skill_ids],
+        'dashboard': [('/api/stats/dashboard', headers) for headers in users],
+        'request inbox': [
+            (f'/api/requests/{box}?cursor=&per_page=20', headers)
+            for headers in users for box in ('received', 'sent')
+        ],
+        'admin users': [
+            ('/api/admin/users?page=1&per_page=50', admin),
+            ('/api/admin/users?cursor=&per_page=50', admin),
+        ],
+        'admin skills': [('/api/admin/skills', admin)],
+        'admin requests': [('/api/admin/requests', admin)],
+        'admin stats': [('/api/admin/stats', admin)],
+    }
+
+
+def count_queries(app, db, requests):
+    """Average number of SQL statements per request, run in-process with the test client.
+
+    Every request is sent once before counting, so warm caches (e.g. the
+    principal cache) give the same count on every run.
+    """
+    from sqlalchemy import event
+    from database import all_engines
+
+    client = app.test_client()
+    statements = [0]
+
+    def send_all():
+        for path, headers in requests:
+            response = client.get(path, headers=headers)
+            response.get_data()  # drains streamed responses
+            if response.status_code != 200:
+                raise RuntimeError(f'GET {path} returned {response.status_code}')
+
+    def count(*args):
+        statements[0] += 1
+
+    send_all()
+    with app.app_context():
+        engines = all_engines(db)
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', count)
+    try:
+        send_all()
+    finally:
+        for engine in engines:
+            event.remove(engine, 'before_cursor_execute', count)
+    return statements[0] / len(requests)
+
+
+def drive(port, requests, duration, concurrency):
+    """Cycle through ``requests`` from ``concurrency`` keep-alive clients for ``duration`` seconds.
+
+    Returns the sorted latencies in ms, the elapsed time and the number of failed requests.
+    """
+    latencies = []
+    failures = [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client(offset):
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        local = []
+        failed = 0
+        index = offset
+        while time.monotonic() < stop_at:
+            path, headers = requests[index % len(requests)]
+            index += 1
+            started = time.perf_counter()
+            try:
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    failed += 1
+                if response.getheader('Connection', '').lower() == 'close':
+                    connection.close()
+            except (OSError, http.client.HTTPException):
+                # A recycled worker closed the connection; retry on a new one
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+                continue
+            local.append((time.perf_counter() - started) * 1000)
+        connection.close()
+        with lock:
+            latencies.extend(local)
+            failures[0] += failed
+
+    threads = [threading.Thread(target=client, args=(offset,)) for offset in range(concurrency)]
+    began = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    return latencies, time.monotonic() - began, failures[0]
+
+
+def summarize(latencies, elapsed, failures, queries):
+    return {
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50), 2),
+        'p95_ms': round(percentile(latencies, 0.95), 2),
+        'p99_ms': round(percentile(latencies, 0.99), 2),
+        'queries': round(queries, 2),
+        'requests': len(latencies),
+        'errors': failures,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Regression messages for ``results`` against ``baseline`` scenarios."""
+    problems = []
+    for name, current in results.items():
+        if current['errors']:
+            problems.append(f"{name}: {current['errors']} failed requests")
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if current['queries'] > previous['queries'] + 0.01:
+            problems.append(f"{name}: {previous['queries']:g} -> {current['queries']:g} queries per request")
+        if min(current['requests'], previous['requests']) < MIN_SAMPLES:
+            continue
+        if current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            problems.append(f"{name}: p95 {previous['p95_ms']:.1f} -> {current['p95_ms']:.1f} ms")
+        if current['rps'] < previous['rps'] / (1 + tolerance):
+            problems.append(f"{name}: throughput {previous['rps']:.0f} -> {current['rps']:.0f} req/s")
+    return problems
+
+
+def print_results(results, baseline):
+    print(f"{'scenario':<15} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'queries':>8} {'errors':>7} {'p95 vs base':>12}")
+    for name, result in results.items():
+        change = ''
+        if name in baseline and baseline[name]['p95_ms']:
+            change = f"{(result['p95_ms'] / baseline[name]['p95_ms'] - 1) * 100:+.0f}%"
+        print(f"{name:<15} {result['rps']:>8.0f} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+              f"{result['p99_ms']:>8.1f} {result['queries']:>8g} {result['errors']:>7} {change:>12}")
+
+
+def main():
+    from synthetic import Volumes
+    defaults = Volumes(users=2000, skills=10000, requests=40000, reviews=10000)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database', help='benchmark an existing SQLite file instead of seeding one')
+    parser.add_argument('--users', type=int, default=defaults.users)
+    parser.add_argument('--skills', type=int, default=defaults.skills)
+    parser.add_argument('--requests', type=int, default=defaults.requests)
+    parser.add_argument('--reviews', type=int, default=defaults.reviews)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS, help='run only these (repeatable)')
+    parser.add_argument('--duration', type=float, default=10, help='seconds per scenario')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--server', choices=('gunicorn', 'dev'), default='gunicorn')
+    parser.add_argument('--workers', type=int, default=(os.cpu_count() or 1) * 2 + 1)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='record this run as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='allowed p95 increase / throughput drop before failing (0.5 = 50%%)')
+    args = parser.parse_args()
+
+    database_path = args.database
+    if database_path is None:
+        handle, database_path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+    env = dict(
+        os.environ,
+        DATABASE_URL=f'sqlite:///{os.path.abspath(database_path)}',
+        RESPONSE_CACHE_URL='none',
+        GUNICORN_ACCESS_LOG='',
+        GUNICORN_LOG_LEVEL='warning',
+    )
+    os.environ.update(DATABASE_URL=env['DATABASE_URL'], RESPONSE_CACHE_URL='none')
+
+    import logging
+    logging.disable(logging.INFO)
+    from app import create_app
+    from extensions import db
+    from models import Request, Review, Skill, User
+    from schema import create_schema
+    from synthetic import ADMIN_EMAIL, ADMIN_PASSWORD, SYNTHETIC_PASSWORD, generate
+    app = create_app()
+
+    try:
+        with app.app_context():
+            if args.database is None:
+                create_schema(db)
+                volumes = Volumes(args.users, args.skills, args.requests, args.reviews)
+                generate(volumes, seed=args.seed, log=lambda message: None)
+            dataset = {
+                model.__tablename__: db.session.query(model).count()
+                for model in (User, Skill, Request, Review)
+            }
+            skill_ids, emails = pick_targets(db, args.seed)
+
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                recorded = json.load(f)
+            if recorded['dataset'] == dataset:
+                baseline = recorded['scenarios']
+            elif not args.save_baseline:
+                sys.exit(f"Baseline {args.baseline} was recorded on {recorded['dataset']}, not {dataset}; "
+                         "rerun with the same dataset or record a new one with --save-baseline")
+
+        names = args.scenario or SCENARIOS
+        print(f"{dataset['user']:,} users, {dataset['skill']:,} skills, {dataset['request']:,} requests, "
+              f"{dataset['review']:,} reviews; {args.concurrency} clients, {args.duration:.0f}s per scenario, "
+              f"{args.server} server, {os.cpu_count()} CPU(s)\n")
+
+        port = free_port()
+        process = start_server(args.server, port, env, args.workers, args.threads)
+        try:
+            user_tokens = [login(port, email, SYNTHETIC_PASSWORD) for email in emails]
+            admin_token = login(port, ADMIN_EMAIL, ADMIN_PASSWORD)
+            scenarios = build_scenarios(skill_ids, user_tokens, admin_token)
+            results = {}
+            for name in names:
+                requests = scenarios[name]
+                queries = count_queries(app, db, requests)
+                drive(port, requests, min(1, args.duration), args.concurrency)  # warm-up
+                results[name] = summarize(*drive(port, requests, args.duration, args.concurrency), queries)
+        finally:
+            stop_server(process)
+    finally:
+        if args.database is None:
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(database_path + suffix):
+                    os.remove(database_path + suffix)
+
+    print_results(results, baseline)
+    if args.save_baseline:
+        # Scenarios left out of this run keep their recorded numbers
+        scenarios = dict(baseline, **results)
+        with open(args.baseline, 'w') as f:
+            json.dump({'dataset': dataset, 'concurrency': args.concurrency, 'scenarios': scenarios}, f, indent=2)
+            f.write('\n')
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    problems = compare(results, baseline, args.tolerance)
+    if problems:
+        print('\nRegressions:')
+        for problem in problems:
+            print(f'  - {problem}')
+        sys.exit(1)
+    if baseline:
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""Compare FTS5 skill search with the legacy ILIKE scan.
+
+Builds a throwaway SQLite database with N skills and times GET /api/skills?search=...
+through the Flask test client with full-text search switched on and off. The response
+cache is off, so every request runs the search.
+
+Usage:
+    python benchmarks/search_benchmark.py --skills 100000 --repeat 20
+"""
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORDS = (
+    'python react guitar piano spanish french design figma marketing seo cooking baking '
+    'photography video editing writing poetry chess yoga fitness running drawing painting '
+    'javascript typescript django flask rust golang kubernetes docker excel finance '
+    'statistics calculus physics chemistry biology history philosophy public speaking '
+    'negotiation leadership knitting sewing gardening woodworking welding pottery'
+).split()
+CATEGORIES = ['programming', 'design', 'marketing', 'languages', 'music', 'cooking', 'other']
+LEVELS = ['beginner', 'intermediate', 'advanced', 'expert']
+QUERIES = ['python', 'guitar piano', 'pyth', 'public speaking', 'kubernetes docker', 'zzzz']
+
+
+def build_vocabulary(rng, size=5000):
+    """Synthetic filler words with the real skill words near the head, weighted by a Zipf curve."""
+    syllables = ['ka', 'lo', 'mi', 'ren', 'tor', 'vu', 'sel', 'dra', 'pim', 'quo', 'zan', 'eth']
+    filler = []
+    seen = set(WORDS)
+    while len(filler) + len(WORDS) < size:
+        word = ''.join(rng.choices(syllables, k=rng.randint(2, 4)))
+        if word not in seen:
+            seen.add(word)
+            filler.append(word)
+    vocabulary = filler[:20] + list(WORDS) + filler[20:]
+    weights = itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary)))
+    return vocabulary, list(weights)
+
+
+def populate(db, User, Skill, count, seed):
+    rng = random.Random(seed)
+    vocabulary, weights = build_vocabulary(rng)
+    db.session.execute(db.insert(User), [{
+        'name': 'Benchmark User', 'email': 'bench@example.com', 'password_hash': 'x'
+    }])
+    owner_id = db.session.execute(db.select(User.id)).scalar()
+    batch = []
+    for _ in range(count):
+        batch.append({
+            'name': ' '.join(rng.choices(vocabulary, cum_weights=weights, k=3)).title(),
+            'description': ' '.join(rng.choices(vocabulary, cum_weights=weights, k=25)),
+            'category': rng.choice(CATEGORIES),
+            'level': rng.choice(LEVELS),
+            'tags': ', '.join(rng.choices(vocabulary, cum_weights=weights, k=3)),
+            'owner_id': owner_id,
+        })
+        if len(batch) == 5000:
+            db.session.execute(db.insert(Skill), batch)
+            batch = []
+    if batch:
+        db.session.execute(db.insert(Skill), batch)
+    db.session.commit()
+
+
+def time_queries(client, repeat):
+    results = {}
+    for query in QUERIES:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            response = client.get('/api/skills', query_string={'search': query})
+            timings.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200, response.data
+        results[query] = (statistics.median(timings), response.get_json()['total'])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--skills', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    # Every repeat has to run the query; the ILIKE pass would also fill the cache for the FTS5 pass
+    os.environ['RESPONSE_CACHE_URL'] = 'none'
+
+    import logging
+    logging.disable(logging.INFO)
+    from app import create_app
+    from extensions import db
+    from models import User, Skill
+    app = create_app()
+
+    try:
+        with app.app_context():
+            db.create_all()
+            started = time.perf_counter()
+            populate(db, User, Skill, args.skills, args.seed)
+            print(f"Inserted {args.skills} skills in {time.perf_counter() - started:.1f}s\n")
+
+            client = app.test_client()
+            app.config['SKILL_SEARCH_FTS'] = False
+            like = time_queries(client, args.repeat)
+            app.config['SKILL_SEARCH_FTS'] = True
+            fts = time_queries(client, args.repeat)
+
+        print(f"{'query':<20} {'ILIKE ms':>10} {'FTS5 ms':>10} {'speedup':>8}   matches (ILIKE / FTS5)")
+        for query in QUERIES:
+            like_ms, like_total = like[query]
+            fts_ms, fts_total = fts[query]
+            print(f"{query:<20} {like_ms:>10.1f} {fts_ms:>10.1f} {like_ms / fts_ms:>7.1f}x   {like_total} / {fts_total}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+"""Compare request throughput of the development server with gunicorn.
+
+Builds a throwaway SQLite database, then starts each server in turn on a local
+port and drives it over real HTTP with concurrent keep-alive clients:
+
+- ``dev``: ``app.run(debug=True)``, i.e. what ``python app.py`` used to run
+  (the reloader is left out, since it doesn't take part in serving requests)
+- ``gunicorn``: ``gunicorn -c gunicorn.conf.py wsgi:app`` with the worker and
+  thread counts given on the command line
+
+The response cache is turned off, so every request does its real work.
+
+Usage:
+    python benchmarks/serving_benchmark.py --skills 5000 --duration 10 --concurrency 16
+"""
+import argparse
+import http.client
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+ENDPOINTS = [
+    ('health', '/api/health'),
+    ('skill list', '/api/skills?per_page=20'),
+    ('skill detail', '/api/skills/{skill_id}'),
+]
+DEV_SERVER = (
+    "from app import create_app; "
+    "create_app().run(debug=True, use_reloader=False, host='127.0.0.1', port={port})"
+)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind, port, env, workers, threads):
+    if kind == 'dev':
+        command = [sys.executable, '-c', DEV_SERVER.format(port=port)]
+    else:
+        command = [
+            sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app',
+            '--bind', f'127.0.0.1:{port}', '--workers', str(workers), '--threads', str(threads),
+        ]
+    process = subprocess.Popen(
+        command, cwd=BACKEND_DIR, env=env, start_new_session=True,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/api/health')
+            if connection.getresponse().status == 200:
+                return process
+        except OSError:
+            time.sleep(0.2)
+    stop_server(process)
+    raise RuntimeError(f'{kind} server did not start')
+
+
+def stop_server(process):
+    os.killpg(process.pid, signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+
+
+def drive(port, path, duration, concurrency):
+    """Hammer ``path`` from ``concurrency`` threads.
+
+    Returns (requests/s, p50 ms, p95 ms, errors, reconnects). A reconnect is a
+    kept-alive connection closed by the server (e.g. a recycled worker); the
+    request is retried on a new connection, as HTTP clients do.
+    """
+    latencies = []
+    errors = [0, 0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client():
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        local = []
+        failed = reconnects = 0
+        while time.monotonic() < stop_at:
+            started = time.perf_counter()
+            try:
+                connection.request('GET', path)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    failed += 1
+                if response.getheader('Connection', '').lower() == 'close':
+                    connection.close()
+            except (OSError, http.client.HTTPException):
+                reconnects += 1
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                continue
+            local.append((time.perf_counter() - started) * 1000)
+        connection.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+            errors[1] += reconnects
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    began = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - began
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0
+    median = statistics.median(latencies) if latencies else 0
+    return len(latencies) / elapsed, median, p95, errors[0], errors[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--skills', type=int, default=5000)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=(os.cpu_count() or 1) * 2 + 1)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    handle, database_path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    env = dict(
+        os.environ,
+        DATABASE_URL=f'sqlite:///{database_path}',
+        RESPONSE_CACHE_URL='none',
+        GUNICORN_ACCESS_LOG='',
+        GUNICORN_LOG_LEVEL='warning',
+    )
+    os.environ['DATABASE_URL'] = env['DATABASE_URL']
+
+    import logging
+    logging.disable(logging.INFO)
+    from app import create_app
+    from extensions import db
+    from models import User, Skill
+    from schema import create_schema
+    app = create_app()
+    from search_benchmark import populate
+
+    try:
+        with app.app_context():
+            create_schema(db)
+            populate(db, User, Skill, args.skills, args.seed)
+            skill_id = db.session.execute(db.select(Skill.id).limit(1)).scalar()
+        print(f"{args.skills} skills, {args.concurrency} concurrent clients, {args.duration:.0f}s per endpoint, "
+              f"{os.cpu_count()} CPU(s); gunicorn: {args.workers} workers x {args.threads} threads\n")
+
+        results = {}
+        for kind in ('dev', 'gunicorn'):
+            port = free_port()
+            process = start_server(kind, port, env, args.workers, args.threads)
+            try:
+                for name, template in ENDPOINTS:
+                    path = template.format(skill_id=skill_id)
+                    drive(port, path, min(2, args.duration), args.concurrency)  # warm-up
+                    results[kind, name] = drive(port, path, args.duration, args.concurrency)
+            finally:
+                stop_server(process)
+
+        print(f"{'endpoint':<14} {'server':<9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7} {'reconn':>7}")
+        for name, _ in ENDPOINTS:
+            for kind in ('dev', 'gunicorn'):
+                rate, median, p95, errors, reconnects = results[kind, name]
+                print(f"{name:<14} {kind:<9} {rate:>8.0f} {median:>8.1f} {p95:>8.1f} {errors:>7} {reconnects:>7}")
+            speedup = results['gunicorn', name][0] / results['dev', name][0]
+            print(f"{'':<14} {'speedup':<9} {speedup:>7.1f}x")
+    finally:
+        os.remove(database_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""Response cache with pluggable backends.
+
+``LocalCache`` is an in-process TTL + LRU store and the default. ``RedisCache``
+shares entries between worker processes and needs the optional ``redis``
+package. Both store raw bytes.
+
+Invalidation is by namespace: every key embeds the namespace's current
+generation number, and invalidating a namespace bumps the generation, so old
+entries simply stop being addressed and age out. This works the same on a
+shared backend, where deleting by prefix would not be atomic.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class LocalCache:
+    """Thread-safe in-process cache with per-entry TTL and LRU eviction."""
+
+    def __init__(self, max_entries=1024, default_ttl=30):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        # Generation counters live apart from entries so LRU eviction can't reset them
+        self._counters = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (ttl or self.default_ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def get_counter(self, key):
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def incr(self, key):
+        with self._lock:
+            value = self._counters.get(key, 0) + 1
+            self._counters[key] = value
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'backend': 'memory', 'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+class RedisCache:
+    """Cache shared by all workers, backed by Redis (``pip install redis``)."""
+
+    def __init__(self, url, default_ttl=30, prefix='skillswap:cache:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('RESPONSE_CACHE_URL points at Redis but the "redis" package is not installed')
+        self.client = redis.Redis.from_url(url)
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, value, ex=ttl or self.default_ttl)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def get_counter(self, key):
+        value = self.client.get(self.prefix + key)
+        return int(value) if value is not None else 0
+
+    def incr(self, key):
+        return self.client.incr(self.prefix + key)
+
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + '*'):
+            self.client.delete(key)
+
+    def stats(self):
+        return {'backend': 'redis'}
+
+
+def create_backend(url, max_entries=1024, default_ttl=30):
+    """Build a backend from ``RESPONSE_CACHE_URL``; returns None when caching is off."""
+    if not url or url == 'none':
+        return None
+    if url.startswith('memory://'):
+        return LocalCache(max_entries=max_entries, default_ttl=default_ttl)
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisCache(url, default_ttl=default_ttl)
+    raise ValueError(f'Unsupported RESPONSE_CACHE_URL: {url}')
+
+
+def normalize_params(args, allowed, defaults=None, case_insensitive=()):
+    """Canonical, order-independent form of the query parameters that affect a response.
+
+    Only ``allowed`` parameters are kept, so unrelated or junk parameters can't
+    fragment the cache. Whitespace is collapsed, ``case_insensitive`` values are
+    lower-cased, and values equal to their default are dropped.
+    """
+    defaults = defaults or {}
+    parts = []
+    for name in sorted(allowed):
+        for value in sorted(args.getlist(name)):
+            value = ' '.join(value.split())
+            if name in case_insensitive:
+                value = value.lower()
+            if value == defaults.get(name):
+                continue
+            parts.append(f'{name}={value}')
+    return '&'.join(parts)
+
+
+class ResponseCache:
+    """Namespaced cache of response bodies on top of a backend."""
+
+    def __init__(self, backend, ttl=30):
+        self.backend = backend
+        self.ttl = ttl
+
+    @property
+    def enabled(self):
+        return self.backend is not None
+
+    def make_key(self, namespace, path, params, version=None):
+        generation = self.backend.get_counter(f'generation:{namespace}')
+        key = f'{namespace}:{generation}:{path}?{params}'
+        return f'{key}#{version}' if version else key
+
+    def get(self, key):
+        return self.backend.get(key)
+
+    def set(self, key, body):
+        self.backend.set(key, body, ttl=self.ttl)
+
+    def invalidate(self, *namespaces):
+        if not self.enabled:
+            return
+        for namespace in namespaces:
+            self.backend.incr(f'generation:{namespace}')
+
+    def stats(self):
+        return self.backend.stats() if self.enabled else {'backend': 'none'}
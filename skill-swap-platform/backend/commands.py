@@ -0,0 +1,100 @@
+"""Maintenance CLI commands (``flask --app app <command>``)."""
+import signal
+
+import click
+from flask import Blueprint, current_app
+
+import search as skill_search
+from aggregates import (
+    COUNTERS_SEEDED, diff_platform_counters, rebuild_rating_aggregates, rebuild_tag_usage,
+    rebuild_user_stats, repair_platform_counters, sync_skill_tags
+)
+from extensions import db
+from jobs import Worker, run_worker_processes
+from models import Skill, SkillTag
+from schema import upgrade_schema
+
+maintenance = Blueprint('maintenance', __name__, cli_group=None)
+
+@maintenance.cli.command('rebuild-search-index')
+def rebuild_search_index_command():
+    """Create the skill full-text index if needed and repopulate it."""
+    if skill_search.rebuild(db.session):
+        db.session.commit()
+        print("✅ Skill search index rebuilt")
+    else:
+        print("⚠️ Full-text search needs SQLite with FTS5; using LIKE search instead")
+
+@maintenance.cli.command('rebuild-ratings')
+def rebuild_ratings_command():
+    """Recompute rating sums, counts and histograms for every user and skill."""
+    rebuild_rating_aggregates()
+    db.session.commit()
+    print("✅ Rating aggregates rebuilt")
+
+@maintenance.cli.command('rebuild-user-stats')
+@click.option('--user-id', 'user_ids', type=int, multiple=True, help='Only rebuild these users (repeatable).')
+def rebuild_user_stats_command(user_ids):
+    """Recompute dashboard counters for every user, or only the given ones."""
+    rebuild_user_stats(list(user_ids) or None)
+    db.session.commit()
+    print("✅ User stats rebuilt")
+
+@maintenance.cli.command('check-counters')
+@click.option('--repair', is_flag=True, help='Overwrite drifted counters with fresh counts.')
+def check_counters_command(repair):
+    """Compare the platform counters with real counts, and optionally fix them."""
+    drift = diff_platform_counters()
+    for name, (stored, expected) in drift.items():
+        if name == COUNTERS_SEEDED:
+            print("counters have never been fully recounted")
+        else:
+            print(f"{name}: stored {stored}, expected {expected}")
+    
+    if not drift:
+        print("✅ Platform counters are consistent")
+    elif repair:
+        repair_platform_counters()
+        db.session.commit()
+        print(f"✅ Repaired {len(drift)} counters")
+    else:
+        db.session.rollback()
+        raise SystemExit(1)
+
+@maintenance.cli.command('migrate-tags')
+@click.option('--batch-size', default=500, show_default=True, help='Skills parsed per transaction.')
+def migrate_tags_command(batch_size):
+    """Apply pending migrations, then re-link every skill's tags from its tags string."""
+    upgrade_schema(db)
+    last_id = 0
+    migrated = 0
+    while True:
+        skills = Skill.query.options(
+            db.selectinload(Skill.tag_links).joinedload(SkillTag.tag)
+        ).filter(Skill.id > last_id).order_by(Skill.id).limit(batch_size).all()
+        if not skills:
+            break
+        for skill in skills:
+            sync_skill_tags(skill)
+        db.session.commit()
+        last_id = skills[-1].id
+        migrated += len(skills)
+        db.session.expunge_all()
+    
+    rebuild_tag_usage()
+    db.session.commit()
+    print(f"✅ Tags migrated for {migrated} skills")
+
+@maintenance.cli.command('jobs-worker')
+@click.option('--processes', default=1, show_default=True, help='Worker processes to run.')
+@click.option('--burst', is_flag=True, help='Exit once no job is due instead of waiting for more.')
+def jobs_worker_command(processes, burst):
+    """Run queued background jobs (user deletions, rebuilds) until stopped."""
+    if processes > 1:
+        run_worker_processes(processes, burst)
+        return
+    
+    worker = Worker(current_app._get_current_object())
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run(burst)
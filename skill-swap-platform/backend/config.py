@@ -0,0 +1,78 @@
+"""Application settings.
+
+``from_env()`` is read by ``create_app`` after ``.env`` has been loaded, so
+nothing here touches the environment at import time. ``TESTING`` holds the
+overrides test fixtures pass to ``create_app``.
+"""
+import os
+from datetime import timedelta
+
+
+def _env_bool(name, default):
+    return os.getenv(name, default).lower() in ('1', 'true', 'yes')
+
+
+def from_env():
+    """Config mapping built from the current environment."""
+    return {
+        'SECRET_KEY': os.getenv('SECRET_KEY', 'fallback-secret-key'),
+        'JWT_SECRET_KEY': os.getenv('JWT_SECRET_KEY', 'fallback-jwt-key'),
+        'SQLALCHEMY_DATABASE_URI': os.getenv('DATABASE_URL', 'sqlite:///skillswap.db'),
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        # Replica for @read_only views; SQLite files get a local read pool instead
+        'DATABASE_READ_URL': os.getenv('DATABASE_READ_URL', ''),
+        'SQLITE_READ_POOL': _env_bool('SQLITE_READ_POOL', 'true'),
+        'DB_POOL_SIZE': int(os.getenv('DB_POOL_SIZE', 5)),
+        'DB_READ_POOL_SIZE': int(os.getenv('DB_READ_POOL_SIZE', os.getenv('DB_POOL_SIZE', 5))),
+        'DB_MAX_OVERFLOW': int(os.getenv('DB_MAX_OVERFLOW', 10)),
+        'DB_POOL_TIMEOUT': float(os.getenv('DB_POOL_TIMEOUT', 30)),
+        'DB_POOL_RECYCLE': int(os.getenv('DB_POOL_RECYCLE', 1800)),
+        'SQLITE_JOURNAL_MODE': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+        'SQLITE_SYNCHRONOUS': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'SQLITE_BUSY_TIMEOUT': int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000)),
+        'SQLITE_MMAP_SIZE': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+        'SQLITE_CACHE_SIZE_KB': int(os.getenv('SQLITE_CACHE_SIZE_KB', 64 * 1024)),
+        'JWT_ACCESS_TOKEN_EXPIRES': timedelta(hours=24),
+        'CORS_ORIGINS': ['http://localhost:3000'],
+        'PRINCIPAL_CACHE_TTL': int(os.getenv('PRINCIPAL_CACHE_TTL', 30)),
+        'BCRYPT_LOG_ROUNDS': int(os.getenv('BCRYPT_LOG_ROUNDS', 12)),
+        'PASSWORD_HASH_WORKERS': int(os.getenv('PASSWORD_HASH_WORKERS', min(4, os.cpu_count() or 1))),
+        'PASSWORD_HASH_QUEUE': int(os.getenv('PASSWORD_HASH_QUEUE', 16)),
+        'PASSWORD_HASH_TIMEOUT': float(os.getenv('PASSWORD_HASH_TIMEOUT', 10)),
+        'SKILL_SEARCH_FTS': _env_bool('SKILL_SEARCH_FTS', 'true'),
+        'STREAM_BATCH_SIZE': int(os.getenv('STREAM_BATCH_SIZE', 500)),
+        'VIEW_COUNT_FLUSH_INTERVAL': float(os.getenv('VIEW_COUNT_FLUSH_INTERVAL', 5)),
+        'VIEW_COUNT_MAX_PENDING': int(os.getenv('VIEW_COUNT_MAX_PENDING', 1000)),
+        'RESPONSE_CACHE_URL': os.getenv('RESPONSE_CACHE_URL', 'memory://'),
+        'RESPONSE_CACHE_TTL': int(os.getenv('RESPONSE_CACHE_TTL', 30)),
+        'RESPONSE_CACHE_MAX_ENTRIES': int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 1024)),
+        # Per-route latency, query, DB time and size histograms at /api/admin/metrics
+        'METRICS_ENABLED': _env_bool('METRICS_ENABLED', 'true'),
+        # Bearer token a scraper can use there instead of an admin JWT; empty disables it
+        'METRICS_TOKEN': os.getenv('METRICS_TOKEN', ''),
+        # Development/CI: flag repeated statements and enforce @query_budget per request
+        'QUERY_AUDIT': _env_bool('QUERY_AUDIT', 'false'),
+        'QUERY_AUDIT_REPEAT_THRESHOLD': int(os.getenv('QUERY_AUDIT_REPEAT_THRESHOLD', 5)),
+        # Log statements slower than this with their query plan; 0 disables
+        'SLOW_QUERY_MS': float(os.getenv('SLOW_QUERY_MS', 0)),
+        # Background jobs (jobs.py): claim lease, attempts per job, first retry delay, idle poll
+        'JOB_VISIBILITY_TIMEOUT': float(os.getenv('JOB_VISIBILITY_TIMEOUT', 300)),
+        'JOB_MAX_ATTEMPTS': int(os.getenv('JOB_MAX_ATTEMPTS', 5)),
+        'JOB_RETRY_BACKOFF': float(os.getenv('JOB_RETRY_BACKOFF', 10)),
+        'JOB_POLL_INTERVAL': float(os.getenv('JOB_POLL_INTERVAL', 1)),
+        # Skills deleted per transaction by a user deletion
+        'JOB_BATCH_SIZE': int(os.getenv('JOB_BATCH_SIZE', 500)),
+    }
+
+
+# Private in-memory database per app, cheap password hashing
+TESTING = {
+    'TESTING': True,
+    'SECRET_KEY': 'test-secret-key',
+    'JWT_SECRET_KEY': 'test-jwt-key',
+    'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+    'BCRYPT_LOG_ROUNDS': 4,
+    'PASSWORD_HASH_WORKERS': 2,
+    'RESPONSE_CACHE_URL': 'memory://',
+    'QUERY_AUDIT': True,
+}
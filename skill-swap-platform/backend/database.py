@@ -0,0 +1,141 @@
+"""Engine configuration: SQLite pragmas, pool sizing and read/write routing.
+
+``configure_database(app)`` runs before ``db.init_app`` and fills in
+SQLALCHEMY_ENGINE_OPTIONS; ``init_engines(app, db)`` runs after it, creating
+the read engine and installing the pragmas. Views decorated with
+``@read_only`` send their queries to the read engine, which is a replica
+(DATABASE_READ_URL) or, for a SQLite file, a second pool of ``query_only``
+connections to the same file. Flushes and DML always go to the primary.
+"""
+from functools import wraps
+
+from flask import current_app, g
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+
+READ_ENGINE_KEY = 'skillswap.read_engine'
+
+
+def _is_sqlite(url):
+    return url.get_backend_name() == 'sqlite'
+
+
+def _is_memory_sqlite(url):
+    return _is_sqlite(url) and (
+        url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory'
+    )
+
+
+def engine_options(config, url, pool_size):
+    """Pool options for ``url``; in-memory SQLite keeps its single static connection."""
+    if _is_memory_sqlite(url):
+        return {}
+    options = {
+        'pool_size': pool_size,
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+    }
+    if not _is_sqlite(url):
+        # Server connections can be dropped by the server or a proxy while idle
+        options['pool_recycle'] = config['DB_POOL_RECYCLE']
+        options['pool_pre_ping'] = True
+    return options
+
+
+def configure_database(app):
+    """Derive the primary engine's pool options from the app config."""
+    config = app.config
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(config, url, config['DB_POOL_SIZE']))
+
+
+def sqlite_pragmas(config, read_only=False):
+    """``(name, value)`` pairs run on every new SQLite connection, in order."""
+    pragmas = [
+        ('busy_timeout', config['SQLITE_BUSY_TIMEOUT']),
+        ('journal_mode', config['SQLITE_JOURNAL_MODE']),
+        ('synchronous', config['SQLITE_SYNCHRONOUS']),
+        ('mmap_size', config['SQLITE_MMAP_SIZE']),
+        # Negative values are KiB rather than pages
+        ('cache_size', -config['SQLITE_CACHE_SIZE_KB']),
+    ]
+    if read_only:
+        pragmas.append(('query_only', 'ON'))
+    return pragmas
+
+
+def _pragma_listener(pragmas):
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+    return set_pragmas
+
+
+def _install_pragmas(config, engine, read_only=False):
+    if engine.dialect.name == 'sqlite':
+        event.listen(engine, 'connect', _pragma_listener(sqlite_pragmas(config, read_only)))
+
+
+def init_engines(app, db):
+    """Install the SQLite pragmas and create the read engine, if there is one.
+
+    Engines connect lazily, so this does no I/O.
+    """
+    config = app.config
+    with app.app_context():
+        primary = db.engine
+    _install_pragmas(config, primary)
+
+    # The primary's URL, not the config's: relative SQLite paths are already resolved
+    read_url = config['DATABASE_READ_URL']
+    if not read_url and config['SQLITE_READ_POOL'] and _is_sqlite(primary.url) \
+            and not _is_memory_sqlite(primary.url):
+        read_url = primary.url
+    if read_url:
+        url = make_url(read_url)
+        engine = create_engine(url, **engine_options(config, url, config['DB_READ_POOL_SIZE']))
+        _install_pragmas(config, engine, read_only=True)
+        app.extensions[READ_ENGINE_KEY] = engine
+
+
+def get_read_engine():
+    return current_app.extensions.get(READ_ENGINE_KEY)
+
+
+def all_engines(db):
+    """The current app's engines, including the read engine."""
+    engines = list(db.engines.values())
+    if get_read_engine() is not None:
+        engines.append(get_read_engine())
+    return engines
+
+
+# Read/write routing
+def read_only(f):
+    """Run the view's queries on the read engine, when one is configured.
+
+    For views that never write through the session. Replicas may lag the
+    primary, so use it where slightly stale data is fine.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g.db_read_only = True
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and not getattr(clause, 'is_dml', False)
+            and g.get('db_read_only')
+        ):
+            engine = get_read_engine()
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
@@ -0,0 +1,79 @@
+"""Extensions and per-app services, created unbound and attached in ``create_app``.
+
+``db``, ``migrate``, ``bcrypt``, ``jwt`` and ``cors`` are the usual Flask
+extensions. The services (response cache, principal cache, view counter,
+password pool, metrics registry, query auditor, search index state) hold state, so every app gets
+its own instances. The module-level names are proxies to the current app's
+instance, so call sites work unchanged inside a request or app context.
+"""
+from flask import current_app
+from flask_bcrypt import Bcrypt
+from flask_cors import CORS
+from flask_jwt_extended import JWTManager
+from flask_migrate import Migrate
+from flask_sqlalchemy import SQLAlchemy
+from werkzeug.local import LocalProxy
+
+from cache import LocalCache, ResponseCache, create_backend
+from database import RoutingSession
+from metrics import MetricsRegistry
+from passwords import BoundedExecutor
+from query_audit import QueryAuditor
+from view_counter import ViewCountBuffer
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+migrate = Migrate()
+bcrypt = Bcrypt()
+jwt = JWTManager()
+cors = CORS()
+
+SERVICES_KEY = 'skillswap'
+
+
+def _service(name):
+    return LocalProxy(lambda: current_app.extensions[SERVICES_KEY][name])
+
+
+response_cache = _service('response_cache')
+principal_cache = _service('principal_cache')
+view_counter = _service('view_counter')
+password_executor = _service('password_executor')
+metrics_registry = _service('metrics')
+query_auditor = _service('query_audit')
+search_index_state = _service('search_index')
+
+
+def init_services(app, flush_view_counts):
+    """Create the stateful services for ``app`` from its config.
+
+    ``flush_view_counts(app, counts)`` writes buffered views for this app.
+    Nothing here starts threads or opens connections; that happens on first use.
+    """
+    config = app.config
+    app.extensions[SERVICES_KEY] = {
+        'response_cache': ResponseCache(
+            create_backend(
+                config['RESPONSE_CACHE_URL'],
+                max_entries=config['RESPONSE_CACHE_MAX_ENTRIES'],
+                default_ttl=config['RESPONSE_CACHE_TTL']
+            ),
+            ttl=config['RESPONSE_CACHE_TTL']
+        ),
+        # Authorization: role, status and token version per user id
+        'principal_cache': LocalCache(max_entries=10000, default_ttl=config['PRINCIPAL_CACHE_TTL']),
+        'view_counter': ViewCountBuffer(
+            lambda counts: flush_view_counts(app, counts),
+            flush_interval=config['VIEW_COUNT_FLUSH_INTERVAL'],
+            max_pending=config['VIEW_COUNT_MAX_PENDING']
+        ),
+        # Password hashing runs on a bounded pool so login bursts can't starve other requests
+        'password_executor': BoundedExecutor(
+            max_workers=config['PASSWORD_HASH_WORKERS'],
+            max_queue=config['PASSWORD_HASH_QUEUE'],
+            timeout=config['PASSWORD_HASH_TIMEOUT']
+        ),
+        'metrics': MetricsRegistry(),
+        'query_audit': QueryAuditor(),
+        # Engine URL -> whether the full-text index exists, so searches don't probe sqlite_master
+        'search_index': {},
+    }
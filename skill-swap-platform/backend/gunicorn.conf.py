@@ -0,0 +1,58 @@
+"""Gunicorn settings for production.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Every setting can be overridden from the environment (see README, "Production
+Server"). The app is imported once in the master (``preload_app``) and the
+workers are forked from it. They share the imported code copy-on-write and start
+without re-importing anything.
+"""
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '5000')}")
+
+# Processes x threads: threads overlap I/O waits (SQLite, bcrypt releases the GIL),
+# processes use the other cores.
+workers = _env_int('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1)
+worker_class = 'gthread'
+threads = _env_int('GUNICORN_THREADS', 4)
+preload_app = True
+
+# Recycle workers after a jittered number of requests so slow leaks can't accumulate,
+# without every worker restarting at the same moment
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+# A worker stuck on one request longer than this is killed and replaced
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+# Heartbeat files on tmpfs, so a slow disk can't make healthy workers look hung
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-') or None
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    # Connections opened in the master while preloading must not be shared with children
+    from database import all_engines
+    from extensions import db
+    with server.app.wsgi().app_context():
+        for engine in all_engines(db):
+            engine.dispose(close=False)
+
+
+def worker_exit(server, worker):
+    # Write buffered view counts before a recycled or stopped worker goes away
+    from extensions import SERVICES_KEY
+    worker.wsgi.extensions[SERVICES_KEY]['view_counter'].close()
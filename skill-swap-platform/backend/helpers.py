@@ -0,0 +1,452 @@
+"""Shared view helpers: error handling, response caching, serialization,
+streaming, conditional GET, skill listing filters and queued-job responses."""
+import logging
+from datetime import timezone
+from functools import wraps
+
+from flask import Response, current_app, g, jsonify, request, stream_with_context, url_for
+from flask_jwt_extended import get_jwt_identity
+
+import search as skill_search
+from aggregates import CATALOG_WATERMARK
+from cache import normalize_params
+from extensions import db, response_cache
+from models import PlatformCounter, Request, Skill, SkillTag, Tag, User, UserStats
+from pagination import InvalidCursor, paginate_keyset
+from passwords import PasswordHasherBusy
+from serializers import InvalidFieldSelection, build_field_tree, parse_expand, parse_list_arg, project
+from streaming import NDJSON_MIMETYPE, json_array_chunks, ndjson_chunks, wants_ndjson
+from tags import parse_tags
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for client supplied page sizes
+MAX_PER_PAGE = 100
+
+# Enhanced error handling decorator
+def handle_errors(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        try:
+            return f(*args, **kwargs)
+        except PasswordHasherBusy as e:
+            logger.warning(f"Rejected {f.__name__}: {str(e)}")
+            db.session.rollback()
+            return jsonify({'error': 'Server is busy, please try again shortly'}), 503, {'Retry-After': '1'}
+        except Exception as e:
+            logger.error(f"Error in {f.__name__}: {str(e)}")
+            db.session.rollback()
+            return jsonify({'error': 'An unexpected error occurred'}), 500
+    return decorated_function
+
+def cached_response(namespace, params=(), defaults=None, case_insensitive=()):
+    """Cache successful anonymous GET responses under ``namespace``.
+
+    The key is the path plus the normalized ``params``; requests carrying an
+    Authorization header always bypass the cache. Writes invalidate whole
+    namespaces through ``response_cache.invalidate``. Under ``conditional`` the
+    key also carries the validated ETag, so a body is only ever served with
+    the ETag it was built under, whether or not the write invalidated the
+    namespace.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not response_cache.enabled or 'Authorization' in request.headers:
+                return f(*args, **kwargs)
+            
+            key = response_cache.make_key(
+                namespace,
+                request.path,
+                normalize_params(request.args, params, defaults, case_insensitive),
+                g.get('validated_etag')
+            )
+            body = response_cache.get(key)
+            if body is not None:
+                response = Response(body, mimetype='application/json')
+                response.headers['X-Cache'] = 'HIT'
+                return response
+            
+            response = current_app.make_response(f(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                response_cache.set(key, response.get_data())
+                response.headers['X-Cache'] = 'MISS'
+            return response
+        return decorated_function
+    return decorator
+
+# Batched serialization helpers
+def get_pagination_args():
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = request.args.get('per_page', 20, type=int)
+    return page, min(max(per_page, 1), MAX_PER_PAGE)
+
+def get_bool_arg(name, default=False):
+    value = request.args.get(name)
+    if value is None:
+        return default
+    return value.lower() in ('1', 'true', 'yes')
+
+def cursor_page(query, model, per_page):
+    """Keyset page for ``?cursor=`` requests (an empty cursor means the first page).
+
+    Returns ``(items, meta)`` where meta carries ``next_cursor`` and, only when
+    ``include_total=true`` is passed, the exact ``total``. Raises InvalidCursor.
+    """
+    items, next_cursor = paginate_keyset(
+        query, model.created_at, model.id, request.args.get('cursor'), per_page
+    )
+    meta = {'next_cursor': next_cursor, 'per_page': per_page}
+    if get_bool_arg('include_total'):
+        meta['total'] = query.order_by(None).count()
+    return items, meta
+
+def get_skill_stats(skill_ids):
+    """Return request/review counts and average rating keyed by skill id.
+
+    Everything comes from a single query (a grouped request-count subquery
+    joined to the stored rating aggregates), so the cost does not depend on
+    how many skills are being serialized.
+    """
+    if not skill_ids:
+        return {}
+    
+    request_counts = db.session.query(
+        Request.skill_id.label('skill_id'),
+        db.func.count(Request.id).label('requests_count')
+    ).filter(Request.skill_id.in_(skill_ids)).group_by(Request.skill_id).subquery()
+    
+    rows = db.session.query(
+        Skill.id,
+        request_counts.c.requests_count,
+        Skill.rating_count,
+        Skill.rating_sum
+    ).outerjoin(
+        request_counts, request_counts.c.skill_id == Skill.id
+    ).filter(Skill.id.in_(skill_ids)).all()
+    
+    return {
+        skill_id: {
+            'requests_count': requests_count or 0,
+            'average_rating': rating_sum / rating_count if rating_count else 0,
+            'reviews_count': rating_count
+        }
+        for skill_id, requests_count, rating_count, rating_sum in rows
+    }
+
+def serialize_skills(skills):
+    """Serialize skills with stats without issuing per-row queries.
+
+    Callers should load the skills with ``joinedload(Skill.owner)`` so the
+    embedded owner does not trigger a lazy load per skill.
+    """
+    stats = get_skill_stats([skill.id for skill in skills])
+    empty = {'requests_count': 0, 'average_rating': 0, 'reviews_count': 0}
+    return [skill.to_dict(stats=stats.get(skill.id, empty)) for skill in skills]
+
+def get_user_list_stats(user_ids):
+    """Return skill and sent-request counts keyed by user id, in one query."""
+    if not user_ids:
+        return {}
+    
+    def count(model, column):
+        return db.session.query(db.func.count(model.id)).filter(column == User.id).scalar_subquery()
+    
+    rows = db.session.query(
+        User.id, count(Skill, Skill.owner_id), count(Request, Request.requester_id)
+    ).filter(User.id.in_(user_ids)).all()
+    return {
+        user_id: {'skills_count': skills_count, 'requests_sent_count': requests_sent_count}
+        for user_id, skills_count, requests_sent_count in rows
+    }
+
+def serialize_users(users):
+    """Serialize users with their admin stats without issuing per-row queries."""
+    stats = get_user_list_stats([user.id for user in users])
+    return [user.to_dict(include_stats=True, stats=stats.get(user.id)) for user in users]
+
+# Streaming list responses
+def iter_batches(query, model, serialize, batch_size=None):
+    """Walk ``query`` newest first in keyset batches and yield serialized batches.
+
+    Every batch is a separate indexed range query on ``(created_at, id)``, and
+    the session is cleared after each one, so memory use depends on the batch
+    size rather than on the size of the table and no read cursor is held open
+    for the lifetime of the response.
+    """
+    batch_size = batch_size or current_app.config['STREAM_BATCH_SIZE']
+    cursor = None
+    while True:
+        rows, cursor = paginate_keyset(query, model.created_at, model.id, cursor, batch_size)
+        if rows:
+            yield serialize(rows)
+        db.session.expunge_all()
+        if cursor is None:
+            break
+
+def stream_list(query, model, serialize):
+    """Stream ``query`` as a JSON array, or as NDJSON when the client asks for it."""
+    batches = iter_batches(query, model, serialize)
+    if wants_ndjson(request):
+        chunks, mimetype = ndjson_chunks(batches, current_app.json.dumps), NDJSON_MIMETYPE
+    else:
+        chunks, mimetype = json_array_chunks(batches, current_app.json.dumps), 'application/json'
+    
+    def generate():
+        try:
+            yield from chunks
+        except Exception as e:
+            # Headers are already sent, so the best we can do is log and cut the stream
+            logger.error(f"Error while streaming {request.path}: {str(e)}")
+            db.session.rollback()
+    
+    return Response(stream_with_context(generate()), mimetype=mimetype)
+
+def serialize_requests(requests):
+    return [req.to_dict() for req in requests]
+
+# Conditional GET
+def get_catalog_watermark():
+    """``(version, changed_at)`` of the catalog watermark; ``(0, None)`` before the first write."""
+    row = db.session.query(PlatformCounter.value, PlatformCounter.updated_at).filter_by(
+        name=CATALOG_WATERMARK
+    ).first()
+    return tuple(row) if row else (0, None)
+
+def catalog_validators(prefix):
+    def validators(*args, **kwargs):
+        version, changed_at = get_catalog_watermark()
+        key = '-'.join([prefix] + [str(value) for value in kwargs.values()])
+        return f'{key}-{version}', changed_at
+    return validators
+
+def is_not_modified(etag, last_modified=None):
+    """Evaluate If-None-Match (which wins when present) or If-Modified-Since."""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        last_modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+        return last_modified <= request.if_modified_since
+    return False
+
+def conditional(validators, private=False, on_not_modified=None):
+    """Answer conditional GETs with 304 before the view runs.
+
+    ``validators(*args, **kwargs)`` does a cheap read and returns
+    ``(etag, last_modified)``; ``last_modified`` may be None, and returning None
+    skips validation. ETags are weak because view counts and login times are
+    left out of them.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            validated = validators(*args, **kwargs)
+            if validated is None:
+                return f(*args, **kwargs)
+            
+            etag, last_modified = validated
+            g.validated_etag = etag
+            if is_not_modified(etag, last_modified):
+                if on_not_modified:
+                    on_not_modified(*args, **kwargs)
+                response = Response(status=304)
+            else:
+                response = current_app.make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            
+            response.set_etag(etag, weak=True)
+            if last_modified:
+                response.last_modified = last_modified.replace(tzinfo=timezone.utc)
+            response.headers['Cache-Control'] = 'private, no-cache' if private else 'no-cache'
+            return response
+        return decorated_function
+    return decorator
+
+def profile_validators():
+    user_id = get_jwt_identity()
+    row = db.session.query(
+        User.updated_at, User.rating_count, User.rating_sum, UserStats.version
+    ).outerjoin(UserStats, UserStats.user_id == User.id).filter(User.id == user_id).first()
+    if row is None:
+        return None
+    
+    updated_at, rating_count, rating_sum, stats_version = row
+    # Ratings and counters change without touching updated_at, so only the ETag covers them
+    stamp = f'{updated_at:%Y%m%d%H%M%S%f}' if updated_at else '0'
+    return f'profile-{user_id}-{stamp}-{rating_count}-{rating_sum}-{stats_version or 0}', None
+
+# Skill listing filters and facets
+SKILL_FILTER_PARAMS = ('category', 'level', 'search', 'tag')
+SKILL_FILTER_DEFAULTS = {'page': '1', 'per_page': '20', 'category': 'all', 'level': 'all'}
+
+def get_skill_filters():
+    """Parse the skill listing filters from the query string.
+
+    Returns ``(filters, matches)``. ``filters`` maps each of SKILL_FILTER_PARAMS
+    to its WHERE clauses, so facet counts can leave one filter out. ``matches``
+    is the full-text (skill_id, rank) subquery when the search uses the index.
+    """
+    filters = {name: [] for name in SKILL_FILTER_PARAMS}
+    matches = None
+    
+    category = request.args.get('category')
+    if category and category != 'all':
+        filters['category'].append(Skill.category == category)
+    
+    level = request.args.get('level')
+    if level and level != 'all':
+        filters['level'].append(Skill.level == level)
+    
+    # Exact tag match; repeating ?tag= requires every tag
+    for tag_name in parse_tags(request.args.getlist('tag')):
+        tagged = db.select(SkillTag.skill_id).join(Tag).where(Tag.name == tag_name)
+        filters['tag'].append(Skill.id.in_(tagged))
+    
+    search_text = request.args.get('search', '').strip()
+    match_query = search_text and skill_search.build_match_query(search_text)
+    use_index = current_app.config['SKILL_SEARCH_FTS'] and skill_search.is_available(db.session)
+    if match_query and use_index:
+        matches = skill_search.matching_skills(match_query)
+        filters['search'].append(Skill.id.in_(db.select(matches.c.skill_id)))
+    elif search_text:
+        search_term = f"%{search_text}%"
+        filters['search'].append(
+            db.or_(
+                Skill.name.ilike(search_term),
+                Skill.description.ilike(search_term),
+                Skill.tags.ilike(search_term)
+            )
+        )
+    
+    return filters, matches
+
+def skill_listing_query(filters, matches):
+    """Active skills matching ``filters``, with owners, plus the ORDER BY to use."""
+    query = Skill.query.options(db.joinedload(Skill.owner)).filter_by(is_active=True)
+    order_by = [Skill.created_at.desc()]
+    
+    for name, clauses in filters.items():
+        if name == 'search' and matches is not None:
+            # Join instead, so results can be ordered by relevance
+            query = query.join(matches, matches.c.skill_id == Skill.id)
+            order_by.insert(0, matches.c.rank)
+        else:
+            query = query.filter(*clauses)
+    
+    return query, order_by
+
+def paginated_skills(query, order_by, page, per_page):
+    skills = query.order_by(*order_by).paginate(
+        page=page, per_page=per_page, error_out=False
+    )
+    return {
+        'skills': serialize_skills(skills.items),
+        'total': skills.total,
+        'pages': skills.pages,
+        'current_page': page
+    }
+
+def get_skill_facets(filters, tag_limit):
+    """Category, level and tag counts for active skills under ``filters``.
+
+    Category and level counts ignore their own filter, so every alternative
+    value still shows how many results picking it would give. Tags combine
+    with AND, so tag counts keep the selected tags and show how far adding
+    one more narrows the results. Three grouped queries in total.
+    """
+    def criteria(exclude=None):
+        return [Skill.is_active.is_(True)] + [
+            clause for name, clauses in filters.items() if name != exclude for clause in clauses
+        ]
+    
+    def grouped(column, exclude):
+        count = db.func.count(Skill.id)
+        rows = db.session.query(column, count).filter(*criteria(exclude)).group_by(column).order_by(
+            count.desc(), column
+        )
+        return [{'name': name, 'count': value} for name, value in rows]
+    
+    tag_count = db.func.count(SkillTag.skill_id)
+    tag_rows = db.session.query(Tag.name, tag_count).join(
+        SkillTag, SkillTag.tag_id == Tag.id
+    ).join(Skill, Skill.id == SkillTag.skill_id).filter(*criteria()).group_by(Tag.name).order_by(
+        tag_count.desc(), Tag.name
+    ).limit(tag_limit)
+    
+    return {
+        'category': grouped(Skill.category, 'category'),
+        'level': grouped(Skill.level, 'level'),
+        'tags': [{'name': name, 'count': value} for name, value in tag_rows]
+    }
+
+# Request list serialization
+def request_list_options():
+    """Eager loads for Request lists so embedded skills and users cost no extra queries."""
+    return (
+        db.joinedload(Request.skill).joinedload(Skill.owner),
+        db.joinedload(Request.requester)
+    )
+
+def request_list_response(requests, meta=None):
+    """Serialize a list of requests honouring ``?expand=``, ``?fields=`` and ``?sideload=users``.
+
+    Without parameters the response is the historical array of fully embedded
+    requests. With ``sideload=users`` each user appears once in a ``users``
+    table keyed by id and requests refer to them through ``requester_id`` and
+    ``skill.owner_id``, so the body becomes ``{"requests": [...], "users": {...}}``.
+    Passing pagination ``meta`` (cursor mode) also switches to the object form.
+    """
+    try:
+        expand = parse_expand(request.args, Request.EXPANSIONS, Request.EXPANSIONS)
+    except InvalidFieldSelection as e:
+        return jsonify({'error': str(e)}), 400
+    fields = parse_list_arg(request.args, 'fields')
+    field_tree = build_field_tree(fields) if fields else None
+    sideload = 'users' in (parse_list_arg(request.args, 'sideload') or ())
+    
+    if not sideload:
+        items = project([req.to_dict(expand) for req in requests], field_tree)
+        if meta is None:
+            return jsonify(items), 200
+        return jsonify({'requests': items, **meta}), 200
+    
+    users = {}
+    for req in requests:
+        if 'requester' in expand and req.requester:
+            users.setdefault(req.requester.id, req.requester)
+        if 'skill.owner' in expand and req.skill and req.skill.owner:
+            users.setdefault(req.skill.owner.id, req.skill.owner)
+    
+    inline = {path for path in expand if path not in ('requester', 'skill.owner')}
+    return jsonify({
+        'requests': project([req.to_dict(inline) for req in requests], field_tree),
+        'users': {user_id: user.to_dict() for user_id, user in users.items()},
+        **(meta or {})
+    }), 200
+
+def request_inbox_response(query):
+    """Apply ``?status=`` and, when ``?cursor=`` is given, keyset pagination to a request list."""
+    status = request.args.get('status')
+    if status and status != 'all':
+        query = query.filter(Request.status == status)
+    
+    if 'cursor' not in request.args:
+        return request_list_response(query.order_by(Request.created_at.desc(), Request.id.desc()).all())
+    
+    _, per_page = get_pagination_args()
+    try:
+        requests, meta = cursor_page(query, Request, per_page)
+    except InvalidCursor:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    return request_list_response(requests, meta)
+
+# Queued jobs
+def job_accepted(job, message):
+    """202 response for work handed to a background job, pointing at its status."""
+    status_url = url_for('api.admin_get_job', id=job.id)
+    return jsonify({
+        'message': message,
+        'job': job.to_dict(),
+        'status_url': status_url
+    }), 202, {'Location': status_url}
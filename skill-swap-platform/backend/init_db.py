@@ -1,15 +1,39 @@
-from app import app, db, User, Skill, Request
-from datetime import datetime
+"""Create the database with a handful of sample rows, or a large synthetic dataset.
+
+    python init_db.py
+    python init_db.py --synthetic --users 1000000 --skills 5000000 --requests 20000000 --reviews 5000000
+"""
+import argparse
+
+from app import create_app
+from extensions import db
+from models import User, Skill, Request
+from schema import create_schema
+from synthetic import SYNTHETIC_PASSWORD, Volumes, generate
+
+def reset_tables():
+    # Drop all tables and recreate them
+    print("🔄 Dropping existing tables...")
+    db.drop_all()
+    
+    # Create all tables at the latest migration
+    print("🔧 Creating database tables...")
+    create_schema(db)
+
+def init_synthetic_database(volumes, seed, batch_size):
+    app = create_app()
+    with app.app_context():
+        reset_tables()
+        print(f"🔧 Generating {volumes.users:,} users, {volumes.skills:,} skills, "
+              f"{volumes.requests:,} requests and up to {volumes.reviews:,} reviews (seed {seed})...")
+        generate(volumes, seed=seed, batch_size=batch_size)
+        print("\n📋 Log in as admin@skillswap.com / admin123, or as "
+              f"user2@example.com ... user{volumes.users}@example.com / {SYNTHETIC_PASSWORD}")
 
 def init_database():
+    app = create_app()
     with app.app_context():
-        # Drop all tables and recreate them
-        print("🔄 Dropping existing tables...")
-        db.drop_all()
-        
-        # Create all tables
-        print("🔧 Creating database tables...")
-        db.create_all()
+        reset_tables()
         
         # Create admin user
         admin_email = 'admin@skillswap.com'
@@ -171,4 +195,21 @@ def init_database():
         print("\n🚀 You can now start the backend server with: python app.py")
 
 if __name__ == '__main__':
-    init_database()
\ No newline at end of file
+    defaults = Volumes()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--synthetic', action='store_true', help='generate a large reproducible dataset')
+    parser.add_argument('--users', type=int, default=defaults.users)
+    parser.add_argument('--skills', type=int, default=defaults.skills)
+    parser.add_argument('--requests', type=int, default=defaults.requests)
+    parser.add_argument('--reviews', type=int, default=defaults.reviews)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--batch-size', type=int, default=10000)
+    args = parser.parse_args()
+    
+    if args.synthetic:
+        init_synthetic_database(
+            Volumes(users=args.users, skills=args.skills, requests=args.requests, reviews=args.reviews),
+            args.seed, args.batch_size
+        )
+    else:
+        init_database()
\ No newline at end of file
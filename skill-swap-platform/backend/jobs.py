@@ -0,0 +1,254 @@
+"""Durable background jobs, queued in the application database.
+
+An endpoint calls ``enqueue`` in the same transaction as the change that needs
+the work and answers 202 with the job's status URL. ``flask --app app
+jobs-worker`` processes claim jobs and run them. The ``job`` table is the queue,
+so there is no broker to run and a job is never lost once its transaction
+commits.
+
+- Claiming is an UPDATE guarded by the row's current state, so two workers
+  can't take the same job.
+- A claim is a lease of JOB_VISIBILITY_TIMEOUT seconds. If a worker dies
+  mid-job, the lease runs out and the job becomes claimable again. Long
+  handlers call ``heartbeat()`` between batches to renew it.
+- A failed attempt is retried after JOB_RETRY_BACKOFF * 2^(attempt - 1)
+  seconds. After JOB_MAX_ATTEMPTS attempts the job is marked failed.
+
+Handlers are registered with ``@job_handler(kind)`` and called as
+``handler(payload, heartbeat)``. They must be idempotent, because a job can run
+again after a crash or an expired lease. They may commit as they go, and
+whatever they return is stored as the job's result.
+"""
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from extensions import db
+from models import Job
+
+logger = logging.getLogger(__name__)
+
+UNFINISHED = ('queued', 'running')
+
+HANDLERS = {}
+
+
+class LeaseLost(Exception):
+    """The job's lease expired and another worker may have claimed it."""
+
+
+def job_handler(kind):
+    """Register the decorated function as the handler for jobs of ``kind``."""
+    def decorator(f):
+        HANDLERS[kind] = f
+        return f
+    return decorator
+
+
+def enqueue(kind, payload=None, key=None, created_by=None):
+    """Queue a job in the current transaction and return it, flushed so it has an id.
+
+    With a ``key``, an unfinished job of the same kind and key is returned
+    instead of queueing a second one.
+    """
+    if key is not None:
+        existing = Job.query.filter(
+            Job.kind == kind, Job.key == key, Job.status.in_(UNFINISHED)
+        ).first()
+        if existing is not None:
+            return existing
+
+    job = Job(
+        kind=kind,
+        key=key,
+        payload=json.dumps(payload or {}),
+        max_attempts=current_app.config['JOB_MAX_ATTEMPTS'],
+        created_by=created_by
+    )
+    db.session.add(job)
+    db.session.flush()
+    return job
+
+
+def _claimable(now):
+    table = Job.__table__
+    return db.or_(
+        db.and_(table.c.status == 'queued', table.c.run_after <= now),
+        db.and_(table.c.status == 'running', table.c.locked_until < now)
+    )
+
+
+def claim_job(worker_id, visibility_timeout):
+    """Lease the next due job to ``worker_id`` and return it, or None when nothing is due."""
+    table = Job.__table__
+    while True:
+        now = datetime.utcnow()
+        candidate = db.session.execute(
+            db.select(table.c.id, table.c.attempts, table.c.max_attempts).where(
+                _claimable(now)
+            ).order_by(table.c.run_after, table.c.id).limit(1)
+        ).first()
+        if candidate is None:
+            db.session.rollback()
+            return None
+
+        if candidate.attempts >= candidate.max_attempts:
+            # The last attempt outlived its lease without finishing
+            db.session.execute(table.update().where(table.c.id == candidate.id, _claimable(now)).values(
+                status='failed', finished_at=now, locked_by=None, locked_until=None,
+                error='Visibility timeout expired on the last attempt'
+            ))
+            db.session.commit()
+            logger.error(f"Job {candidate.id} failed: lease expired on attempt {candidate.attempts}")
+            continue
+
+        claimed = db.session.execute(table.update().where(table.c.id == candidate.id, _claimable(now)).values(
+            status='running',
+            locked_by=worker_id,
+            locked_until=now + timedelta(seconds=visibility_timeout),
+            attempts=table.c.attempts + 1,
+            started_at=now
+        )).rowcount
+        db.session.commit()
+        if claimed:
+            return db.session.get(Job, candidate.id)
+
+
+def _release(job_id, worker_id, **values):
+    """Update a job this worker still holds; False if its lease has passed to someone else."""
+    table = Job.__table__
+    with db.engine.begin() as connection:
+        return connection.execute(table.update().where(
+            table.c.id == job_id, table.c.locked_by == worker_id, table.c.status == 'running'
+        ).values(**values)).rowcount == 1
+
+
+def run_job(job, worker_id, visibility_timeout, retry_backoff):
+    """Run a claimed job and record its outcome. Returns True if it succeeded."""
+    job_id, kind, attempt, max_attempts = job.id, job.kind, job.attempts, job.max_attempts
+    payload = json.loads(job.payload)
+
+    def heartbeat():
+        """Renew the lease; call it after committing a batch. Raises LeaseLost."""
+        until = datetime.utcnow() + timedelta(seconds=visibility_timeout)
+        if not _release(job_id, worker_id, locked_until=until):
+            raise LeaseLost(f'Job {job_id} is no longer held by {worker_id}')
+
+    handler = HANDLERS.get(kind)
+    try:
+        if handler is None:
+            raise LookupError(f'No handler for job kind {kind!r}')
+        result = handler(payload, heartbeat)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        now = datetime.utcnow()
+        if isinstance(e, LeaseLost):
+            logger.warning(f"Job {job_id} ({kind}) abandoned: {str(e)}")
+            return False
+        if handler is not None and attempt < max_attempts:
+            delay = retry_backoff * 2 ** (attempt - 1)
+            _release(job_id, worker_id, status='queued', run_after=now + timedelta(seconds=delay),
+                     locked_by=None, locked_until=None, error=str(e))
+            logger.warning(f"Job {job_id} ({kind}) attempt {attempt} failed, retrying in {delay:.0f}s: {str(e)}")
+        else:
+            _release(job_id, worker_id, status='failed', finished_at=now,
+                     locked_by=None, locked_until=None, error=str(e))
+            logger.error(f"Job {job_id} ({kind}) failed after {attempt} attempts: {str(e)}")
+        return False
+
+    finished = _release(
+        job_id, worker_id, status='succeeded', finished_at=datetime.utcnow(), locked_by=None,
+        locked_until=None, error=None, result=json.dumps(result) if result is not None else None
+    )
+    if not finished:
+        logger.warning(f"Job {job_id} ({kind}) finished after its lease expired")
+        return False
+    logger.info(f"Job {job_id} ({kind}) succeeded on attempt {attempt}")
+    return True
+
+
+def queue_depth():
+    """``{status: count}`` over all jobs, plus the age in seconds of the oldest due job."""
+    counts = dict(db.session.query(Job.status, db.func.count(Job.id)).group_by(Job.status).all())
+    oldest = db.session.query(db.func.min(Job.run_after)).filter(Job.status == 'queued').scalar()
+    age = max((datetime.utcnow() - oldest).total_seconds(), 0) if oldest else 0
+    return counts, age
+
+
+class Worker:
+    """Claims and runs jobs for ``app`` until stopped."""
+
+    def __init__(self, app, worker_id=None):
+        config = app.config
+        self.app = app
+        self.worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+        self.visibility_timeout = config['JOB_VISIBILITY_TIMEOUT']
+        self.retry_backoff = config['JOB_RETRY_BACKOFF']
+        self.poll_interval = config['JOB_POLL_INTERVAL']
+        self._stopping = threading.Event()
+
+    def run_once(self):
+        """Run one due job, if there is one. Returns False when the queue had nothing due."""
+        with self.app.app_context():
+            try:
+                job = claim_job(self.worker_id, self.visibility_timeout)
+                if job is None:
+                    return False
+                run_job(job, self.worker_id, self.visibility_timeout, self.retry_backoff)
+                return True
+            finally:
+                db.session.remove()
+
+    def run(self, burst=False):
+        """Process jobs until ``stop()``; with ``burst``, return once nothing is due."""
+        logger.info(f"Job worker {self.worker_id} started")
+        while not self._stopping.is_set():
+            try:
+                ran = self.run_once()
+            except Exception as e:
+                # Database unavailable or locked; try again after a pause
+                logger.error(f"Job worker {self.worker_id}: {str(e)}")
+                ran = False
+            if not ran:
+                if burst:
+                    break
+                self._stopping.wait(self.poll_interval)
+        logger.info(f"Job worker {self.worker_id} stopped")
+
+    def stop(self, *args):
+        """Finish the current job, then exit ``run``. Usable as a signal handler."""
+        self._stopping.set()
+
+
+def _worker_process(burst):
+    from app import create_app
+    worker = Worker(create_app())
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run(burst)
+
+
+def run_worker_processes(processes, burst=False):
+    """Run ``processes`` workers, each in its own process with its own app and connections."""
+    context = multiprocessing.get_context('spawn')
+    children = [context.Process(target=_worker_process, args=(burst,)) for _ in range(processes)]
+    for child in children:
+        child.start()
+
+    def forward(signum, frame):
+        for child in children:
+            if child.is_alive():
+                os.kill(child.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for child in children:
+        child.join()
@@ -0,0 +1,280 @@
+"""Per-route request metrics in the Prometheus text format.
+
+Every request gets a ``RequestStats`` in ``g``. Cursor events on each engine add
+the statement count and database time to it, and the finished stats are passed
+to the request observers (the registry, the query auditor) on request teardown. Streamed responses (``stream_with_context``) tear down
+after their last chunk, so their queries, size and duration are included. Queries run outside a request (e.g. the
+view count flusher) are not attributed to any route.
+
+The registry is per process: under gunicorn every worker reports its own
+numbers, labelled with its pid, and a scrape sees the worker that answered it.
+"""
+import os
+import threading
+import time
+import weakref
+from bisect import bisect_left
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+import process_hooks
+
+EXPOSITION_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# (name, help, buckets, RequestStats attribute)
+HISTOGRAMS = (
+    ('skillswap_http_request_duration_seconds',
+     'Time from the first request hook until the response was complete.', LATENCY_BUCKETS, 'duration'),
+    ('skillswap_http_request_queries', 'SQL statements executed per request.', QUERY_BUCKETS, 'queries'),
+    ('skillswap_http_request_db_seconds', 'Time spent in SQL statements per request.', LATENCY_BUCKETS, 'db_time'),
+    ('skillswap_http_response_size_bytes', 'Response body size.', SIZE_BUCKETS, 'size'),
+)
+
+UNMATCHED_ROUTE = '<unmatched>'
+
+
+class RequestStats:
+    __slots__ = ('method', 'route', 'status', 'started', 'duration', 'queries', 'db_time', 'size', 'statements')
+
+    def __init__(self, method, route):
+        self.method = method
+        self.route = route
+        self.status = None
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.queries = 0
+        self.db_time = 0.0
+        self.size = 0
+        # Statement shape -> count, filled in by the query auditor when it is on
+        self.statements = None
+
+
+class Histogram:
+    """Cumulative-bucket histogram for one label set."""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(pairs):
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """Thread-safe request counters and histograms keyed by (method, route)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = {}
+        self._histograms = {}
+        # A forked worker starts counting from zero rather than inheriting the master's numbers
+        process_hooks.register(self, after_fork='reset')
+
+    def reset(self):
+        self._lock = threading.Lock()
+        self._requests = {}
+        self._histograms = {}
+
+    def observe(self, stats):
+        route = (stats.method, stats.route)
+        with self._lock:
+            key = route + (stats.status,)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            histograms = self._histograms.get(route)
+            if histograms is None:
+                histograms = self._histograms[route] = [Histogram(buckets) for _, _, buckets, _ in HISTOGRAMS]
+            for histogram, (_, _, _, attribute) in zip(histograms, HISTOGRAMS):
+                histogram.observe(getattr(stats, attribute))
+
+    def snapshot(self):
+        """``{'requests': {(method, route, status): n}, 'routes': {(method, route): {attribute: (sum, count)}}}``."""
+        with self._lock:
+            return {
+                'requests': dict(self._requests),
+                'routes': {
+                    route: {
+                        attribute: (histogram.sum, histogram.count)
+                        for histogram, (_, _, _, attribute) in zip(histograms, HISTOGRAMS)
+                    }
+                    for route, histograms in self._histograms.items()
+                },
+            }
+
+    def render(self, gauges=()):
+        """The registry plus ``gauges`` (``(name, help, type, [(labels, value)])``) as exposition text."""
+        worker = ('worker', os.getpid())
+        with self._lock:
+            requests = sorted(self._requests.items())
+            histograms = sorted(
+                (route, [(list(h.counts), h.sum, h.count) for h in hs]) for route, hs in self._histograms.items()
+            )
+
+        lines = [
+            '# HELP skillswap_http_requests_total Requests handled, by route and status.',
+            '# TYPE skillswap_http_requests_total counter',
+        ]
+        for (method, route, status), count in requests:
+            labels = _labels((('method', method), ('route', route), ('status', status), worker))
+            lines.append(f'skillswap_http_requests_total{labels} {count}')
+
+        for index, (name, help_text, buckets, _) in enumerate(HISTOGRAMS):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} histogram')
+            for (method, route), values in histograms:
+                counts, total, count = values[index]
+                base = (('method', method), ('route', route), worker)
+                cumulative = 0
+                for bound, bucket_count in zip(buckets + ('+Inf',), counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{_labels(base + (("le", _number(bound)),))} {cumulative}')
+                lines.append(f'{name}_sum{_labels(base)} {_number(round(total, 6))}')
+                lines.append(f'{name}_count{_labels(base)} {count}')
+
+        for name, help_text, kind, samples in gauges:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                lines.append(f'{name}{_labels(tuple(labels) + (worker,))} {_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+# Hooks
+# Engine -> callbacks run after each of its statements (see instrument_engine)
+_statement_hooks = weakref.WeakKeyDictionary()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_metrics_started', None)
+    elapsed = time.perf_counter() - started if started is not None else None
+    stats = g.get('request_stats') if has_request_context() else None
+    if stats is not None:
+        stats.queries += 1
+        if elapsed is not None:
+            stats.db_time += elapsed
+    for hook in _statement_hooks.get(conn.engine, ()):
+        hook(conn, statement, parameters, executemany, elapsed, stats)
+
+
+def instrument_engine(engine, on_statement=None):
+    """Attribute ``engine``'s statements to the request running them.
+
+    ``on_statement(conn, statement, parameters, executemany, elapsed, stats)`` is
+    also called after each statement; ``stats`` is None outside a request.
+    """
+    if not event.contains(engine, 'after_cursor_execute', _after_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    if on_statement is not None:
+        _statement_hooks.setdefault(engine, []).append(on_statement)
+
+
+def _counting(body, stats):
+    for chunk in body:
+        stats.size += len(chunk if isinstance(chunk, bytes) else chunk.encode())
+        yield chunk
+
+
+def service_gauges(view_counts, cache_stats, engines, job_queue=None):
+    """Gauges for the view count buffer, the response cache, the connection pools
+    and the job queue.
+
+    ``view_counts`` is ``ViewCountBuffer.metrics()``, ``cache_stats`` is
+    ``ResponseCache.stats()``, ``engines`` is ``[(name, engine)]`` and
+    ``job_queue`` is ``jobs.queue_depth()``.
+    """
+    gauges = []
+    for key, value in view_counts.items():
+        kind = 'counter' if key.endswith('_total') else 'gauge'
+        gauges.append((f'skillswap_view_counts_{key}', f'View count buffer: {key.replace("_", " ")}.', kind, [((), value)]))
+
+    backend = (('backend', cache_stats.get('backend', 'none')),)
+    for key, kind in (('hits', 'counter'), ('misses', 'counter'), ('entries', 'gauge')):
+        if key in cache_stats:
+            name = f'skillswap_response_cache_{key}' + ('_total' if kind == 'counter' else '')
+            gauges.append((name, f'Response cache {key}.', kind, [(backend, cache_stats[key])]))
+
+    pools = []
+    for name, engine in engines:
+        pool = engine.pool
+        if hasattr(pool, 'checkedout'):
+            pools.append(((('engine', name), ('state', 'checked_out')), pool.checkedout()))
+            pools.append(((('engine', name), ('state', 'idle')), pool.checkedin()))
+    if pools:
+        gauges.append(('skillswap_db_pool_connections', 'Pooled database connections.', 'gauge', pools))
+
+    if job_queue is not None:
+        counts, oldest_age = job_queue
+        gauges.append(('skillswap_jobs', 'Background jobs by status.', 'gauge', [
+            ((('status', status),), count) for status, count in sorted(counts.items())
+        ]))
+        gauges.append(('skillswap_jobs_oldest_queued_seconds', 'Age of the oldest due queued job.', 'gauge', [((), oldest_age)]))
+    return gauges
+
+
+def init_request_stats(app, engines):
+    """Install the request hooks on ``app`` and the cursor events on ``engines``.
+
+    Returns the list of observers called with each request's finished
+    ``RequestStats``; append to it to consume them.
+    """
+    observers = []
+    for engine in engines:
+        instrument_engine(engine)
+
+    @app.before_request
+    def start_request_stats():
+        rule = request.url_rule
+        g.request_stats = RequestStats(request.method, rule.rule if rule is not None else UNMATCHED_ROUTE)
+
+    @app.after_request
+    def size_request_stats(response):
+        stats = g.get('request_stats')
+        if stats is not None:
+            stats.status = response.status_code
+            if response.is_streamed:
+                response.response = _counting(response.response, stats)
+            else:
+                stats.size = response.content_length or 0
+        return response
+
+    @app.teardown_request
+    def record_request_stats(exc):
+        stats = g.pop('request_stats', None)
+        if stats is not None:
+            if stats.status is None:
+                stats.status = 500
+            stats.duration = time.perf_counter() - stats.started
+            for observe in observers:
+                observe(stats)
+
+    return observers
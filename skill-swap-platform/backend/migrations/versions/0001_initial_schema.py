@@ -0,0 +1,121 @@
+"""Initial schema, exactly as the original app's db.create_all() built it.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 02:53:09.499119
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=120), nullable=False),
+    sa.Column('password_hash', sa.String(length=200), nullable=False),
+    sa.Column('bio', sa.Text(), nullable=True),
+    sa.Column('role', sa.String(length=20), nullable=True),
+    sa.Column('avatar_url', sa.String(length=255), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('last_login', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_user_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_user_email'), ['email'], unique=True)
+
+    op.create_table('skill',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('category', sa.String(length=50), nullable=True),
+    sa.Column('level', sa.String(length=20), nullable=True),
+    sa.Column('tags', sa.Text(), nullable=True),
+    sa.Column('duration_estimate', sa.String(length=50), nullable=True),
+    sa.Column('prerequisites', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('view_count', sa.Integer(), nullable=True),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('skill', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_skill_category'), ['category'], unique=False)
+        batch_op.create_index(batch_op.f('ix_skill_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_skill_level'), ['level'], unique=False)
+        batch_op.create_index(batch_op.f('ix_skill_name'), ['name'], unique=False)
+        batch_op.create_index(batch_op.f('ix_skill_owner_id'), ['owner_id'], unique=False)
+
+    op.create_table('request',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.Column('requester_id', sa.Integer(), nullable=False),
+    sa.Column('message', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('priority', sa.String(length=10), nullable=True),
+    sa.Column('preferred_schedule', sa.Text(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['requester_id'], ['user.id'], ),
+    sa.ForeignKeyConstraint(['skill_id'], ['skill.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('request', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_request_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_request_requester_id'), ['requester_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_request_skill_id'), ['skill_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_request_status'), ['status'], unique=False)
+
+    op.create_table('review',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.Column('reviewer_id', sa.Integer(), nullable=False),
+    sa.Column('reviewee_id', sa.Integer(), nullable=False),
+    sa.Column('rating', sa.Integer(), nullable=False),
+    sa.Column('comment', sa.Text(), nullable=True),
+    sa.Column('is_public', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['reviewee_id'], ['user.id'], ),
+    sa.ForeignKeyConstraint(['reviewer_id'], ['user.id'], ),
+    sa.ForeignKeyConstraint(['skill_id'], ['skill.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('review')
+    with op.batch_alter_table('request', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_request_status'))
+        batch_op.drop_index(batch_op.f('ix_request_skill_id'))
+        batch_op.drop_index(batch_op.f('ix_request_requester_id'))
+        batch_op.drop_index(batch_op.f('ix_request_created_at'))
+
+    op.drop_table('request')
+    with op.batch_alter_table('skill', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_skill_owner_id'))
+        batch_op.drop_index(batch_op.f('ix_skill_name'))
+        batch_op.drop_index(batch_op.f('ix_skill_level'))
+        batch_op.drop_index(batch_op.f('ix_skill_created_at'))
+        batch_op.drop_index(batch_op.f('ix_skill_category'))
+
+    op.drop_table('skill')
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_email'))
+        batch_op.drop_index(batch_op.f('ix_user_created_at'))
+
+    op.drop_table('user')
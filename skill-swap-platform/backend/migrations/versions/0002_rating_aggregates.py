@@ -0,0 +1,77 @@
+"""Rating sums, counts and a 1-5 histogram stored on users and skills.
+
+Existing reviews are counted in, one GROUP BY per target table.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 02:53:12.104388
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+RATING_VALUES = (1, 2, 3, 4, 5)
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rating_sum', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_1', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_2', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_3', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_4', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_5', sa.Integer(), server_default='0', nullable=False))
+
+    with op.batch_alter_table('skill', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rating_sum', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_1', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_2', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_3', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_4', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_5', sa.Integer(), server_default='0', nullable=False))
+
+    reviews = sa.table('review', sa.column('skill_id'), sa.column('reviewee_id'), sa.column('rating'))
+    for name, foreign_key in (('user', reviews.c.reviewee_id), ('skill', reviews.c.skill_id)):
+        grouped = sa.select(
+            foreign_key.label('row_id'),
+            sa.func.sum(reviews.c.rating).label('rating_sum'),
+            sa.func.count().label('rating_count'),
+            *[
+                sa.func.sum(sa.case((reviews.c.rating == value, 1), else_=0)).label(f'rating_{value}')
+                for value in RATING_VALUES
+            ]
+        ).group_by(foreign_key).subquery()
+        columns = [column.name for column in grouped.c if column.name != 'row_id']
+        target = sa.table(name, sa.column('id'), *[sa.column(column) for column in columns])
+        op.execute(target.update().values(
+            {column: grouped.c[column] for column in columns}
+        ).where(target.c.id == grouped.c.row_id))
+
+
+def downgrade():
+    with op.batch_alter_table('skill', schema=None) as batch_op:
+        batch_op.drop_column('rating_5')
+        batch_op.drop_column('rating_4')
+        batch_op.drop_column('rating_3')
+        batch_op.drop_column('rating_2')
+        batch_op.drop_column('rating_1')
+        batch_op.drop_column('rating_count')
+        batch_op.drop_column('rating_sum')
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('rating_5')
+        batch_op.drop_column('rating_4')
+        batch_op.drop_column('rating_3')
+        batch_op.drop_column('rating_2')
+        batch_op.drop_column('rating_1')
+        batch_op.drop_column('rating_count')
+        batch_op.drop_column('rating_sum')
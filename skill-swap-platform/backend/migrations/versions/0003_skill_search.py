@@ -0,0 +1,34 @@
+"""Full-text index over skills (SQLite FTS5), kept in sync by triggers (see search.py).
+
+Existing skills are indexed. Skipped on databases without FTS5, where search
+falls back to LIKE.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 02:53:14.587210
+
+"""
+from alembic import op
+
+import search as skill_search
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if skill_search.supports_fts5(op.get_bind()):
+        for statement in skill_search.CREATE_STATEMENTS:
+            op.execute(statement)
+        op.execute(f"INSERT INTO {skill_search.FTS_TABLE}({skill_search.FTS_TABLE}) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        for trigger in skill_search.TRIGGERS:
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute(skill_search.DROP_STATEMENT)
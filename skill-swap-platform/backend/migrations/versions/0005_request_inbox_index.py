@@ -0,0 +1,25 @@
+"""Index for a skill's requests, newest first (the received-requests inbox).
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 02:53:18.271905
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('request', schema=None) as batch_op:
+        batch_op.create_index('ix_request_skill_created', ['skill_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('request', schema=None) as batch_op:
+        batch_op.drop_index('ix_request_skill_created')
@@ -0,0 +1,49 @@
+"""Per-user dashboard counters (user_stats), with a row counted up for every existing user.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 02:53:20.648213
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('skills_offered', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('requests_received', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('requests_sent', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('completed_sessions', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('version', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.execute(sa.text("""
+        INSERT INTO user_stats (user_id, skills_offered, requests_received, requests_sent, completed_sessions)
+        SELECT u.id, COALESCE(offered.n, 0), COALESCE(received.n, 0), COALESCE(sent.n, 0), COALESCE(sent.completed, 0)
+        FROM "user" u
+        LEFT JOIN (
+            SELECT owner_id, count(*) AS n FROM skill WHERE is_active GROUP BY owner_id
+        ) offered ON offered.owner_id = u.id
+        LEFT JOIN (
+            SELECT skill.owner_id, count(*) AS n FROM request JOIN skill ON skill.id = request.skill_id
+            GROUP BY skill.owner_id
+        ) received ON received.owner_id = u.id
+        LEFT JOIN (
+            SELECT requester_id, count(*) AS n, sum(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) AS completed
+            FROM request GROUP BY requester_id
+        ) sent ON sent.requester_id = u.id
+    """))
+
+
+def downgrade():
+    op.drop_table('user_stats')
@@ -0,0 +1,28 @@
+"""Platform-wide counters behind the admin stats.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 02:53:22.019437
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('platform_counter',
+    sa.Column('name', sa.String(length=120), nullable=False),
+    sa.Column('value', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('platform_counter')
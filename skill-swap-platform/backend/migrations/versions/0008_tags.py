@@ -0,0 +1,95 @@
+"""Normalized tags: a tag table with usage counts and a skill_tag link table.
+
+Every existing skill's free-form tags value is parsed into links, a batch of
+skills at a time, and the usage counts are then counted from the links.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 02:53:24.382760
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from tags import parse_tags
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade():
+    op.create_table('tag',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('usage_count', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('tag', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_tag_name'), ['name'], unique=True)
+        batch_op.create_index(batch_op.f('ix_tag_usage_count'), ['usage_count'], unique=False)
+
+    op.create_table('skill_tag',
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.Column('tag_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['skill_id'], ['skill.id'], ),
+    sa.ForeignKeyConstraint(['tag_id'], ['tag.id'], ),
+    sa.PrimaryKeyConstraint('skill_id', 'tag_id')
+    )
+    with op.batch_alter_table('skill_tag', schema=None) as batch_op:
+        batch_op.create_index('ix_skill_tag_tag_skill', ['tag_id', 'skill_id'], unique=False)
+
+    link_existing_tags(op.get_bind())
+
+
+def link_existing_tags(connection):
+    skills = sa.table('skill', sa.column('id'), sa.column('tags'))
+    tags = sa.table('tag', sa.column('id'), sa.column('name'))
+    links = sa.table('skill_tag', sa.column('skill_id'), sa.column('tag_id'))
+    tag_ids = {}
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(skills.c.id, skills.c.tags).where(skills.c.id > last_id).order_by(skills.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        names = {row.id: parse_tags(row.tags) for row in rows}
+        new_names = sorted({name for skill_names in names.values() for name in skill_names} - set(tag_ids))
+        if new_names:
+            connection.execute(tags.insert(), [{'name': name} for name in new_names])
+            tag_ids.update(connection.execute(
+                sa.select(tags.c.name, tags.c.id).where(tags.c.name.in_(new_names))
+            ).all())
+        link_rows = [
+            {'skill_id': skill_id, 'tag_id': tag_ids[name]}
+            for skill_id, skill_names in names.items() for name in skill_names
+        ]
+        if link_rows:
+            connection.execute(links.insert(), link_rows)
+
+    connection.execute(sa.text("""
+        UPDATE tag SET usage_count = (
+            SELECT count(*) FROM skill_tag JOIN skill ON skill.id = skill_tag.skill_id
+            WHERE skill_tag.tag_id = tag.id AND skill.is_active
+        )
+    """))
+
+
+def downgrade():
+    with op.batch_alter_table('skill_tag', schema=None) as batch_op:
+        batch_op.drop_index('ix_skill_tag_tag_skill')
+
+    op.drop_table('skill_tag')
+    with op.batch_alter_table('tag', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_tag_usage_count'))
+        batch_op.drop_index(batch_op.f('ix_tag_name'))
+
+    op.drop_table('tag')
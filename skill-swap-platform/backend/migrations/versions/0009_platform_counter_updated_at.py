@@ -0,0 +1,26 @@
+"""Last-change time on platform counters, used as Last-Modified for the catalog.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 02:53:26.715094
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('platform_counter', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('platform_counter', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,27 @@
+"""Review indexes on skill_id and reviewee_id for the rating rebuilds.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 02:53:28.340671
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('review', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_review_reviewee_id'), ['reviewee_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_review_skill_id'), ['skill_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('review', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_review_skill_id'))
+        batch_op.drop_index(batch_op.f('ix_review_reviewee_id'))
@@ -0,0 +1,86 @@
+"""Composite indexes for the listing, inbox and rating queries; one pending request per skill and requester.
+
+- skill: (is_active[, category | level], created_at, id) serve the listing filters
+  and its newest-first order from the index, replacing the category and level indexes
+- request: (requester_id, created_at, id) for sent requests; a partial unique
+  index on (skill_id, requester_id) WHERE status = 'pending'. The skill_id and
+  requester_id indexes are prefixes of these and are dropped
+- review: (skill_id, rating) and (reviewee_id, rating) cover the rating
+  rebuilds; reviewer_id gets an index for deleting a user's reviews
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17 02:53:35.658242
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+PENDING = sa.text("status = 'pending'")
+
+
+def upgrade():
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT skill_id, requester_id, count(*) FROM request WHERE status = 'pending' "
+        "GROUP BY skill_id, requester_id HAVING count(*) > 1"
+    )).all()
+    if duplicates:
+        pairs = ', '.join(f'skill {skill_id} / user {requester_id} ({count})' for skill_id, requester_id, count in duplicates[:10])
+        raise RuntimeError(
+            f'{len(duplicates)} skill/requester pairs have more than one pending request: {pairs}. '
+            'Resolve them before upgrading.'
+        )
+
+    with op.batch_alter_table('request', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_request_requester_id'))
+        batch_op.drop_index(batch_op.f('ix_request_skill_id'))
+        batch_op.create_index('ix_request_requester_created', ['requester_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index(
+            'uq_request_pending', ['skill_id', 'requester_id'], unique=True,
+            sqlite_where=PENDING, postgresql_where=PENDING
+        )
+
+    with op.batch_alter_table('review', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_review_reviewee_id'))
+        batch_op.drop_index(batch_op.f('ix_review_skill_id'))
+        batch_op.create_index('ix_review_reviewee_rating', ['reviewee_id', 'rating'], unique=False)
+        batch_op.create_index(batch_op.f('ix_review_reviewer_id'), ['reviewer_id'], unique=False)
+        batch_op.create_index('ix_review_skill_rating', ['skill_id', 'rating'], unique=False)
+
+    with op.batch_alter_table('skill', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_skill_category'))
+        batch_op.drop_index(batch_op.f('ix_skill_level'))
+        batch_op.create_index('ix_skill_active_category_created', ['is_active', 'category', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_skill_active_created', ['is_active', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_skill_active_level_created', ['is_active', 'level', 'created_at', 'id'], unique=False)
+
+    op.execute('ANALYZE')
+
+
+def downgrade():
+    with op.batch_alter_table('skill', schema=None) as batch_op:
+        batch_op.drop_index('ix_skill_active_level_created')
+        batch_op.drop_index('ix_skill_active_created')
+        batch_op.drop_index('ix_skill_active_category_created')
+        batch_op.create_index(batch_op.f('ix_skill_level'), ['level'], unique=False)
+        batch_op.create_index(batch_op.f('ix_skill_category'), ['category'], unique=False)
+
+    with op.batch_alter_table('review', schema=None) as batch_op:
+        batch_op.drop_index('ix_review_skill_rating')
+        batch_op.drop_index(batch_op.f('ix_review_reviewer_id'))
+        batch_op.drop_index('ix_review_reviewee_rating')
+        batch_op.create_index(batch_op.f('ix_review_skill_id'), ['skill_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_review_reviewee_id'), ['reviewee_id'], unique=False)
+
+    with op.batch_alter_table('request', schema=None) as batch_op:
+        batch_op.drop_index('uq_request_pending', sqlite_where=PENDING, postgresql_where=PENDING)
+        batch_op.drop_index('ix_request_requester_created')
+        batch_op.create_index(batch_op.f('ix_request_skill_id'), ['skill_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_request_requester_id'), ['requester_id'], unique=False)
@@ -0,0 +1,354 @@
+"""Database models."""
+import json
+from datetime import datetime
+
+from flask import current_app
+
+import search as skill_search
+from extensions import bcrypt, db, password_executor
+from passwords import bcrypt_cost
+
+# Password helpers; hashing runs on the app's password_executor
+def hash_password(password):
+    return password_executor.run(
+        bcrypt.generate_password_hash, password, current_app.config['BCRYPT_LOG_ROUNDS']
+    ).decode('utf-8')
+
+def verify_password(password_hash, password):
+    return password_executor.run(bcrypt.check_password_hash, password_hash, password)
+
+def password_needs_rehash(password_hash):
+    return bcrypt_cost(password_hash) != current_app.config['BCRYPT_LOG_ROUNDS']
+
+# Columns whose previous value the read model listeners in aggregates.py need
+def tracked(column):
+    """A column whose value before an update is always available to the read model listeners.
+
+    Without ``active_history`` an attribute expired by a commit has no previous
+    value in its history, so ``aggregates`` would see old == new.
+    """
+    return db.column_property(column, active_history=True)
+
+# Stored review aggregates shared by users (as reviewee) and skills
+RATING_VALUES = range(1, 6)
+
+class RatingAggregateMixin:
+    rating_sum = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    rating_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    rating_1 = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    rating_2 = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    rating_3 = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    rating_4 = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    rating_5 = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+
+    def get_average_rating(self):
+        if not self.rating_count:
+            return 0
+        return self.rating_sum / self.rating_count
+
+    def get_rating_histogram(self):
+        return {str(value): getattr(self, f'rating_{value}') or 0 for value in RATING_VALUES}
+
+# Database Models with enhanced relationships
+class User(RatingAggregateMixin, db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False, index=True)
+    password_hash = db.Column(db.String(200), nullable=False)
+    bio = db.Column(db.Text, default='')
+    role = db.Column(db.String(20), default='user')
+    avatar_url = db.Column(db.String(255), default='')
+    is_active = tracked(db.Column(db.Boolean, default=True))
+    # Bumped to invalidate every token issued to this user
+    token_version = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    last_login = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Enhanced relationships
+    skills = db.relationship('Skill', backref='owner', lazy='dynamic', cascade='all, delete-orphan')
+    requests_sent = db.relationship('Request', foreign_keys='Request.requester_id', 
+                                  backref='requester', lazy='dynamic', cascade='all, delete-orphan')
+    reviews_given = db.relationship('Review', foreign_keys='Review.reviewer_id',
+                                  backref='reviewer', lazy='dynamic', cascade='all, delete-orphan')
+    reviews_received = db.relationship('Review', foreign_keys='Review.reviewee_id',
+                                     backref='reviewee', lazy='dynamic', cascade='all, delete-orphan')
+
+    def set_password(self, password):
+        self.password_hash = hash_password(password)
+
+    def check_password(self, password):
+        return verify_password(self.password_hash, password)
+
+    def to_dict(self, include_stats=False, stats=None):
+        data = {
+            'id': self.id,
+            'name': self.name,
+            'email': self.email,
+            'bio': self.bio,
+            'role': self.role,
+            'avatar_url': self.avatar_url,
+            'is_active': self.is_active,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'last_login': self.last_login.isoformat() if self.last_login else None
+        }
+        
+        if include_stats:
+            # Lists pass ``stats`` from one grouped query instead of two counts per user
+            if stats is None:
+                stats = {
+                    'skills_count': self.skills.count(),
+                    'requests_sent_count': self.requests_sent.count()
+                }
+            data.update(stats)
+            data.update({
+                'average_rating': self.get_average_rating(),
+                'rating_histogram': self.get_rating_histogram()
+            })
+        
+        return data
+
+class Skill(RatingAggregateMixin, db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False, index=True)
+    description = db.Column(db.Text, default='')
+    category = tracked(db.Column(db.String(50), default='other'))
+    level = db.Column(db.String(20), default='beginner')
+    tags = tracked(db.Column(db.Text, default=''))  # JSON string of tags
+    duration_estimate = db.Column(db.String(50), default='')  # e.g., "2-4 weeks"
+    prerequisites = db.Column(db.Text, default='')
+    is_active = tracked(db.Column(db.Boolean, default=True))
+    view_count = db.Column(db.Integer, default=0)
+    owner_id = tracked(db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    requests = db.relationship('Request', backref='skill', lazy='dynamic', cascade='all, delete-orphan')
+    reviews = db.relationship('Review', backref='skill', lazy='dynamic', cascade='all, delete-orphan')
+    tag_links = db.relationship('SkillTag', backref='skill', cascade='all, delete-orphan')
+
+    __table_args__ = (
+        # Listing: active skills, optionally of one category or level, newest first
+        db.Index('ix_skill_active_created', 'is_active', 'created_at', 'id'),
+        db.Index('ix_skill_active_category_created', 'is_active', 'category', 'created_at', 'id'),
+        db.Index('ix_skill_active_level_created', 'is_active', 'level', 'created_at', 'id'),
+    )
+
+    def to_dict(self, include_stats=False, stats=None, include_owner=True):
+        data = {
+            'id': self.id,
+            'name': self.name,
+            'description': self.description,
+            'category': self.category,
+            'level': self.level,
+            'tags': self.tags,
+            'duration_estimate': self.duration_estimate,
+            'prerequisites': self.prerequisites,
+            'is_active': self.is_active,
+            'view_count': self.view_count,
+            'owner_id': self.owner_id,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+        
+        if include_owner:
+            data['owner'] = self.owner.to_dict() if self.owner else None
+        
+        if stats is not None:
+            data.update(stats)
+        elif include_stats:
+            data.update({
+                'requests_count': self.requests.count(),
+                'average_rating': self.get_average_rating(),
+                'reviews_count': self.rating_count
+            })
+        
+        return data
+
+class Request(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    skill_id = tracked(db.Column(db.Integer, db.ForeignKey('skill.id'), nullable=False))
+    requester_id = tracked(db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False))
+    message = db.Column(db.Text, default='')
+    status = tracked(db.Column(db.String(20), default='pending', index=True))  # pending, accepted, rejected, completed
+    priority = db.Column(db.String(10), default='normal')  # low, normal, high
+    preferred_schedule = db.Column(db.Text, default='')
+    notes = db.Column(db.Text, default='')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        # Inbox: requests for a given skill, newest first (joined from skill.owner_id)
+        db.Index('ix_request_skill_created', 'skill_id', 'created_at', 'id'),
+        # Sent requests, newest first
+        db.Index('ix_request_requester_created', 'requester_id', 'created_at', 'id'),
+        # At most one pending request per skill and requester
+        db.Index(
+            'uq_request_pending', 'skill_id', 'requester_id', unique=True,
+            sqlite_where=db.text("status = 'pending'"), postgresql_where=db.text("status = 'pending'")
+        ),
+    )
+
+    # Relations that ?expand= may embed, and the ones embedded by default
+    EXPANSIONS = ('skill', 'skill.owner', 'requester')
+
+    def to_dict(self, expand=EXPANSIONS):
+        data = {
+            'id': self.id,
+            'skill_id': self.skill_id,
+            'requester_id': self.requester_id,
+            'message': self.message,
+            'status': self.status,
+            'priority': self.priority,
+            'preferred_schedule': self.preferred_schedule,
+            'notes': self.notes,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None
+        }
+        
+        if 'skill' in expand:
+            data['skill'] = self.skill.to_dict(
+                include_owner='skill.owner' in expand
+            ) if self.skill else None
+        
+        if 'requester' in expand:
+            data['requester'] = self.requester.to_dict() if self.requester else None
+        
+        return data
+
+class Review(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    skill_id = tracked(db.Column(db.Integer, db.ForeignKey('skill.id'), nullable=False))
+    reviewer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    reviewee_id = tracked(db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False))
+    rating = tracked(db.Column(db.Integer, nullable=False))  # 1-5 stars
+    comment = db.Column(db.Text, default='')
+    is_public = db.Column(db.Boolean, default=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Rating rebuilds group by skill or reviewee and read only the rating
+        db.Index('ix_review_skill_rating', 'skill_id', 'rating'),
+        db.Index('ix_review_reviewee_rating', 'reviewee_id', 'rating'),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'skill_id': self.skill_id,
+            'reviewer_id': self.reviewer_id,
+            'reviewee_id': self.reviewee_id,
+            'rating': self.rating,
+            'comment': self.comment,
+            'is_public': self.is_public,
+            'reviewer': self.reviewer.to_dict() if self.reviewer else None,
+            'skill': self.skill.to_dict() if self.skill else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+class UserStats(db.Model):
+    """Per-user dashboard counters, kept current by the mapper events below.
+
+    Ratings are not duplicated here; they already live on the user row.
+    """
+    __tablename__ = 'user_stats'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    skills_offered = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    requests_received = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    requests_sent = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    completed_sessions = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    # Bumped on every change to the row
+    version = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+
+    def to_dict(self):
+        return {
+            'skills_offered': self.skills_offered,
+            'requests_received': self.requests_received,
+            'requests_sent': self.requests_sent,
+            'completed_sessions': self.completed_sessions
+        }
+
+class Tag(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), unique=True, nullable=False, index=True)
+    # Number of active skills carrying the tag, maintained by mapper events
+    usage_count = db.Column(db.Integer, default=0, server_default='0', nullable=False, index=True)
+
+    def to_dict(self):
+        return {'name': self.name, 'count': self.usage_count}
+
+class SkillTag(db.Model):
+    """Normalized form of ``Skill.tags``; one row per (skill, tag)."""
+    __tablename__ = 'skill_tag'
+    skill_id = db.Column(db.Integer, db.ForeignKey('skill.id'), primary_key=True)
+    tag_id = db.Column(db.Integer, db.ForeignKey('tag.id'), primary_key=True)
+    
+    tag = db.relationship('Tag')
+    
+    __table_args__ = (
+        # Tag filter: skills carrying a given tag
+        db.Index('ix_skill_tag_tag_skill', 'tag_id', 'skill_id'),
+    )
+
+class PlatformCounter(db.Model):
+    """Platform-wide counters (``users.total``, ``skills.category:music``, ...).
+
+    Updated by mapper events in the same transaction as the rows they count, so
+    admin stats read a handful of rows instead of counting whole tables.
+    """
+    __tablename__ = 'platform_counter'
+    name = db.Column(db.String(120), primary_key=True)
+    value = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class Job(db.Model):
+    """Background work queued by an endpoint and run by ``flask jobs-worker`` (see jobs.py)."""
+    __tablename__ = 'job'
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    # What the job acts on (e.g. "user:42"), so resubmitting reuses an unfinished job
+    key = db.Column(db.String(120))
+    payload = db.Column(db.Text, default='{}', nullable=False)  # JSON
+    status = db.Column(db.String(20), default='queued', nullable=False)  # queued, running, succeeded, failed
+    attempts = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    max_attempts = db.Column(db.Integer, default=5, server_default='5', nullable=False)
+    # Not claimable before this; pushed back after a failed attempt
+    run_after = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    # The worker holding the job and the end of its visibility timeout
+    locked_by = db.Column(db.String(100))
+    locked_until = db.Column(db.DateTime)
+    result = db.Column(db.Text)  # JSON
+    error = db.Column(db.Text)
+    created_by = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        # Claiming: queued jobs that are due, and running jobs whose lease has expired
+        db.Index('ix_job_status_run_after', 'status', 'run_after'),
+        db.Index('ix_job_kind_key', 'kind', 'key'),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'key': self.key,
+            'payload': json.loads(self.payload) if self.payload else {},
+            'status': self.status,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'run_after': self.run_after.isoformat() if self.run_after else None
+        }
+
+# Keep the skill full-text index (SQLite FTS5) in step with the skill table
+skill_search.install(Skill.__table__)
@@ -0,0 +1,49 @@
+"""Keyset (cursor) pagination over ``(created_at, id)``, newest first.
+
+Cursors are opaque to clients: URL-safe base64 of the last row's sort key.
+Each page is one indexed range scan with ``LIMIT n + 1`` (the extra row tells
+us whether there is a next page), so deep pages cost the same as the first
+and no COUNT(*) is needed.
+"""
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at, row_id):
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise InvalidCursor('Invalid cursor')
+
+
+def paginate_keyset(query, created_column, id_column, cursor, limit):
+    """Return ``(rows, next_cursor)`` for the page after ``cursor`` (or the first page).
+
+    Raises InvalidCursor when the cursor cannot be decoded.
+    """
+    query = query.order_by(None).order_by(created_column.desc(), id_column.desc())
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(created_column, id_column) < tuple_(created_at, row_id))
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return rows, next_cursor
@@ -0,0 +1,66 @@
+"""Bounded worker pool for password hashing.
+
+bcrypt is deliberately slow (~250ms at cost 12) and releases the GIL, so it
+runs on a small dedicated thread pool instead of directly in request
+threads. The pool admits at most ``max_workers + max_queue`` jobs; beyond
+that callers get ``PasswordHasherBusy`` straight away (mapped to a 503) rather
+than piling up behind each other and starving every other endpoint.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import process_hooks
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+class BoundedExecutor:
+    def __init__(self, max_workers=2, max_queue=8, timeout=10.0):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._reset()
+        # Worker threads do not survive a fork; let the child build its own pool
+        process_hooks.register(self, after_fork='_reset')
+
+    def _reset(self):
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        self.rejected = 0
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='password-hasher')
+            return self._executor
+
+    def run(self, fn, *args):
+        """Run ``fn(*args)`` on the pool and wait for the result.
+
+        Raises PasswordHasherBusy when the pool and its queue are full, or when
+        the job has not finished within ``timeout`` seconds.
+        """
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise PasswordHasherBusy('Password hashing capacity exhausted')
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise PasswordHasherBusy('Timed out waiting for password hashing')
+
+
+def bcrypt_cost(password_hash):
+    """Work factor encoded in a bcrypt hash such as ``$2b$12$...`` (None if unparsable)."""
+    parts = password_hash.split('$') if password_hash else []
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
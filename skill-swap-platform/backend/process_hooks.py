@@ -0,0 +1,33 @@
+"""Fork and exit hooks for the per-app services.
+
+Every app owns its service instances (see extensions.py), but ``atexit`` and
+``os.register_at_fork`` can only add handlers, never remove them. Registering
+one per instance would leak a handler, and the whole app it references, for
+every ``create_app``. Instead one handler of each kind is registered here, at
+import, and runs the named method of every instance still alive. Instances are
+held weakly, so a discarded app's services can be garbage collected.
+"""
+import atexit
+import os
+import weakref
+
+_after_fork = weakref.WeakKeyDictionary()
+_at_exit = weakref.WeakKeyDictionary()
+
+
+def register(instance, after_fork=None, at_exit=None):
+    """Call ``instance.<after_fork>()`` in forked children and ``instance.<at_exit>()`` at exit."""
+    if after_fork:
+        _after_fork[instance] = after_fork
+    if at_exit:
+        _at_exit[instance] = at_exit
+
+
+def _run(hooks):
+    for instance, method in list(hooks.items()):
+        getattr(instance, method)()
+
+
+atexit.register(_run, _at_exit)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=lambda: _run(_after_fork))
@@ -0,0 +1,153 @@
+"""Development and CI checks on the SQL each request runs.
+
+- Repeated statements: every statement is normalized (bind values and IN-lists
+  collapsed) and counted per request. One that runs QUERY_AUDIT_REPEAT_THRESHOLD
+  or more times is logged once, with the route, as a likely N+1.
+- Query budgets: ``@query_budget(n)`` on a view declares how many statements a
+  request to it may run. Going over is logged and recorded, and the test
+  fixtures fail on any recorded violation.
+- Slow queries: statements slower than SLOW_QUERY_MS are logged with their
+  ``EXPLAIN QUERY PLAN`` (SQLite) or ``EXPLAIN`` output.
+
+Repeats and budgets need QUERY_AUDIT; the slow query log only needs
+SLOW_QUERY_MS. Statements run outside a request are only checked for slowness.
+Counts and timings come from the per-request ``RequestStats`` that metrics.py
+keeps, so the two share one pair of cursor listeners.
+"""
+import logging
+import re
+import threading
+from collections import Counter, deque
+
+from flask import current_app, has_request_context, request
+
+from metrics import instrument_engine
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_NUMBER = re.compile(r'\b\d+\b')
+_SPACE = re.compile(r'\s+')
+
+
+def normalize(statement):
+    """Shape of a statement with bind lists, literals and whitespace collapsed."""
+    statement = _SPACE.sub(' ', statement).strip()
+    statement = _IN_LIST.sub('(?)', statement)
+    return _NUMBER.sub('N', statement)
+
+
+def query_budget(limit):
+    """Declare the most statements one request to the decorated view may run.
+
+    Put it directly below ``@api.route`` so it marks the registered view.
+    """
+    def decorator(f):
+        f.query_budget = limit
+        return f
+    return decorator
+
+
+def repeated_queries_expected(f):
+    """Mark a view that repeats a statement by design (e.g. keyset batches of a stream)."""
+    f.repeated_queries_expected = True
+    return f
+
+
+class QueryAuditor:
+    """Findings of the current process, newest last; kept short so they can't grow without bound."""
+
+    def __init__(self, max_findings=100):
+        self._lock = threading.Lock()
+        self.violations = deque(maxlen=max_findings)
+        self.repeats = deque(maxlen=max_findings)
+
+    def record_violation(self, finding):
+        with self._lock:
+            self.violations.append(finding)
+
+    def record_repeat(self, finding):
+        with self._lock:
+            self.repeats.append(finding)
+
+    def clear(self):
+        with self._lock:
+            self.violations.clear()
+            self.repeats.clear()
+
+
+def explain(connection, statement, parameters):
+    """The query plan of ``statement`` as text, run on a raw cursor so no events fire."""
+    if statement.lstrip()[:6].upper() not in ('SELECT', 'WITH'):
+        return None
+    sqlite = connection.dialect.name == 'sqlite'
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(('EXPLAIN QUERY PLAN ' if sqlite else 'EXPLAIN ') + statement, parameters)
+        rows = cursor.fetchall()
+    except Exception as e:
+        return f'(plan unavailable: {str(e)})'
+    finally:
+        cursor.close()
+    # SQLite rows are (id, parent, notused, detail)
+    return '\n'.join('  ' + str(row[-1] if sqlite else row[0]) for row in rows)
+
+
+def init_query_audit(app, engines, auditor, request_observers):
+    """Install the checks enabled in ``app.config`` on ``engines``.
+
+    ``request_observers`` is the list returned by ``metrics.init_request_stats``.
+    """
+    config = app.config
+    audit = config['QUERY_AUDIT']
+    slow_seconds = config['SLOW_QUERY_MS'] / 1000
+    threshold = config['QUERY_AUDIT_REPEAT_THRESHOLD']
+    if not audit and not slow_seconds:
+        return
+
+    def on_statement(conn, statement, parameters, executemany, elapsed, stats):
+        if audit and stats is not None:
+            if stats.statements is None:
+                stats.statements = Counter()
+            stats.statements[normalize(statement)] += 1
+
+        if not slow_seconds or elapsed is None or elapsed < slow_seconds:
+            return
+        if stats is not None:
+            where = f'{stats.method} {stats.route}'
+        elif has_request_context():
+            where = f'{request.method} {request.path}'
+        else:
+            where = 'outside a request'
+        plan = None if executemany else explain(conn, statement, parameters)
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.0f} ms, {where}): {_SPACE.sub(' ', statement).strip()}"
+            + (f"\n{plan}" if plan else '')
+        )
+
+    for engine in engines:
+        instrument_engine(engine, on_statement)
+
+    if not audit:
+        return
+
+    # Observers run on teardown, which for a streamed response is after its last chunk
+    def check_request_queries(stats):
+        statements = stats.statements or Counter()
+        view = current_app.view_functions.get(request.endpoint)
+        where = f'{stats.method} {stats.route}'
+
+        limit = getattr(view, 'query_budget', None)
+        if limit is not None and stats.queries > limit:
+            top = '; '.join(f'{n} x {statement[:120]}' for statement, n in statements.most_common(3))
+            logger.warning(f"Query budget exceeded on {where}: {stats.queries} statements, budget {limit} ({top})")
+            auditor.record_violation((where, stats.queries, limit))
+
+        if getattr(view, 'repeated_queries_expected', False):
+            return
+        for statement, n in statements.items():
+            if n >= threshold:
+                logger.warning(f"Possible N+1 on {where}: {n} x {statement[:200]}")
+                auditor.record_repeat((where, n, statement))
+
+    request_observers.append(check_request_queries)
@@ -0,0 +1,737 @@
+"""API routes."""
+import logging
+from datetime import datetime
+
+from flask import Blueprint, Response, jsonify, request
+from flask_jwt_extended import get_jwt_identity, jwt_required
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from aggregates import (
+    COUNTERS_SEEDED, read_platform_counters, rebuild_user_stats, repair_platform_counters,
+    sync_skill_tags
+)
+from auth import admin_required, create_user_token, metrics_access_required, revoke_user_tokens
+from database import get_read_engine, read_only
+from extensions import db, metrics_registry, response_cache, view_counter
+from helpers import (
+    SKILL_FILTER_DEFAULTS, SKILL_FILTER_PARAMS, cached_response, catalog_validators, conditional,
+    cursor_page, get_pagination_args, get_skill_facets, get_skill_filters, handle_errors,
+    job_accepted, paginated_skills, profile_validators, request_inbox_response, request_list_options,
+    serialize_requests, serialize_skills, serialize_users, skill_listing_query, stream_list
+)
+from jobs import enqueue, queue_depth
+from metrics import EXPOSITION_CONTENT_TYPE, service_gauges
+from models import Job, Request, Skill, Tag, User, UserStats, password_needs_rehash
+from pagination import InvalidCursor
+from passwords import PasswordHasherBusy
+from query_audit import query_budget, repeated_queries_expected
+from tags import format_tags
+from tasks import REBUILD_TARGETS
+
+logger = logging.getLogger(__name__)
+
+api = Blueprint('api', __name__)
+
+# Enhanced Authentication Routes
+@api.route('/api/auth/register', methods=['POST'])
+@handle_errors
+def register():
+    data = request.get_json()
+    name = data.get('name', '').strip()
+    email = data.get('email', '').strip().lower()
+    password = data.get('password', '')
+    bio = data.get('bio', '').strip()
+
+    # Enhanced validation
+    if not name or len(name) < 2:
+        return jsonify({'error': 'Name must be at least 2 characters long'}), 400
+    
+    if not email or '@' not in email:
+        return jsonify({'error': 'Valid email is required'}), 400
+
+    if not password or len(password) < 6:
+        return jsonify({'error': 'Password must be at least 6 characters long'}), 400
+
+    if User.query.filter_by(email=email).first():
+        return jsonify({'error': 'Email already registered'}), 400
+
+    new_user = User(name=name, email=email, bio=bio)
+    new_user.set_password(password)
+    
+    db.session.add(new_user)
+    db.session.commit()
+
+    access_token = create_user_token(new_user)
+    logger.info(f"New user registered: {email}")
+    
+    return jsonify({
+        'message': 'User registered successfully',
+        'access_token': access_token,
+        'user': new_user.to_dict()
+    }), 201
+
+@api.route('/api/auth/login', methods=['POST'])
+@handle_errors
+def login():
+    data = request.get_json()
+    email = data.get('email', '').strip().lower()
+    password = data.get('password', '')
+
+    if not email or not password:
+        return jsonify({'error': 'Email and password required'}), 400
+
+    user = User.query.filter_by(email=email).first()
+    
+    if not user or not user.check_password(password):
+        return jsonify({'error': 'Invalid credentials'}), 401
+
+    if not user.is_active:
+        return jsonify({'error': 'Account is deactivated'}), 401
+
+    # Upgrade hashes made with an older work factor while we have the password
+    if password_needs_rehash(user.password_hash):
+        try:
+            user.set_password(password)
+        except PasswordHasherBusy:
+            logger.info(f"Skipped password rehash for {email}: hasher busy")
+
+    # Update last login
+    user.last_login = datetime.utcnow()
+    db.session.commit()
+
+    access_token = create_user_token(user)
+    logger.info(f"User logged in: {email}")
+    
+    return jsonify({
+        'message': 'Login successful',
+        'access_token': access_token,
+        'user': user.to_dict()
+    }), 200
+
+# Enhanced Profile Routes
+@api.route('/api/profile', methods=['GET'])
+@query_budget(6)
+@jwt_required()
+@conditional(profile_validators, private=True)
+@handle_errors
+def get_profile():
+    user_id = get_jwt_identity()
+    user = User.query.get(user_id)
+    
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    return jsonify(user.to_dict(include_stats=True)), 200
+
+@api.route('/api/profile', methods=['PUT'])
+@jwt_required()
+@handle_errors
+def update_profile():
+    user_id = get_jwt_identity()
+    user = User.query.get(user_id)
+    
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    data = request.get_json()
+    
+    # Update allowed fields
+    if 'name' in data:
+        name = data['name'].strip()
+        if len(name) >= 2:
+            user.name = name
+        else:
+            return jsonify({'error': 'Name must be at least 2 characters long'}), 400
+    
+    if 'bio' in data:
+        user.bio = data['bio'].strip()
+    
+    if 'avatar_url' in data:
+        user.avatar_url = data['avatar_url'].strip()
+    
+    user.updated_at = datetime.utcnow()
+    db.session.commit()
+    
+    # Skill listings embed the owner's public profile
+    response_cache.invalidate('skills')
+    
+    return jsonify({
+        'message': 'Profile updated successfully',
+        'user': user.to_dict()
+    }), 200
+
+# Enhanced Skill Routes
+@api.route('/api/skills', methods=['GET'])
+@query_budget(6)
+@read_only
+@conditional(catalog_validators('skills'))
+@cached_response(
+    'skills',
+    params=('page', 'per_page', 'cursor', 'include_total') + SKILL_FILTER_PARAMS,
+    defaults=SKILL_FILTER_DEFAULTS,
+    case_insensitive=('search', 'tag', 'include_total')
+)
+@handle_errors
+def get_skills():
+    page, per_page = get_pagination_args()
+    filters, matches = get_skill_filters()
+    query, order_by = skill_listing_query(filters, matches)
+    
+    # Cursor mode orders by (created_at, id) only, so relevance ranking does not apply
+    if 'cursor' in request.args:
+        try:
+            skills, meta = cursor_page(query, Skill, per_page)
+        except InvalidCursor:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        return jsonify({'skills': serialize_skills(skills), **meta}), 200
+    
+    return jsonify(paginated_skills(query, order_by, page, per_page)), 200
+
+@api.route('/api/skills/search', methods=['GET'])
+@query_budget(8)
+@read_only
+@conditional(catalog_validators('skill-search'))
+@cached_response(
+    'skills',
+    params=('page', 'per_page', 'tag_limit') + SKILL_FILTER_PARAMS,
+    defaults=dict(SKILL_FILTER_DEFAULTS, tag_limit='20'),
+    case_insensitive=('search', 'tag')
+)
+@handle_errors
+def search_skills():
+    """One page of skills plus category, level and tag facet counts for the same filters."""
+    page, per_page = get_pagination_args()
+    tag_limit = min(max(request.args.get('tag_limit', 20, type=int), 1), 100)
+    filters, matches = get_skill_filters()
+    query, order_by = skill_listing_query(filters, matches)
+    
+    results = paginated_skills(query, order_by, page, per_page)
+    results['facets'] = get_skill_facets(filters, tag_limit)
+    return jsonify(results), 200
+
+@api.route('/api/skills', methods=['POST'])
+@jwt_required()
+@handle_errors
+def create_skill():
+    user_id = get_jwt_identity()
+    data = request.get_json()
+    
+    name = data.get('name', '').strip()
+    description = data.get('description', '').strip()
+    category = data.get('category', 'other')
+    level = data.get('level', 'beginner')
+    tags = format_tags(data.get('tags', ''))
+    duration_estimate = data.get('duration_estimate', '').strip()
+    prerequisites = data.get('prerequisites', '').strip()
+    
+    if not name or len(name) < 3:
+        return jsonify({'error': 'Skill name must be at least 3 characters long'}), 400
+    
+    if not description or len(description) < 10:
+        return jsonify({'error': 'Description must be at least 10 characters long'}), 400
+    
+    new_skill = Skill(
+        name=name,
+        description=description,
+        category=category,
+        level=level,
+        tags=tags,
+        duration_estimate=duration_estimate,
+        prerequisites=prerequisites,
+        owner_id=user_id
+    )
+    
+    db.session.add(new_skill)
+    sync_skill_tags(new_skill)
+    db.session.commit()
+    response_cache.invalidate('skills', 'categories', 'tags')
+    
+    logger.info(f"New skill created: {name} by user {user_id}")
+    
+    return jsonify({
+        'message': 'Skill created successfully',
+        'skill': new_skill.to_dict()
+    }), 201
+
+@api.route('/api/skills/my-skills', methods=['GET'])
+@query_budget(4)
+@jwt_required()
+@handle_errors
+def get_my_skills():
+    user_id = get_jwt_identity()
+    skills = Skill.query.options(db.joinedload(Skill.owner)).filter_by(
+        owner_id=user_id
+    ).order_by(Skill.created_at.desc()).all()
+    return jsonify(serialize_skills(skills)), 200
+
+skill_catalog_validators = catalog_validators('skill')
+
+def skill_validators(id):
+    # Missing and inactive skills skip validation, so the view answers 404 and
+    # only a skill that resolved can be revalidated (and counted as viewed)
+    if not db.session.query(Skill.is_active).filter_by(id=id).scalar():
+        return None
+    return skill_catalog_validators(id=id)
+
+def count_revalidated_view(id):
+    view_counter.increment(id)
+
+@api.route('/api/skills/<int:id>', methods=['GET'])
+@query_budget(5)
+@read_only
+@conditional(skill_validators, on_not_modified=count_revalidated_view)
+@handle_errors
+def get_skill(id):
+    skill = Skill.query.get(id)
+    if not skill or not skill.is_active:
+        return jsonify({'error': 'Skill not found'}), 404
+    
+    # Count the view in memory; it is written to the database in batches
+    pending_views = view_counter.increment(skill.id)
+    
+    data = serialize_skills([skill])[0]
+    data['view_count'] = (skill.view_count or 0) + pending_views
+    data['rating_histogram'] = skill.get_rating_histogram()
+    
+    return jsonify(data), 200
+
+@api.route('/api/skills/<int:id>', methods=['PUT'])
+@jwt_required()
+@handle_errors
+def update_skill(id):
+    user_id = get_jwt_identity()
+    skill = Skill.query.get(id)
+    
+    if not skill:
+        return jsonify({'error': 'Skill not found'}), 404
+    
+    if skill.owner_id != user_id:
+        return jsonify({'error': 'Unauthorized to update this skill'}), 403
+    
+    data = request.get_json()
+    
+    previous_category = skill.category
+    
+    # Update allowed fields
+    for field in ['name', 'description', 'category', 'level', 'tags', 'duration_estimate', 'prerequisites']:
+        if field in data:
+            setattr(skill, field, format_tags(data[field]) if field == 'tags' else data[field])
+    
+    tags_changed = 'tags' in data and sync_skill_tags(skill)
+    
+    skill.updated_at = datetime.utcnow()
+    db.session.commit()
+    
+    namespaces = ['skills']
+    if skill.category != previous_category:
+        namespaces.append('categories')
+    if tags_changed:
+        namespaces.append('tags')
+    response_cache.invalidate(*namespaces)
+    
+    return jsonify({
+        'message': 'Skill updated successfully',
+        'skill': skill.to_dict()
+    }), 200
+
+@api.route('/api/skills/<int:id>', methods=['DELETE'])
+@jwt_required()
+@handle_errors
+def delete_skill(id):
+    user_id = get_jwt_identity()
+    skill = Skill.query.get(id)
+    
+    if not skill:
+        return jsonify({'error': 'Skill not found'}), 404
+    
+    if skill.owner_id != user_id:
+        return jsonify({'error': 'Unauthorized to delete this skill'}), 403
+    
+    db.session.delete(skill)
+    db.session.commit()
+    response_cache.invalidate('skills', 'categories', 'tags')
+    
+    logger.info(f"Skill deleted: {skill.name} by user {user_id}")
+    
+    return jsonify({'message': 'Skill deleted successfully'}), 200
+
+# Enhanced Request Routes
+@api.route('/api/requests', methods=['POST'])
+@jwt_required()
+@handle_errors
+def create_request():
+    user_id = get_jwt_identity()
+    data = request.get_json()
+    
+    skill_id = data.get('skillId')
+    message = data.get('message', '').strip()
+    priority = data.get('priority', 'normal')
+    preferred_schedule = data.get('preferred_schedule', '').strip()
+    
+    if not skill_id:
+        return jsonify({'error': 'Skill ID is required'}), 400
+    
+    skill = Skill.query.get(skill_id)
+    if not skill or not skill.is_active:
+        return jsonify({'error': 'Skill not found'}), 404
+    
+    if skill.owner_id == user_id:
+        return jsonify({'error': 'Cannot request your own skill'}), 400
+    
+    new_request = Request(
+        skill_id=skill_id,
+        requester_id=user_id,
+        message=message,
+        priority=priority,
+        preferred_schedule=preferred_schedule,
+        status='pending'
+    )
+    
+    # uq_request_pending allows one pending request per skill and requester
+    db.session.add(new_request)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'You already have a pending request for this skill'}), 400
+    
+    logger.info(f"New request created: skill {skill_id} by user {user_id}")
+    
+    return jsonify({
+        'message': 'Request created successfully',
+        'request': new_request.to_dict()
+    }), 201
+
+@api.route('/api/requests/received', methods=['GET'])
+@query_budget(3)
+@jwt_required()
+@handle_errors
+def get_received_requests():
+    user_id = get_jwt_identity()
+    
+    # Requests for skills owned by the user, in one join with the skill eager-loaded from it
+    query = Request.query.join(Request.skill).options(
+        db.contains_eager(Request.skill).joinedload(Skill.owner),
+        db.joinedload(Request.requester)
+    ).filter(Skill.owner_id == user_id)
+    
+    return request_inbox_response(query)
+
+@api.route('/api/requests/sent', methods=['GET'])
+@query_budget(3)
+@jwt_required()
+@handle_errors
+def get_sent_requests():
+    user_id = get_jwt_identity()
+    query = Request.query.options(*request_list_options()).filter_by(requester_id=user_id)
+    return request_inbox_response(query)
+
+@api.route('/api/requests/<int:id>', methods=['PUT'])
+@jwt_required()
+@handle_errors
+def update_request(id):
+    user_id = get_jwt_identity()
+    request_obj = Request.query.get(id)
+    
+    if not request_obj:
+        return jsonify({'error': 'Request not found'}), 404
+    
+    # Check if user is the owner of the skill
+    if request_obj.skill.owner_id != user_id:
+        return jsonify({'error': 'Unauthorized to update this request'}), 403
+    
+    data = request.get_json()
+    new_status = data.get('status')
+    notes = data.get('notes', '')
+    
+    if new_status not in ['accepted', 'rejected', 'completed']:
+        return jsonify({'error': 'Invalid status'}), 400
+    
+    request_obj.status = new_status
+    request_obj.notes = notes
+    request_obj.updated_at = datetime.utcnow()
+    
+    if new_status == 'completed':
+        request_obj.completed_at = datetime.utcnow()
+    
+    db.session.commit()
+    
+    logger.info(f"Request {id} updated to {new_status} by user {user_id}")
+    
+    return jsonify({
+        'message': f'Request {new_status} successfully',
+        'request': request_obj.to_dict()
+    }), 200
+
+@api.route('/api/requests/<int:id>', methods=['DELETE'])
+@jwt_required()
+@handle_errors
+def delete_request(id):
+    user_id = get_jwt_identity()
+    request_obj = Request.query.get(id)
+    
+    if not request_obj:
+        return jsonify({'error': 'Request not found'}), 404
+    
+    # Only requester can delete their own request
+    if request_obj.requester_id != user_id:
+        return jsonify({'error': 'Unauthorized to delete this request'}), 403
+    
+    db.session.delete(request_obj)
+    db.session.commit()
+    
+    logger.info(f"Request {id} deleted by user {user_id}")
+    
+    return jsonify({'message': 'Request deleted successfully'}), 200
+
+# Analytics and Stats Routes
+@api.route('/api/stats/dashboard', methods=['GET'])
+@query_budget(3)
+@jwt_required()
+@handle_errors
+def get_dashboard_stats():
+    user_id = get_jwt_identity()
+    
+    # One primary-key read: the stats row plus the rating aggregates on the user
+    query = db.session.query(UserStats, User.rating_sum, User.rating_count).join(
+        User, User.id == UserStats.user_id
+    ).filter(UserStats.user_id == user_id)
+    row = query.first()
+    
+    if row is None:
+        if not db.session.get(User, user_id):
+            return jsonify({'error': 'User not found'}), 404
+        # Users created before the stats table existed get their row on first read
+        rebuild_user_stats([user_id])
+        db.session.commit()
+        row = query.first()
+    
+    user_stats, rating_sum, rating_count = row
+    stats = user_stats.to_dict()
+    stats['average_rating'] = rating_sum / rating_count if rating_count else 0
+    stats['total_reviews'] = rating_count
+    
+    return jsonify(stats), 200
+
+# Admin Routes (Enhanced)
+@api.route('/api/admin/users', methods=['GET'])
+@query_budget(5)
+@read_only
+@admin_required
+@handle_errors
+def admin_get_users():
+    page, per_page = get_pagination_args()
+    
+    if 'cursor' in request.args:
+        try:
+            users, meta = cursor_page(User.query, User, per_page)
+        except InvalidCursor:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        return jsonify({'users': serialize_users(users), **meta}), 200
+    
+    users = User.query.order_by(User.created_at.desc()).paginate(
+        page=page, per_page=per_page, error_out=False
+    )
+    
+    return jsonify({
+        'users': serialize_users(users.items),
+        'total': users.total,
+        'pages': users.pages,
+        'current_page': page
+    }), 200
+
+@api.route('/api/admin/skills', methods=['GET'])
+@repeated_queries_expected
+@read_only
+@admin_required
+@handle_errors
+def admin_get_skills():
+    skills = Skill.query.options(db.joinedload(Skill.owner))
+    return stream_list(skills, Skill, serialize_skills)
+
+@api.route('/api/admin/requests', methods=['GET'])
+@repeated_queries_expected
+@read_only
+@admin_required
+@handle_errors
+def admin_get_requests():
+    requests = Request.query.options(*request_list_options())
+    return stream_list(requests, Request, serialize_requests)
+
+@api.route('/api/admin/stats', methods=['GET'])
+@query_budget(3)
+@admin_required
+@handle_errors
+def admin_get_stats():
+    counters = read_platform_counters()
+    if COUNTERS_SEEDED not in counters:
+        # Database created before the counters table existed: count once and store
+        repair_platform_counters()
+        db.session.commit()
+        counters = read_platform_counters()
+    
+    category_prefix = 'skills.category:'
+    stats = {
+        'total_users': counters.get('users.total', 0),
+        'active_users': counters.get('users.active', 0),
+        'total_skills': counters.get('skills.total', 0),
+        'active_skills': counters.get('skills.active', 0),
+        'total_requests': counters.get('requests.total', 0),
+        'pending_requests': counters.get('requests.status:pending', 0),
+        'completed_requests': counters.get('requests.status:completed', 0),
+        'categories': [
+            [name[len(category_prefix):], value]
+            for name, value in sorted(counters.items())
+            if name.startswith(category_prefix) and value
+        ]
+    }
+    
+    return jsonify(stats), 200
+
+@api.route('/api/admin/users/<int:id>', methods=['DELETE'])
+@admin_required
+@handle_errors
+def admin_delete_user(id):
+    user_id = get_jwt_identity()
+    
+    user = User.query.get(id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    if user.id == user_id:
+        return jsonify({'error': 'Cannot delete yourself'}), 400
+    
+    # Their skills, requests and reviews can run to thousands of rows; a job
+    # deletes them in batches. Until it runs the account is locked out.
+    user.is_active = False
+    revoke_user_tokens(user)
+    job = enqueue('delete-user', {'user_id': id}, key=f'user:{id}', created_by=user_id)
+    db.session.commit()
+    response_cache.invalidate('skills', 'categories', 'tags')
+    
+    logger.info(f"Deletion of user {id} queued as job {job.id} by admin {user_id}")
+    
+    return job_accepted(job, 'User deletion queued')
+
+@api.route('/api/admin/users/<int:id>/revoke-tokens', methods=['POST'])
+@admin_required
+@handle_errors
+def admin_revoke_user_tokens(id):
+    user = User.query.get(id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    revoke_user_tokens(user)
+    db.session.commit()
+    
+    logger.info(f"Tokens revoked for user {id} by admin {get_jwt_identity()}")
+    
+    return jsonify({'message': 'User tokens revoked successfully'}), 200
+
+@api.route('/api/admin/rebuilds', methods=['POST'])
+@admin_required
+@handle_errors
+def admin_queue_rebuild():
+    data = request.get_json() or {}
+    target = data.get('target')
+    if target not in REBUILD_TARGETS:
+        return jsonify({'error': f"Target must be one of: {', '.join(REBUILD_TARGETS)}"}), 400
+    
+    job = enqueue('rebuild', {'target': target}, key=f'rebuild:{target}', created_by=get_jwt_identity())
+    db.session.commit()
+    
+    logger.info(f"Rebuild of {target} queued as job {job.id} by admin {get_jwt_identity()}")
+    
+    return job_accepted(job, 'Rebuild queued')
+
+@api.route('/api/admin/jobs/<int:id>', methods=['GET'])
+@query_budget(3)
+@admin_required
+@handle_errors
+def admin_get_job(id):
+    job = db.session.get(Job, id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return jsonify(job.to_dict()), 200
+
+@api.route('/api/admin/metrics', methods=['GET'])
+@metrics_access_required
+def admin_get_metrics():
+    engines = [('primary', db.engine)]
+    if get_read_engine() is not None:
+        engines.append(('read', get_read_engine()))
+    try:
+        job_queue = queue_depth()
+    except SQLAlchemyError as e:
+        # The process metrics are still worth serving without the database
+        logger.warning(f"Job queue depth unavailable: {str(e)}")
+        db.session.rollback()
+        job_queue = None
+    gauges = service_gauges(view_counter.metrics(), response_cache.stats(), engines, job_queue)
+    return Response(metrics_registry.render(gauges), content_type=EXPOSITION_CONTENT_TYPE)
+
+# Health and utility endpoints
+@api.route('/api/health', methods=['GET'])
+@query_budget(0)
+def health_check():
+    return jsonify({
+        'status': 'healthy',
+        'message': 'SkillSwap API is running',
+        'version': '2.0.0',
+        'timestamp': datetime.utcnow().isoformat(),
+        'view_counts': view_counter.metrics()
+    }), 200
+
+@api.route('/api/categories', methods=['GET'])
+@query_budget(3)
+@read_only
+@conditional(catalog_validators('categories'))
+@cached_response('categories')
+def get_categories():
+    categories = db.session.query(
+        Skill.category, 
+        db.func.count(Skill.id).label('count')
+    ).filter_by(is_active=True).group_by(Skill.category).all()
+    
+    return jsonify([
+        {'name': cat[0], 'count': cat[1]} for cat in categories
+    ]), 200
+
+@api.route('/api/tags', methods=['GET'])
+@query_budget(3)
+@read_only
+@conditional(catalog_validators('tags'))
+@cached_response('tags', params=('limit',), defaults={'limit': '100'})
+def get_tags():
+    limit = min(max(request.args.get('limit', 100, type=int), 1), 500)
+    
+    # Served from the precomputed usage counts; no skill rows are read
+    tags = Tag.query.filter(Tag.usage_count > 0).order_by(
+        Tag.usage_count.desc(), Tag.name
+    ).limit(limit).all()
+    
+    return jsonify([tag.to_dict() for tag in tags]), 200
+
+# Error Handlers
+@api.app_errorhandler(404)
+def not_found(error):
+    return jsonify({'error': 'Resource not found'}), 404
+
+@api.app_errorhandler(500)
+def internal_error(error):
+    db.session.rollback()
+    logger.error(f"Internal server error: {str(error)}")
+    return jsonify({'error': 'Internal server error'}), 500
+
+@api.app_errorhandler(400)
+def bad_request(error):
+    return jsonify({'error': 'Bad request'}), 400
+
+@api.app_errorhandler(401)
+def unauthorized(error):
+    return jsonify({'error': 'Unauthorized'}), 401
+
+@api.app_errorhandler(403)
+def forbidden(error):
+    return jsonify({'error': 'Forbidden'}), 403
@@ -0,0 +1,83 @@
+"""Schema management with Flask-Migrate (Alembic).
+
+The models are the source of truth and ``migrations/versions`` holds one
+revision per schema change; ``flask --app app db upgrade`` applies them.
+Databases created by ``db.create_all()`` before migrations existed have no
+version table. ``upgrade_schema`` works out which revision their tables match
+and stamps that before upgrading.
+"""
+import os
+
+from flask_migrate import stamp, upgrade
+from sqlalchemy import inspect
+
+import search as skill_search
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+# The schema the original app's db.create_all() produced
+INITIAL_REVISION = '0001'
+
+
+def _has_table(table):
+    return lambda inspector: inspector.has_table(table)
+
+
+def _has_column(table, column):
+    return lambda inspector: inspector.has_table(table) and column in {
+        c['name'] for c in inspector.get_columns(table)
+    }
+
+
+def _has_index(table, index):
+    return lambda inspector: index in {i['name'] for i in inspector.get_indexes(table)}
+
+
+# What each revision up to the one that introduced migrations adds, oldest first. Every
+# app version built its whole schema with create_all(), so an unversioned database
+# has everything up to the newest revision whose marker is present. 0003 (the
+# full-text index) is optional and has no marker; its statements are idempotent.
+LEGACY_MARKERS = (
+    ('0002', _has_column('user', 'rating_sum')),
+    ('0004', _has_column('user', 'token_version')),
+    ('0005', _has_index('request', 'ix_request_skill_created')),
+    ('0006', _has_table('user_stats')),
+    ('0007', _has_table('platform_counter')),
+    ('0008', _has_table('tag')),
+    ('0009', _has_column('platform_counter', 'updated_at')),
+    ('0010', _has_index('review', 'ix_review_skill_id')),
+)
+
+
+def detect_revision(connection):
+    """The revision an unversioned database built by ``db.create_all()`` matches."""
+    inspector = inspect(connection)
+    revision = INITIAL_REVISION
+    for candidate, present in LEGACY_MARKERS:
+        if present(inspector):
+            revision = candidate
+    return revision
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """Leave the full-text index (a virtual table and its shadow tables) out of autogenerate."""
+    return not (type_ == 'table' and name.startswith(skill_search.FTS_TABLE))
+
+
+def upgrade_schema(db):
+    """Bring the current app's database up to the latest revision."""
+    with db.engine.connect() as connection:
+        tables = inspect(connection).get_table_names()
+        if tables and 'alembic_version' not in tables:
+            revision = detect_revision(connection)
+        else:
+            revision = None
+    if revision is not None:
+        stamp(revision=revision)
+    upgrade()
+
+
+def create_schema(db):
+    """Create every table from the models and record it as the latest revision."""
+    db.create_all()
+    stamp()
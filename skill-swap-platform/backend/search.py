@@ -0,0 +1,147 @@
+"""Full-text search for skills backed by SQLite FTS5.
+
+The index is an external-content FTS5 table (``skill_fts``) over the name,
+description and tags columns of ``skill``. Triggers keep it in sync with
+every insert, update and delete, so application code never writes to it
+directly. On databases without FTS5 (or non-SQLite databases) callers fall
+back to the ``ILIKE`` scan.
+"""
+import re
+
+from flask import has_app_context
+from sqlalchemy import DDL, column, event, literal_column, select, table, text
+
+from extensions import search_index_state
+
+FTS_TABLE = 'skill_fts'
+
+# Column weights for bm25(): name matches count most, then tags, then description
+RANK_EXPRESSION = f'bm25({FTS_TABLE}, 10.0, 1.0, 4.0)'
+
+MAX_TERMS = 8
+TERM_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+CREATE_STATEMENTS = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description, tags,
+        content='skill', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON skill BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description, tags)
+        VALUES (new.id, new.name, new.description, new.tags);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON skill BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description, tags)
+        VALUES ('delete', old.id, old.name, old.description, old.tags);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, description, tags ON skill BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description, tags)
+        VALUES ('delete', old.id, old.name, old.description, old.tags);
+        INSERT INTO {FTS_TABLE}(rowid, name, description, tags)
+        VALUES (new.id, new.name, new.description, new.tags);
+    END
+    """,
+)
+
+DROP_STATEMENT = f'DROP TABLE IF EXISTS {FTS_TABLE}'
+TRIGGERS = (f'{FTS_TABLE}_ai', f'{FTS_TABLE}_ad', f'{FTS_TABLE}_au')
+
+fts_table = table(FTS_TABLE, column('rowid'))
+
+
+def supports_fts5(connection):
+    if connection.dialect.name != 'sqlite':
+        return False
+    options = connection.exec_driver_sql('PRAGMA compile_options').scalars().all()
+    return 'ENABLE_FTS5' in options
+
+
+def _should_create(ddl, target, bind, **kw):
+    return supports_fts5(bind)
+
+
+def _forget_index(engine):
+    if has_app_context():
+        search_index_state.pop(str(engine.url), None)
+
+
+def _reset_state(target, connection, **kw):
+    _forget_index(connection.engine)
+
+
+def install(skill_table):
+    """Create/drop the index together with the skill table."""
+    for statement in CREATE_STATEMENTS:
+        event.listen(skill_table, 'after_create', DDL(statement).execute_if(callable_=_should_create))
+    event.listen(skill_table, 'before_drop', DDL(DROP_STATEMENT).execute_if(dialect='sqlite'))
+    event.listen(skill_table, 'after_create', _reset_state)
+    event.listen(skill_table, 'after_drop', _reset_state)
+
+
+def is_available(session):
+    """Whether the session's database has the index; remembered per app and engine URL."""
+    engine = session.get_bind()
+    key = str(engine.url)
+    if key not in search_index_state:
+        if engine.dialect.name != 'sqlite':
+            search_index_state[key] = False
+        else:
+            search_index_state[key] = session.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {'name': FTS_TABLE}
+            ).first() is not None
+    return search_index_state[key]
+
+
+def build_match_query(search):
+    """Turn free text into an FTS5 query: every term must match, as a prefix.
+
+    Terms are quoted, so FTS5 operators in user input are treated as text.
+    Returns None when the input has no searchable terms.
+    """
+    terms = TERM_PATTERN.findall(search.lower())[:MAX_TERMS]
+    if not terms:
+        return None
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def matching_skills(match_query):
+    """Subquery of (skill_id, rank) for skills matching an FTS5 query; lower rank is better.
+
+    The unary ``+`` stops SQLite from using ``skill_id = skill.id`` as a rowid
+    lookup into the index. Otherwise the planner may scan every active skill
+    and run the MATCH once per row, which it did for the pagination count.
+    """
+    return select(
+        literal_column(f'+{FTS_TABLE}.rowid').label('skill_id'),
+        literal_column(RANK_EXPRESSION).label('rank')
+    ).select_from(fts_table).where(
+        text(f'{FTS_TABLE} MATCH :match_query').bindparams(match_query=match_query)
+    ).subquery('search_matches')
+
+
+def drop_triggers(connection):
+    """Stop keeping the index in sync, ahead of a bulk load; ``rebuild`` restores it."""
+    for trigger in TRIGGERS:
+        connection.exec_driver_sql(f'DROP TRIGGER IF EXISTS {trigger}')
+
+
+def rebuild(session):
+    """Create the index if it is missing and repopulate it from the skill table."""
+    connection = session.connection()
+    if not supports_fts5(connection):
+        return False
+    for statement in CREATE_STATEMENTS:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    _forget_index(connection.engine)
+    return True
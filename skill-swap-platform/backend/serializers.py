@@ -0,0 +1,100 @@
+"""Response shaping helpers: sparse fieldsets, expansions and a fast JSON provider.
+
+``?fields=`` trims payloads to the listed keys. Dotted paths reach into
+embedded objects, e.g. ``fields=id,status,skill.name``. ``?expand=`` picks which
+relations are embedded at all. ``FastJSONProvider`` swaps Flask's stdlib
+encoder for orjson when it is installed and produces the same JSON.
+"""
+from collections.abc import Sequence
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+class InvalidFieldSelection(ValueError):
+    pass
+
+
+def parse_list_arg(args, name):
+    """Comma-separated query parameter as a set, or None when it was not given."""
+    if name not in args:
+        return None
+    return {part.strip() for part in args.get(name, '').split(',') if part.strip()}
+
+
+def parse_expand(args, allowed, default):
+    """Relations to embed. Asking for ``a.b`` implies ``a``; unknown names are rejected."""
+    expand = parse_list_arg(args, 'expand')
+    if expand is None:
+        return set(default)
+    unknown = expand - set(allowed)
+    if unknown:
+        raise InvalidFieldSelection(f"Unknown expand: {', '.join(sorted(unknown))}")
+    for path in list(expand):
+        parts = path.split('.')
+        expand.update('.'.join(parts[:depth]) for depth in range(1, len(parts)))
+    return expand
+
+
+def build_field_tree(fields):
+    """``{'id', 'skill.name'}`` -> ``{'id': None, 'skill': {'name': None}}``."""
+    tree = {}
+    for path in fields:
+        node = tree
+        parts = path.split('.')
+        for part in parts[:-1]:
+            child = node.get(part)
+            if child is None:
+                # Selecting a nested key keeps only the selected part of that object
+                child = node[part] = {}
+            node = child
+        node.setdefault(parts[-1], None)
+    return tree
+
+
+def project(data, tree):
+    """Keep only the keys in ``tree``; a None leaf keeps the whole value."""
+    if tree is None or data is None:
+        return data
+    if isinstance(data, list):
+        return [project(item, tree) for item in data]
+    return {key: project(data[key], subtree) for key, subtree in tree.items() if key in data}
+
+
+def _default(o):
+    if isinstance(o, Sequence) and not isinstance(o, (str, bytes)):
+        # SQLAlchemy result rows are sequences but not tuples/lists
+        return list(o)
+    return DefaultJSONProvider.default(o)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson when it is installed.
+
+    Output matches the default provider: sorted keys, non-string dict keys
+    converted to strings, and dates in the same HTTP date format.
+    """
+
+    default = staticmethod(_default)
+
+    def _options(self):
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self._options()).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        if orjson is None or self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -0,0 +1,34 @@
+"""Incremental JSON encoders for large list responses.
+
+Both encoders consume an iterator of batches (lists of dicts) and yield text
+chunks, so a response can start before the first row is fetched and never
+holds more than one batch in memory.
+"""
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def wants_ndjson(request):
+    """NDJSON is opt-in via ``?format=ndjson`` or ``Accept: application/x-ndjson``."""
+    if request.args.get('format') == 'ndjson':
+        return True
+    return request.accept_mimetypes.best == NDJSON_MIMETYPE
+
+
+def json_array_chunks(batches, dumps):
+    """Encode batches as a single JSON array, one chunk per batch."""
+    yield '['
+    first = True
+    for batch in batches:
+        if not batch:
+            continue
+        chunk = ','.join(dumps(item) for item in batch)
+        yield chunk if first else ',' + chunk
+        first = False
+    yield ']'
+
+
+def ndjson_chunks(batches, dumps):
+    """Encode batches as newline-delimited JSON, one object per line."""
+    for batch in batches:
+        if batch:
+            yield ''.join(dumps(item) + '\n' for item in batch)
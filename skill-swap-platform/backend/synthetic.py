@@ -0,0 +1,384 @@
+"""Deterministic synthetic dataset for benchmarks and load tests.
+
+``generate(volumes, seed)`` fills an empty schema with users, skills (with
+tags), requests and reviews. The same seed and volumes always give the same
+rows, so benchmark runs are comparable. The data has realistic skew:
+
+- a few users own many skills and a few skills get most of the requests
+  (power-law popularity, scattered over the id range rather than clustered)
+- categories, levels, tags and request statuses follow fixed, uneven weights
+- reviews come from completed requests; each skill has a hidden quality that
+  pulls its ratings up or down, and most ratings are 4 or 5 stars
+
+Rows are written with Core ``executemany`` in batches, bypassing the ORM,
+and the secondary indexes and the search index are built after the load. Every user shares one
+precomputed password hash. Because mapper events don't fire for Core
+inserts, the read models (ratings, user stats, tag usage, platform counters)
+are rebuilt from the loaded tables at the end.
+"""
+import random
+import time
+from array import array
+from bisect import bisect
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from bcrypt import hashpw
+from flask import current_app
+
+import search as skill_search
+from aggregates import (
+    rebuild_rating_aggregates, rebuild_tag_usage, rebuild_user_stats, repair_platform_counters
+)
+from extensions import db
+from models import Request, Review, Skill, SkillTag, Tag, User
+
+SYNTHETIC_PASSWORD = 'password123'
+ADMIN_EMAIL = 'admin@skillswap.com'
+ADMIN_PASSWORD = 'admin123'
+
+# Everything is dated inside this window, so reruns give identical timestamps
+EPOCH = datetime(2023, 1, 1)
+SPAN_SECONDS = 730 * 24 * 3600
+
+BCRYPT_ALPHABET = './ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'
+
+# Knuth's multiplicative hash constant; being prime, it scatters 0..n-1 over 0..n-1
+SCATTER = 2654435761
+
+CATEGORIES = (
+    ('programming', 30), ('languages', 16), ('music', 14), ('design', 10), ('business', 8),
+    ('marketing', 6), ('fitness', 5), ('cooking', 4), ('photography', 3), ('writing', 2),
+    ('other', 2),
+)
+LEVELS = (('beginner', 45), ('intermediate', 33), ('advanced', 16), ('expert', 6))
+STATUSES = (('completed', 40), ('pending', 25), ('accepted', 20), ('rejected', 15))
+PRIORITIES = (('normal', 70), ('high', 18), ('low', 12))
+TAGS_PER_SKILL = ((0, 10), (1, 20), (2, 35), (3, 25), (4, 10))
+DURATIONS = ('1 week', '2-4 weeks', '1-2 months', '3 months', 'ongoing')
+
+TOPICS = (
+    'python react guitar piano spanish french design figma marketing seo cooking baking '
+    'photography video editing writing poetry chess yoga fitness running drawing painting '
+    'javascript typescript django flask rust golang kubernetes docker excel finance '
+    'statistics calculus physics chemistry biology history philosophy public speaking '
+    'negotiation leadership knitting sewing gardening woodworking welding pottery'
+).split()
+FIRST_NAMES = (
+    'Ava Ben Chloe Daniel Emma Felix Grace Hugo Isla Jack Kira Liam Maya Noah Olivia '
+    'Priya Quinn Ravi Sofia Tom Uma Victor Wen Xavier Yara Zane'
+).split()
+LAST_NAMES = (
+    'Smith Garcia Chen Patel Müller Okafor Rossi Kim Silva Novak Haddad Larsen Tanaka '
+    'Dubois Ivanova Moreau Nguyen Kowalski Hernandez Brown'
+).split()
+
+
+@dataclass
+class Volumes:
+    users: int = 10_000
+    skills: int = 50_000
+    requests: int = 200_000
+    reviews: int = 50_000
+
+
+class Weighted:
+    """Pick from ``(value, weight)`` pairs; a cheaper ``random.choices(k=1)``."""
+
+    def __init__(self, pairs):
+        self.values = [value for value, _ in pairs]
+        self.cumulative = []
+        total = 0
+        for _, weight in pairs:
+            total += weight
+            self.cumulative.append(total)
+        self.total = total
+
+    def pick(self, rng):
+        return self.values[bisect(self.cumulative, rng.random() * self.total)]
+
+
+def _ranked(rng, count, skew):
+    """A 0-based rank in ``range(count)``; ``u ** skew`` piles samples onto the first ranks."""
+    return int(count * rng.random() ** skew)
+
+
+def _popular(rng, count, skew):
+    """Like ``_ranked``, but with the popular rows spread across the table
+    instead of all being the oldest ones."""
+    return (_ranked(rng, count, skew) + 1) * SCATTER % count
+
+
+def _timestamp(position, total, rng, jitter_hours=12):
+    seconds = SPAN_SECONDS * position / max(total, 1) + rng.random() * jitter_hours * 3600
+    return EPOCH + timedelta(seconds=int(seconds))
+
+
+def _quality(skill_id):
+    """Hidden 0..1 quality of a skill, stable for a given id."""
+    return (skill_id * SCATTER) % 1000 / 1000
+
+
+def _password_hash(password, rounds, rng):
+    """bcrypt hash with a salt drawn from ``rng``, so reruns store the same hash."""
+    # 22 salt characters carry 128 bits; the last one only uses its top two bits
+    salt = ''.join(rng.choice(BCRYPT_ALPHABET) for _ in range(21)) + rng.choice('.Oeu')
+    return hashpw(password.encode('utf-8'), f'$2b${rounds:02d}${salt}'.encode('ascii')).decode('utf-8')
+
+
+def _step_for(count):
+    """A stride that visits every one of ``count`` users before repeating."""
+    strides = (7919, 7907, 7901)
+    for step in strides:
+        if count % step:
+            return step
+    raise ValueError(f'No stride for {count} users: it is a multiple of each of {strides}')
+
+
+def _inserter(connection, table, keys):
+    """``insert(rows)`` for dict rows with exactly ``keys``.
+
+    On drivers with positional parameters (SQLite) rows go to the DBAPI's
+    ``executemany`` as tuples, converted by each column type's own bind
+    processor, which skips SQLAlchemy's per-row parameter handling but stores
+    the same values. Other drivers use a plain Core insert.
+    """
+    statement = table.insert()
+    compiled = statement.compile(dialect=connection.dialect, column_keys=keys)
+    order = list(compiled.positiontup or ())
+    # Columns left out of the rows get their (constant) Python-side defaults
+    defaults = {key: table.c[key].default for key in order if key not in keys}
+    if not compiled.positional or not all(default.is_scalar for default in defaults.values()):
+        return lambda rows: connection.execute(statement, rows)
+
+    processors = [table.c[key].type.bind_processor(connection.dialect) for key in order]
+    sql = str(compiled)
+
+    def insert(rows):
+        connection.exec_driver_sql(sql, [
+            tuple(
+                value if process is None or value is None else process(value)
+                for value, process in zip(
+                    [row[key] if key in row else defaults[key].arg for key in order], processors
+                )
+            )
+            for row in rows
+        ])
+    return insert
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _user_rows(count, rng, password_hash, admin_hash):
+    first_names, last_names = FIRST_NAMES, LAST_NAMES
+    for user_id in range(1, count + 1):
+        created_at = _timestamp(user_id, count, rng)
+        if user_id == 1:
+            name, email, role, hashed = 'Admin', ADMIN_EMAIL, 'admin', admin_hash
+        else:
+            name = f'{rng.choice(first_names)} {rng.choice(last_names)}'
+            email, role, hashed = f'user{user_id}@example.com', 'user', password_hash
+        yield {
+            'id': user_id,
+            'name': name,
+            'email': email,
+            'password_hash': hashed,
+            'bio': f'Happy to swap {rng.choice(TOPICS)} for {rng.choice(TOPICS)}',
+            'role': role,
+            'avatar_url': '',
+            'is_active': user_id == 1 or rng.random() >= 0.03,
+            'token_version': 0,
+            'last_login': created_at + timedelta(days=rng.randrange(60)) if rng.random() < 0.7 else None,
+            'created_at': created_at,
+            'updated_at': created_at,
+        }
+
+
+def _skill_rows(count, user_count, rng, skill_owner):
+    """``(skill row, skill_tag rows)`` pairs; records each skill's owner in ``skill_owner``."""
+    categories, levels, tag_counts = Weighted(CATEGORIES), Weighted(LEVELS), Weighted(TAGS_PER_SKILL)
+    for skill_id in range(1, count + 1):
+        owner_id = _popular(rng, user_count, 2.5) + 1
+        skill_owner[skill_id] = owner_id
+        topic = TOPICS[_ranked(rng, len(TOPICS), 1.8)]
+        level = levels.pick(rng)
+        tag_ids = {
+            _ranked(rng, len(TOPICS), 1.8) + 1
+            for _ in range(tag_counts.pick(rng))
+        }
+        created_at = _timestamp(skill_id, count, rng)
+        yield {
+            'id': skill_id,
+            'name': f'{level.title()} {topic.title()}',
+            'description': f'Learn {topic} with hands-on sessions. ' + ' '.join(rng.sample(TOPICS, 6)),
+            'category': categories.pick(rng),
+            'level': level,
+            'tags': ', '.join(TOPICS[tag_id - 1] for tag_id in sorted(tag_ids)),
+            'duration_estimate': rng.choice(DURATIONS),
+            'prerequisites': '',
+            'is_active': rng.random() >= 0.05,
+            'view_count': int(rng.paretovariate(1.2) * 5),
+            'owner_id': owner_id,
+            'created_at': created_at,
+            'updated_at': created_at,
+        }, [{'skill_id': skill_id, 'tag_id': tag_id} for tag_id in sorted(tag_ids)]
+
+
+def _request_rows(count, user_count, skill_count, review_target, rng, skill_owner):
+    """``(request row, review rows)`` pairs; a sample of completed requests gets a review.
+
+    Each skill's n-th request comes from a different user (stepping through the
+    users from a per-skill offset), so no requester asks for the same skill twice.
+    """
+    step = _step_for(user_count)
+    review_id = 0
+    statuses, priorities = Weighted(STATUSES), Weighted(PRIORITIES)
+    requests_per_skill = array('i', [0]) * (skill_count + 1)
+    completed_share = dict(STATUSES)['completed'] / sum(weight for _, weight in STATUSES)
+    review_chance = min(1.0, review_target / max(count * completed_share, 1))
+    for request_id in range(1, count + 1):
+        skill_id = _popular(rng, skill_count, 3) + 1
+        owner_id = skill_owner[skill_id]
+        seen = requests_per_skill[skill_id]
+        if seen >= user_count - 1:
+            continue  # every other user already asked for this skill
+        requester_id = (skill_id * SCATTER + seen * step) % user_count + 1
+        if requester_id == owner_id:
+            seen += 1
+            requester_id = (skill_id * SCATTER + seen * step) % user_count + 1
+        requests_per_skill[skill_id] = seen + 1
+
+        created_at = _timestamp(request_id, count, rng, jitter_hours=48)
+        status = statuses.pick(rng)
+        completed_at = created_at + timedelta(days=rng.randrange(1, 30)) if status == 'completed' else None
+        request = {
+            'id': request_id,
+            'skill_id': skill_id,
+            'requester_id': requester_id,
+            'message': f'Hi! I would love to learn this. I can teach {rng.choice(TOPICS)} in return.',
+            'status': status,
+            'priority': priorities.pick(rng),
+            'preferred_schedule': '',
+            'notes': '',
+            'created_at': created_at,
+            'updated_at': completed_at or created_at,
+            'completed_at': completed_at,
+        }
+        if not completed_at or review_id >= review_target or rng.random() >= review_chance:
+            yield request, []
+        else:
+            review_id += 1
+            rating = round(3.1 + 1.8 * _quality(skill_id) + rng.gauss(0, 0.9))
+            yield request, [{
+                'id': review_id,
+                'skill_id': skill_id,
+                'reviewer_id': requester_id,
+                'reviewee_id': owner_id,
+                'rating': min(5, max(1, rating)),
+                'comment': '',
+                'is_public': True,
+                'created_at': completed_at + timedelta(hours=rng.randrange(1, 72)),
+            }]
+
+
+def generate(volumes, seed=42, batch_size=10_000, log=print):
+    """Load ``volumes`` of synthetic rows into the (empty) current database.
+
+    Returns ``{table: row count}``. Must run inside an app context.
+    """
+    started = time.perf_counter()
+    rounds = current_app.config['BCRYPT_LOG_ROUNDS']
+    salts = random.Random(f'{seed}:passwords')
+    password_hash = _password_hash(SYNTHETIC_PASSWORD, rounds, salts)
+    admin_hash = _password_hash(ADMIN_PASSWORD, rounds, salts)
+
+    tables = [model.__table__ for model in (User, Tag, Skill, SkillTag, Request, Review)]
+    indexes = [index for table in tables for index in table.indexes]
+    counts = dict.fromkeys((table.name for table in tables), 0)
+
+    with db.engine.connect() as connection:
+        if connection.dialect.name == 'sqlite':
+            # Throwaway load on its own connection: durability only matters once it has finished
+            connection.exec_driver_sql('PRAGMA synchronous=OFF')
+        # One index rebuild at the end is much cheaper than a trigger per skill
+        reindex_search = skill_search.supports_fts5(connection)
+        if reindex_search:
+            skill_search.drop_triggers(connection)
+        for index in indexes:
+            index.drop(connection)
+        connection.commit()
+
+        inserters = {}
+
+        def write(table, rows):
+            if table.name not in inserters:
+                inserters[table.name] = _inserter(connection, table, list(rows[0]))
+            inserters[table.name](rows)
+            counts[table.name] += len(rows)
+
+        def load(table, rows, label, children=None):
+            """Insert ``rows``, or ``(row, child rows)`` pairs when ``children`` is a table."""
+            for batch in _batches(rows, batch_size):
+                child_rows = []
+                if children is not None:
+                    child_rows = [child for _, group in batch for child in group]
+                    batch = [row for row, _ in batch]
+                write(table, batch)
+                if child_rows:
+                    write(children, child_rows)
+                connection.commit()
+            loaded = f"{counts[table.name]:,} rows"
+            if children is not None:
+                loaded += f" + {counts[children.name]:,} {children.name} rows"
+            log(f"✅ {label}: {loaded} ({time.perf_counter() - started:.0f}s)")
+
+        skill_owner = array('i', [0]) * (volumes.skills + 1)
+        load(User.__table__, _user_rows(
+            volumes.users, random.Random(f'{seed}:users'), password_hash, admin_hash
+        ), 'users')
+        load(Tag.__table__, (
+            {'id': tag_id, 'name': name, 'usage_count': 0} for tag_id, name in enumerate(TOPICS, 1)
+        ), 'tags')
+        load(Skill.__table__, _skill_rows(
+            volumes.skills, volumes.users, random.Random(f'{seed}:skills'), skill_owner
+        ), 'skills', children=SkillTag.__table__)
+        load(Request.__table__, _request_rows(
+            volumes.requests, volumes.users, volumes.skills, volumes.reviews,
+            random.Random(f'{seed}:requests'), skill_owner
+        ), 'requests', children=Review.__table__)
+        del skill_owner
+
+    # Before the secondary indexes exist, so the GROUP BYs sort sequential table scans
+    # instead of following an index into tables that may be larger than memory
+    for label, rebuild in (
+        ('ratings', rebuild_rating_aggregates),
+        ('user stats', rebuild_user_stats),
+        ('tag usage', rebuild_tag_usage),
+        ('platform counters', repair_platform_counters),
+    ):
+        rebuild()
+        db.session.commit()
+        log(f"✅ {label} rebuilt ({time.perf_counter() - started:.0f}s)")
+
+    with db.engine.connect() as connection:
+        for index in indexes:
+            index.create(connection)
+        if connection.dialect.name == 'sqlite':
+            connection.exec_driver_sql('ANALYZE')
+        connection.commit()
+    log(f"✅ indexes built ({time.perf_counter() - started:.0f}s)")
+    if reindex_search:
+        skill_search.rebuild(db.session)
+        db.session.commit()
+        log(f"✅ search index rebuilt ({time.perf_counter() - started:.0f}s)")
+    log(f"🎉 Synthetic dataset ready in {time.perf_counter() - started:.0f}s")
+    return counts
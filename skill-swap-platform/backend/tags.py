@@ -0,0 +1,48 @@
+"""Parsing of the free-form ``Skill.tags`` value into normalized tag names.
+
+Clients have sent tags as a comma-separated string ("Python, web"), as a JSON
+array string ('["python", "web"]') or as an actual list. All of them map to
+the same lower-cased, whitespace-collapsed, de-duplicated names, which are
+what the ``tag`` table stores and what ``?tag=`` matches exactly.
+"""
+import json
+
+MAX_TAG_LENGTH = 50
+MAX_TAGS_PER_SKILL = 20
+
+
+def normalize_tag(value):
+    """Canonical form of one tag ('  Web  Dev ' -> 'web dev'), or '' if unusable."""
+    name = ' '.join(str(value).split()).lower().strip('#')
+    return name[:MAX_TAG_LENGTH].strip()
+
+
+def parse_tags(value):
+    """Ordered list of unique normalized tag names from any accepted tags value."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        text = value.strip()
+        if text.startswith('['):
+            try:
+                value = json.loads(text)
+            except ValueError:
+                value = text.strip('[]').split(',')
+        else:
+            value = text.split(',')
+    if not isinstance(value, (list, tuple)):
+        value = [value]
+
+    names = []
+    for item in value:
+        name = normalize_tag(item)
+        if name and name not in names:
+            names.append(name)
+    return names[:MAX_TAGS_PER_SKILL]
+
+
+def format_tags(value):
+    """Storable ``Skill.tags`` text: strings are kept as sent, lists become "a, b"."""
+    if isinstance(value, (list, tuple)):
+        return ', '.join(parse_tags(value))
+    return value or ''
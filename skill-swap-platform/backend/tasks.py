@@ -0,0 +1,106 @@
+"""Job handlers for work too heavy for a request (see jobs.py).
+
+Deletes here are set-based Core statements run in batches, so they skip the
+mapper events that maintain the read models. Each batch takes its rows out of
+the platform counters before deleting them, then rebuilds the user stats,
+ratings and tag usage it touched.
+"""
+from flask import current_app
+
+import search as skill_search
+from aggregates import (
+    rebuild_rating_aggregates, rebuild_tag_usage, rebuild_user_stats, repair_platform_counters,
+    subtract_platform_counters
+)
+from extensions import db, principal_cache, response_cache
+from jobs import job_handler
+from models import Request, Review, Skill, SkillTag, User, UserStats
+
+
+def _distinct(column, *criteria):
+    return list(db.session.execute(db.select(column).where(*criteria).distinct()).scalars())
+
+
+@job_handler('delete-user')
+def delete_user(payload, heartbeat):
+    """Delete a user with their skills and everything attached to them, a batch of skills at a time."""
+    user_id = payload['user_id']
+    batch_size = current_app.config['JOB_BATCH_SIZE']
+    users = User.__table__
+    skills = Skill.__table__
+    requests = Request.__table__
+    reviews = Review.__table__
+    links = SkillTag.__table__
+    deleted = {'skills': 0, 'requests': 0, 'reviews': 0}
+
+    # The user's skills, with the requests, reviews and tag links on them
+    while True:
+        skill_ids = list(db.session.execute(
+            db.select(skills.c.id).where(skills.c.owner_id == user_id).order_by(skills.c.id).limit(batch_size)
+        ).scalars())
+        if not skill_ids:
+            break
+
+        requester_ids = _distinct(requests.c.requester_id, requests.c.skill_id.in_(skill_ids))
+        reviewee_ids = _distinct(reviews.c.reviewee_id, reviews.c.skill_id.in_(skill_ids))
+        tag_ids = _distinct(links.c.tag_id, links.c.skill_id.in_(skill_ids))
+        subtract_platform_counters(
+            skills=skills.c.id.in_(skill_ids), requests=requests.c.skill_id.in_(skill_ids)
+        )
+        db.session.execute(links.delete().where(links.c.skill_id.in_(skill_ids)))
+        deleted['reviews'] += db.session.execute(
+            reviews.delete().where(reviews.c.skill_id.in_(skill_ids))
+        ).rowcount
+        deleted['requests'] += db.session.execute(
+            requests.delete().where(requests.c.skill_id.in_(skill_ids))
+        ).rowcount
+        deleted['skills'] += db.session.execute(
+            skills.delete().where(skills.c.id.in_(skill_ids))
+        ).rowcount
+
+        rebuild_user_stats(requester_ids + [user_id])
+        rebuild_rating_aggregates(user_ids=reviewee_ids)
+        rebuild_tag_usage(tag_ids)
+        db.session.commit()
+        heartbeat()
+
+    # Requests and reviews the user left on other people's skills, then the user
+    sent = requests.c.requester_id == user_id
+    written = db.or_(reviews.c.reviewer_id == user_id, reviews.c.reviewee_id == user_id)
+    owner_ids = _distinct(skills.c.owner_id, skills.c.id.in_(db.select(requests.c.skill_id).where(sent)))
+    reviewed_skill_ids = _distinct(reviews.c.skill_id, written)
+    reviewee_ids = _distinct(reviews.c.reviewee_id, written, reviews.c.reviewee_id != user_id)
+
+    subtract_platform_counters(users=users.c.id == user_id, requests=sent)
+    deleted['reviews'] += db.session.execute(reviews.delete().where(written)).rowcount
+    deleted['requests'] += db.session.execute(requests.delete().where(sent)).rowcount
+    stats = UserStats.__table__
+    db.session.execute(stats.delete().where(stats.c.user_id == user_id))
+    deleted['users'] = db.session.execute(users.delete().where(users.c.id == user_id)).rowcount
+
+    rebuild_user_stats(owner_ids)
+    rebuild_rating_aggregates(user_ids=reviewee_ids, skill_ids=reviewed_skill_ids)
+    db.session.commit()
+
+    principal_cache.delete(user_id)
+    response_cache.invalidate('skills', 'categories', 'tags')
+    return deleted
+
+
+REBUILD_TARGETS = {
+    'ratings': rebuild_rating_aggregates,
+    'user-stats': rebuild_user_stats,
+    'tags': rebuild_tag_usage,
+    'counters': repair_platform_counters,
+    'search': lambda: skill_search.rebuild(db.session)
+}
+
+
+@job_handler('rebuild')
+def rebuild(payload, heartbeat):
+    """Recompute one read model from its source tables."""
+    target = payload['target']
+    REBUILD_TARGETS[target]()
+    db.session.commit()
+    response_cache.invalidate('skills', 'categories', 'tags')
+    return {'target': target}
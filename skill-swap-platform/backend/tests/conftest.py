@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+from app import create_app  # noqa: E402
+from extensions import db, query_auditor, view_counter  # noqa: E402
+from models import User  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    """A fresh app on its own in-memory database."""
+    app = create_app(config.TESTING)
+    with app.app_context():
+        db.create_all()
+        yield app
+        violations = list(query_auditor.violations)
+        # Write buffered skill views while the tables still exist
+        view_counter.close()
+        db.session.remove()
+        db.drop_all()
+    if violations:
+        pytest.fail(f'Query budgets exceeded: {violations}')
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def register(client):
+    """Register a user and return their access token."""
+    def register(name='Alice Example', email='alice@example.com', password='secret123'):
+        response = client.post('/api/auth/register', json={
+            'name': name, 'email': email, 'password': password
+        })
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()['access_token']
+    return register
+
+
+@pytest.fixture
+def login_admin(client, register):
+    """Register an admin and return their Authorization headers."""
+    def login_admin(email='admin@example.com', password='secret123'):
+        register(name='Admin', email=email, password=password)
+        User.query.filter_by(email=email).update({'role': 'admin'})
+        db.session.commit()
+        response = client.post('/api/auth/login', json={'email': email, 'password': password})
+        return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+    return login_admin
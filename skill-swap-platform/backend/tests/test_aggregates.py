@@ -0,0 +1,132 @@
+"""Read models updated through objects loaded in an earlier transaction.
+
+Every commit expires the session's objects, so these tests commit before
+changing anything: the listeners must still see the values being replaced.
+"""
+import pytest
+
+from aggregates import (
+    diff_platform_counters, rebuild_rating_aggregates, rebuild_tag_usage, rebuild_user_stats,
+    repair_platform_counters, sync_skill_tags
+)
+from extensions import db
+from models import Request, Review, Skill, Tag, User, UserStats
+
+RATING_COLUMNS = ('rating_sum', 'rating_count', 'rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5')
+
+
+@pytest.fixture
+def people(app):
+    """Alice and Carol each own a skill; Bob reviews. Returns their ids and the skill ids."""
+    users = []
+    for name in ('Alice', 'Bob', 'Carol'):
+        user = User(name=name, email=f'{name.lower()}@example.com')
+        user.set_password('secret123')
+        users.append(user)
+    db.session.add_all(users)
+    db.session.flush()
+    skills = [
+        Skill(name='Guitar', description='Chords and songs', category='music', tags='music, strings', owner_id=users[0].id),
+        Skill(name='Piano', description='Scales and songs', category='music', tags='music', owner_id=users[2].id),
+    ]
+    db.session.add_all(skills)
+    db.session.commit()
+    return [user.id for user in users], [skill.id for skill in skills]
+
+
+def ratings():
+    return [
+        db.session.query(model.id, *[getattr(model, column) for column in RATING_COLUMNS]).order_by(model.id).all()
+        for model in (User, Skill)
+    ]
+
+
+def assert_ratings_rebuild_the_same():
+    stored = ratings()
+    rebuild_rating_aggregates()
+    assert ratings() == stored
+    db.session.rollback()
+
+
+def test_review_update_retarget_and_delete_after_commit(people):
+    (alice, bob, carol), (guitar, piano) = people
+    review = Review(skill_id=guitar, reviewer_id=bob, reviewee_id=alice, rating=4)
+    db.session.add(review)
+    db.session.commit()
+
+    review.rating = 2
+    db.session.commit()
+    assert (db.session.get(User, alice).rating_sum, db.session.get(User, alice).rating_2) == (2, 1)
+    assert_ratings_rebuild_the_same()
+
+    review.skill_id, review.reviewee_id = piano, carol
+    db.session.commit()
+    assert db.session.get(Skill, guitar).rating_count == 0
+    assert db.session.get(Skill, piano).rating_count == 1
+    assert_ratings_rebuild_the_same()
+
+    db.session.delete(review)
+    db.session.commit()
+    assert all(row[1:] == (0,) * len(RATING_COLUMNS) for rows in ratings() for row in rows)
+
+
+def user_stats():
+    return db.session.query(
+        UserStats.user_id, UserStats.skills_offered, UserStats.requests_received,
+        UserStats.requests_sent, UserStats.completed_sessions
+    ).order_by(UserStats.user_id).all()
+
+
+def test_user_stats_follow_changes_after_commit(people):
+    (alice, bob, carol), (guitar, piano) = people
+    request = Request(skill_id=guitar, requester_id=bob)
+    db.session.add(request)
+    db.session.commit()
+
+    request.status = 'completed'
+    db.session.commit()
+    skill = db.session.get(Skill, piano)
+    db.session.commit()
+    skill.is_active = False
+    db.session.commit()
+    request.skill_id = piano
+    db.session.commit()
+
+    stored = user_stats()
+    assert stored[1][3:] == (1, 1)  # Bob: one request sent, completed
+    assert stored[2][1] == 0  # Carol's only skill is inactive
+    rebuild_user_stats()
+    assert user_stats() == stored
+
+
+def test_platform_counters_follow_changes_after_commit(people):
+    (alice, bob, carol), (guitar, piano) = people
+    request = Request(skill_id=guitar, requester_id=bob)
+    db.session.add(request)
+    db.session.commit()
+    repair_platform_counters()
+    guitar, piano, carol = db.session.get(Skill, guitar), db.session.get(Skill, piano), db.session.get(User, carol)
+    db.session.commit()
+
+    guitar.category = 'lessons'
+    piano.is_active = False
+    carol.is_active = False
+    request.status = 'accepted'
+    db.session.commit()
+
+    assert diff_platform_counters() == {}
+
+
+def test_tag_usage_follows_deactivation_after_commit(people):
+    _, (guitar, piano) = people
+    skills = [db.session.get(Skill, skill_id) for skill_id in (guitar, piano)]
+    for skill in skills:
+        sync_skill_tags(skill)
+    db.session.commit()
+
+    skills[0].is_active = False
+    db.session.commit()
+    usage = dict(db.session.query(Tag.name, Tag.usage_count).all())
+    assert usage == {'music': 1, 'strings': 0}
+    rebuild_tag_usage()
+    assert dict(db.session.query(Tag.name, Tag.usage_count).all()) == usage
@@ -0,0 +1,74 @@
+import gc
+import weakref
+
+import config
+import search as skill_search
+from app import create_app
+from extensions import db, search_index_state, view_counter
+from models import User
+
+
+def test_apps_have_isolated_databases(app, register):
+    register()
+    other = create_app(config.TESTING)
+    with other.app_context():
+        db.create_all()
+        assert db.session.query(User).count() == 0
+    assert db.session.query(User).count() == 1
+
+
+def test_services_are_per_app(app):
+    other = create_app(config.TESTING)
+    with other.app_context():
+        other_counter = view_counter._get_current_object()
+    assert view_counter._get_current_object() is not other_counter
+
+
+def test_discarded_app_services_are_collected(app):
+    other = create_app(config.TESTING)
+    with other.app_context():
+        counter = weakref.ref(view_counter._get_current_object())
+    del other
+    gc.collect()
+    assert counter() is None
+
+
+def test_search_index_state_is_per_app(app):
+    assert skill_search.is_available(db.session)
+    other = create_app(config.TESTING)
+    with other.app_context():
+        # Same 'sqlite://' URL, but this app's database has no tables yet
+        assert not search_index_state
+        assert not skill_search.is_available(db.session)
+    assert skill_search.is_available(db.session)
+
+
+def test_config_overrides_environment(app):
+    assert app.config['TESTING']
+    assert app.config['SQLALCHEMY_DATABASE_URI'] == 'sqlite://'
+    assert app.config['BCRYPT_LOG_ROUNDS'] == 4
+
+
+def test_health(client):
+    response = client.get('/api/health')
+    assert response.status_code == 200
+    assert response.get_json()['status'] == 'healthy'
+
+
+def test_register_login_and_profile(client, register):
+    register()
+    response = client.post('/api/auth/login', json={
+        'email': 'alice@example.com', 'password': 'secret123'
+    })
+    assert response.status_code == 200
+    token = response.get_json()['access_token']
+
+    response = client.get('/api/profile', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 200
+    assert response.get_json()['email'] == 'alice@example.com'
+
+
+def test_unknown_route_uses_api_error_handler(client):
+    response = client.get('/api/nope')
+    assert response.status_code == 404
+    assert response.get_json() == {'error': 'Resource not found'}
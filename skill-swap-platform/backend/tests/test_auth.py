@@ -0,0 +1,58 @@
+from flask_jwt_extended import create_access_token, decode_token
+
+from extensions import db, principal_cache
+from models import User
+
+
+def bearer(token):
+    return {'Authorization': f'Bearer {token}'}
+
+
+def test_token_carries_role_status_and_version(app, register):
+    claims = decode_token(register())
+    assert (claims['role'], claims['active'], claims['ver']) == ('user', True, 0)
+
+
+def test_admin_routes_trust_the_role_claim(client, register, login_admin):
+    assert client.get('/api/admin/users', headers=bearer(register())).status_code == 403
+    assert client.get('/api/admin/users', headers=login_admin()).status_code == 200
+
+
+def test_revoked_tokens_are_rejected(client, register, login_admin):
+    token = register()
+    user_id = decode_token(token)['sub']
+    admin = login_admin()
+    assert client.get('/api/profile', headers=bearer(token)).status_code == 200
+
+    assert client.post(f'/api/admin/users/{user_id}/revoke-tokens', headers=admin).status_code == 200
+    response = client.get('/api/profile', headers=bearer(token))
+    assert response.status_code == 401
+    assert response.get_json() == {'error': 'Token has been revoked'}
+
+    response = client.post('/api/auth/login', json={'email': 'alice@example.com', 'password': 'secret123'})
+    assert decode_token(response.get_json()['access_token'])['ver'] == 1
+    assert client.get('/api/profile', headers=bearer(response.get_json()['access_token'])).status_code == 200
+
+
+def test_demoted_admin_loses_access(client, login_admin):
+    admin = login_admin()
+    assert client.get('/api/admin/users', headers=admin).status_code == 200
+
+    user = User.query.filter_by(email='admin@example.com').one()
+    user.role = 'user'
+    db.session.commit()
+    principal_cache.delete(user.id)
+    assert client.get('/api/admin/users', headers=admin).status_code == 401
+
+
+def test_tokens_without_claims_stay_valid_until_revoked(client, register, login_admin):
+    user_id = decode_token(register())['sub']
+    admin = login_admin()
+    # Issued before tokens carried role, active and ver
+    token = create_access_token(identity=user_id)
+    admin_token = create_access_token(identity=decode_token(admin['Authorization'].split()[1])['sub'])
+    assert client.get('/api/profile', headers=bearer(token)).status_code == 200
+    assert client.get('/api/admin/users', headers=bearer(admin_token)).status_code == 403
+
+    assert client.post(f'/api/admin/users/{user_id}/revoke-tokens', headers=admin).status_code == 200
+    assert client.get('/api/profile', headers=bearer(token)).status_code == 401
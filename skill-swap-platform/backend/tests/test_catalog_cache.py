@@ -0,0 +1,44 @@
+import pytest
+
+
+@pytest.fixture
+def skill(client, register):
+    owner = {'Authorization': f'Bearer {register()}'}
+    response = client.post('/api/skills', headers=owner, json={
+        'name': 'Guitar', 'description': 'Chords, scales and songs', 'category': 'music', 'tags': 'music, strings'
+    })
+    assert response.status_code == 201
+    return response.get_json()['skill']
+
+
+def requester_headers(register):
+    return {'Authorization': f'Bearer {register(name="Bob Example", email="bob@example.com")}'}
+
+
+def test_write_changes_both_body_and_etag(client, register, skill):
+    first = client.get('/api/skills')
+    assert first.headers['X-Cache'] == 'MISS'
+    assert client.get('/api/skills').headers['X-Cache'] == 'HIT'
+
+    # A request bumps the catalog watermark without invalidating the 'skills' namespace
+    response = client.post('/api/requests', headers=requester_headers(register), json={'skillId': skill['id']})
+    assert response.status_code == 201
+
+    second = client.get('/api/skills')
+    assert second.headers['ETag'] != first.headers['ETag']
+    assert second.get_json()['skills'][0]['requests_count'] == 1
+
+    assert client.get('/api/skills', headers={'If-None-Match': second.headers['ETag']}).status_code == 304
+    stale = client.get('/api/skills', headers={'If-None-Match': first.headers['ETag']})
+    assert stale.status_code == 200
+    assert stale.get_json()['skills'][0]['requests_count'] == 1
+
+
+def test_search_body_follows_its_etag(client, register, skill):
+    first = client.get('/api/skills/search?search=guitar')
+    assert first.get_json()['skills'][0]['requests_count'] == 0
+
+    client.post('/api/requests', headers=requester_headers(register), json={'skillId': skill['id']})
+    second = client.get('/api/skills/search?search=guitar')
+    assert second.headers['ETag'] != first.headers['ETag']
+    assert second.get_json()['skills'][0]['requests_count'] == 1
@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+
+
+def test_profile_revalidates_until_it_changes(client, register):
+    alice = {'Authorization': f'Bearer {register()}'}
+    first = client.get('/api/profile', headers=alice)
+    etag = first.headers['ETag']
+    assert etag.startswith('W/')
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+
+    revalidated = client.get('/api/profile', headers=dict(alice, **{'If-None-Match': etag}))
+    assert revalidated.status_code == 304
+    assert revalidated.get_data() == b''
+    assert revalidated.headers['ETag'] == etag
+
+    # Counters on the profile change without touching the user row
+    client.post('/api/skills', headers=alice, json={'name': 'Guitar', 'description': 'Chords, scales and songs'})
+    changed = client.get('/api/profile', headers=dict(alice, **{'If-None-Match': etag}))
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+
+    etag = changed.headers['ETag']
+    client.put('/api/profile', headers=alice, json={'bio': 'Plays in a band'})
+    changed = client.get('/api/profile', headers=dict(alice, **{'If-None-Match': etag}))
+    assert changed.status_code == 200
+    assert changed.get_json()['bio'] == 'Plays in a band'
+
+
+def test_catalog_answers_if_modified_since(client, register):
+    alice = {'Authorization': f'Bearer {register()}'}
+    client.post('/api/skills', headers=alice, json={'name': 'Guitar', 'description': 'Chords, scales and songs'})
+    response = client.get('/api/categories')
+    assert response.headers['Cache-Control'] == 'no-cache'
+    last_modified = response.headers['Last-Modified']
+
+    assert client.get('/api/categories', headers={'If-Modified-Since': last_modified}).status_code == 304
+    earlier = (datetime.utcnow() - timedelta(days=1)).strftime('%a, %d %b %Y %H:%M:%S GMT')
+    assert client.get('/api/categories', headers={'If-Modified-Since': earlier}).status_code == 200
@@ -0,0 +1,71 @@
+import pytest
+from flask import g
+from sqlalchemy import text
+
+import config
+from app import create_app
+from database import all_engines, get_read_engine
+from extensions import db
+from models import User
+
+
+@pytest.fixture
+def file_app(tmp_path):
+    app = create_app(dict(config.TESTING, SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'test.db'}"))
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        for engine in all_engines(db):
+            engine.dispose()
+
+
+def pragma(engine, name):
+    with engine.connect() as connection:
+        return connection.execute(text(f'PRAGMA {name}')).scalar()
+
+
+def test_sqlite_file_pragmas(file_app):
+    engine = db.engines[None]
+    assert pragma(engine, 'journal_mode') == 'wal'
+    assert pragma(engine, 'synchronous') == 1  # NORMAL
+    assert pragma(engine, 'busy_timeout') == 5000
+    assert pragma(engine, 'cache_size') == -64 * 1024
+    assert pragma(engine, 'query_only') == 0
+    assert pragma(get_read_engine(), 'query_only') == 1
+
+
+def test_pool_sizing(file_app):
+    assert db.engines[None].pool.size() == file_app.config['DB_POOL_SIZE']
+    assert get_read_engine().pool.size() == file_app.config['DB_READ_POOL_SIZE']
+
+
+def test_read_only_views_query_the_read_pool(file_app):
+    session = db.session()
+    assert session.get_bind() is db.engines[None]
+    g.db_read_only = True
+    assert session.get_bind() is get_read_engine()
+    # DML and flushes stay on the primary
+    assert session.get_bind(clause=User.__table__.update()) is db.engines[None]
+    db.session.add(User(name='Reader', email='reader@example.com', password_hash='x'))
+    db.session.commit()
+    assert db.session.query(User).count() == 1
+
+
+def test_read_only_routes(file_app):
+    client = file_app.test_client()
+    response = client.post('/api/auth/register', json={
+        'name': 'Alice Example', 'email': 'alice@example.com', 'password': 'secret123'
+    })
+    token = response.get_json()['access_token']
+    response = client.post('/api/skills', headers={'Authorization': f'Bearer {token}'}, json={
+        'name': 'Sourdough', 'description': 'Bread from a starter', 'category': 'cooking'
+    })
+    assert response.status_code == 201, response.get_json()
+    response = client.get('/api/skills')
+    assert [skill['name'] for skill in response.get_json()['skills']] == ['Sourdough']
+
+
+def test_in_memory_database_has_no_read_engine(app):
+    assert get_read_engine() is None
+    assert 'pool_size' not in app.config['SQLALCHEMY_ENGINE_OPTIONS']
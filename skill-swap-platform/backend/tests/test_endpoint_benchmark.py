@@ -0,0 +1,53 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from endpoint_benchmark import (  # noqa: E402
+    SCENARIOS, build_scenarios, compare, count_queries, percentile, pick_targets
+)
+from extensions import db  # noqa: E402
+from synthetic import ADMIN_EMAIL, ADMIN_PASSWORD, SYNTHETIC_PASSWORD, Volumes, generate  # noqa: E402
+
+
+def login(client, email, password):
+    response = client.post('/api/auth/login', json={'email': email, 'password': password})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['access_token']
+
+
+def test_every_scenario_succeeds(app, client):
+    generate(Volumes(users=40, skills=150, requests=500, reviews=80), seed=3, log=lambda message: None)
+    skill_ids, emails = pick_targets(db, seed=3, user_count=2, skill_count=5)
+    scenarios = build_scenarios(
+        skill_ids,
+        [login(client, email, SYNTHETIC_PASSWORD) for email in emails],
+        login(client, ADMIN_EMAIL, ADMIN_PASSWORD)
+    )
+
+    # count_queries raises on any non-200 response
+    queries = {name: count_queries(app, db, requests) for name, requests in scenarios.items()}
+    assert set(queries) == set(SCENARIOS)
+    assert all(count > 0 for count in queries.values()), queries
+
+
+def test_compare_flags_regressions():
+    baseline = {'browse': {'rps': 100, 'p95_ms': 10, 'queries': 3, 'requests': 500}}
+    steady = {'browse': {'rps': 95, 'p95_ms': 11, 'queries': 3, 'requests': 475, 'errors': 0}}
+    assert compare(steady, baseline, tolerance=0.25) == []
+
+    worse = {'browse': {'rps': 60, 'p95_ms': 20, 'queries': 4, 'requests': 300, 'errors': 2}}
+    problems = compare(worse, baseline, tolerance=0.25)
+    assert len(problems) == 4
+    assert 'browse: 3 -> 4 queries per request' in problems
+
+    # Too few samples to judge latency, but query counts still count
+    sparse = {'browse': dict(worse['browse'], requests=5, errors=0)}
+    assert compare(sparse, baseline, tolerance=0.25) == ['browse: 3 -> 4 queries per request']
+
+
+def test_percentile_uses_nearest_rank():
+    latencies = list(range(1, 101))
+    assert percentile(latencies, 0.50) == 50
+    assert percentile(latencies, 0.99) == 99
+    assert percentile([], 0.95) == 0
@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from aggregates import (
+    diff_platform_counters, rebuild_rating_aggregates, rebuild_tag_usage, rebuild_user_stats,
+    repair_platform_counters
+)
+from extensions import db
+from jobs import HANDLERS, Worker, claim_job, enqueue
+from models import Job, Request, Review, Skill, Tag, User, UserStats
+from synthetic import Volumes, generate
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    """Register ``f`` as the handler for 'test' jobs and count its calls."""
+    calls = []
+
+    def register(f):
+        def counted(payload, heartbeat):
+            calls.append(payload)
+            return f(payload, heartbeat)
+        monkeypatch.setitem(HANDLERS, 'test', counted)
+        return calls
+    return register
+
+
+def run_jobs(app):
+    Worker(app, worker_id='test-worker').run(burst=True)
+    db.session.expire_all()
+
+
+def test_worker_runs_queued_jobs(app, handler):
+    calls = handler(lambda payload, heartbeat: {'doubled': payload['n'] * 2})
+    job = enqueue('test', {'n': 21})
+    db.session.commit()
+
+    run_jobs(app)
+    job = db.session.get(Job, job.id)
+    assert calls == [{'n': 21}]
+    assert job.status == 'succeeded' and job.attempts == 1
+    assert job.to_dict()['result'] == {'doubled': 42}
+
+
+def test_same_key_reuses_the_unfinished_job(app, handler):
+    handler(lambda payload, heartbeat: None)
+    first = enqueue('test', key='k')
+    assert enqueue('test', key='k').id == first.id
+    db.session.commit()
+
+    run_jobs(app)
+    assert enqueue('test', key='k').id != first.id
+
+
+def test_failing_job_is_retried_then_failed(app, handler):
+    app.config.update(JOB_MAX_ATTEMPTS=3, JOB_RETRY_BACKOFF=0)
+
+    def fail(payload, heartbeat):
+        raise ValueError('boom')
+    calls = handler(fail)
+    job = enqueue('test')
+    db.session.commit()
+
+    run_jobs(app)
+    job = db.session.get(Job, job.id)
+    assert len(calls) == 3
+    assert job.status == 'failed' and job.attempts == 3 and job.error == 'boom'
+
+
+def test_expired_lease_is_claimed_again(app, handler):
+    calls = handler(lambda payload, heartbeat: None)
+    job_id = enqueue('test').id
+    db.session.commit()
+
+    # A worker that died mid-job
+    assert claim_job('dead-worker', visibility_timeout=60).id == job_id
+    assert claim_job('other-worker', visibility_timeout=60) is None
+    Job.query.filter_by(id=job_id).update({'locked_until': datetime.utcnow() - timedelta(seconds=1)})
+    db.session.commit()
+
+    run_jobs(app)
+    job = db.session.get(Job, job_id)
+    assert len(calls) == 1
+    assert job.status == 'succeeded' and job.attempts == 2
+
+
+def read_models():
+    """Every stored aggregate: user stats (without version), ratings and tag usage."""
+    stats = db.session.query(
+        UserStats.user_id, UserStats.skills_offered, UserStats.requests_received,
+        UserStats.requests_sent, UserStats.completed_sessions
+    ).order_by(UserStats.user_id).all()
+    ratings = [
+        db.session.query(model.id, model.rating_sum, model.rating_count).order_by(model.id).all()
+        for model in (User, Skill)
+    ]
+    tags = db.session.query(Tag.id, Tag.usage_count).order_by(Tag.id).all()
+    return stats, ratings, tags
+
+
+def test_delete_user_runs_as_a_job(app, client, login_admin):
+    generate(Volumes(users=12, skills=60, requests=150, reviews=40), seed=3, log=lambda message: None)
+    repair_platform_counters()
+    db.session.commit()
+    headers = login_admin()
+    victim = db.session.query(Skill.owner_id).group_by(Skill.owner_id).order_by(
+        db.func.count().desc()
+    ).limit(1).scalar()
+    app.config['JOB_BATCH_SIZE'] = 2
+
+    response = client.delete(f'/api/admin/users/{victim}', headers=headers)
+    assert response.status_code == 202
+    body = response.get_json()
+    assert body['job']['status'] == 'queued'
+    assert response.headers['Location'] == body['status_url']
+    assert db.session.get(User, victim).is_active is False
+
+    run_jobs(app)
+    job = client.get(body['status_url'], headers=headers).get_json()
+    assert job['status'] == 'succeeded', job
+    assert job['result']['users'] == 1 and job['result']['skills'] > 2
+
+    assert db.session.get(User, victim) is None
+    assert Skill.query.filter_by(owner_id=victim).count() == 0
+    assert Request.query.filter_by(requester_id=victim).count() == 0
+    assert Review.query.filter(db.or_(Review.reviewer_id == victim, Review.reviewee_id == victim)).count() == 0
+    assert diff_platform_counters() == {}
+
+    stored = read_models()
+    rebuild_user_stats()
+    rebuild_rating_aggregates()
+    rebuild_tag_usage()
+    assert read_models() == stored
+
+
+def test_rebuild_endpoint(app, client, login_admin):
+    headers = login_admin()
+    assert client.post('/api/admin/rebuilds', headers=headers, json={'target': 'nope'}).status_code == 400
+
+    response = client.post('/api/admin/rebuilds', headers=headers, json={'target': 'counters'})
+    assert response.status_code == 202
+    run_jobs(app)
+    job = client.get(response.get_json()['status_url'], headers=headers).get_json()
+    assert job['status'] == 'succeeded' and job['result'] == {'target': 'counters'}
+    assert diff_platform_counters() == {}
+    assert client.get('/api/admin/jobs/999', headers=headers).status_code == 404
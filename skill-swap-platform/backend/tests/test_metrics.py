@@ -0,0 +1,79 @@
+import config
+from app import create_app
+from extensions import db, metrics_registry
+from models import Skill, User
+
+
+def add_skills(count):
+    owner = User(name='Owner', email='owner@example.com')
+    owner.set_password('secret123')
+    db.session.add(owner)
+    db.session.flush()
+    db.session.add_all([
+        Skill(name=f'Skill {i}', description='d', category='programming', level='beginner', owner_id=owner.id)
+        for i in range(count)
+    ])
+    db.session.commit()
+
+
+def admin_token(client, register):
+    register(name='Admin', email='admin@example.com')
+    User.query.filter_by(email='admin@example.com').update({'role': 'admin'})
+    db.session.commit()
+    response = client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'secret123'})
+    return response.get_json()['access_token']
+
+
+def test_requests_are_recorded_per_route(app, client, register):
+    add_skills(3)
+    skill_id = Skill.query.first().id
+    client.get(f'/api/skills/{skill_id}')
+    client.get(f'/api/skills/{skill_id}')
+    client.get('/api/does-not-exist')
+    token = admin_token(client, register)
+    streamed = client.get('/api/admin/skills', headers={'Authorization': f'Bearer {token}'}).data
+
+    snapshot = metrics_registry.snapshot()
+    assert snapshot['requests'][('GET', '/api/skills/<int:id>', 200)] == 2
+    assert snapshot['requests'][('GET', '<unmatched>', 404)] == 1
+
+    detail = snapshot['routes'][('GET', '/api/skills/<int:id>')]
+    assert detail['queries'][1] == 2 and detail['queries'][0] >= 2
+    assert detail['db_time'][0] > 0 and detail['duration'][0] > 0
+
+    # Streamed bodies are measured once the last chunk has been produced
+    stream = snapshot['routes'][('GET', '/api/admin/skills')]
+    assert stream['size'] == (len(streamed), 1)
+    assert stream['queries'][0] >= 1
+
+
+def test_metrics_endpoint_serves_exposition_text(app, client, register):
+    client.get('/api/health')
+    assert client.get('/api/admin/metrics').status_code == 401
+    user_token = register()
+    assert client.get('/api/admin/metrics', headers={'Authorization': f'Bearer {user_token}'}).status_code == 403
+
+    response = client.get('/api/admin/metrics', headers={'Authorization': f'Bearer {admin_token(client, register)}'})
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    text = response.get_data(as_text=True)
+    assert '# TYPE skillswap_http_request_duration_seconds histogram' in text
+    assert 'skillswap_http_requests_total{method="GET",route="/api/health",status="200"' in text
+    assert 'skillswap_http_request_queries_bucket{method="GET",route="/api/health",' in text
+    assert 'skillswap_view_counts_flush_lag_seconds{' in text
+    assert 'skillswap_jobs_oldest_queued_seconds{' in text
+
+
+def test_scrape_token():
+    app = create_app(dict(config.TESTING, METRICS_TOKEN='scrape-secret'))
+    client = app.test_client()
+    assert client.get('/api/admin/metrics', headers={'Authorization': 'Bearer scrape-secret'}).status_code == 200
+    assert client.get('/api/admin/metrics', headers={'Authorization': 'Bearer wrong'}).status_code != 200
+
+
+def test_metrics_can_be_disabled():
+    app = create_app(dict(config.TESTING, METRICS_ENABLED=False))
+    with app.app_context():
+        db.create_all()
+        app.test_client().get('/api/health')
+        assert metrics_registry.snapshot()['requests'] == {}
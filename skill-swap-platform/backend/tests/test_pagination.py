@@ -0,0 +1,67 @@
+from datetime import datetime
+
+import pytest
+
+from extensions import db
+from models import Skill, User
+from pagination import InvalidCursor, decode_cursor, encode_cursor
+
+CREATED_AT = datetime(2026, 1, 1, 12, 0, 0, 500)
+
+
+@pytest.fixture
+def skill_ids(app):
+    """Seven skills, five of them created at the same instant; newest first."""
+    owner = User(name='Owner', email='owner@example.com')
+    owner.set_password('secret123')
+    db.session.add(owner)
+    db.session.flush()
+    for i in range(7):
+        created_at = CREATED_AT.replace(hour=12 + max(i - 4, 0))
+        db.session.add(Skill(name=f'Skill {i}', description='A skill to page through', owner_id=owner.id,
+                             created_at=created_at))
+    db.session.commit()
+    rows = db.session.query(Skill.id).order_by(Skill.created_at.desc(), Skill.id.desc()).all()
+    return [row.id for row in rows]
+
+
+def walk(client, path, per_page, between_pages=None):
+    ids, cursor = [], ''
+    while cursor is not None:
+        response = client.get(path, query_string={'cursor': cursor, 'per_page': per_page})
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        assert 'total' not in body
+        ids += [skill['id'] for skill in body['skills']]
+        cursor = body['next_cursor']
+        if between_pages:
+            between_pages()
+    return ids
+
+
+def test_cursor_round_trips():
+    cursor = encode_cursor(CREATED_AT, 42)
+    assert decode_cursor(cursor) == (CREATED_AT, 42)
+    with pytest.raises(InvalidCursor):
+        decode_cursor('not-a-cursor')
+
+
+def test_cursor_pages_visit_every_skill_once(client, skill_ids):
+    assert walk(client, '/api/skills', per_page=2) == skill_ids
+    assert walk(client, '/api/skills', per_page=7) == skill_ids
+
+
+def test_cursor_pages_ignore_rows_added_while_walking(client, skill_ids):
+    owner_id = db.session.query(User.id).scalar()
+
+    def add_newer_skill():
+        db.session.add(Skill(name='Newer', description='Added between two pages', owner_id=owner_id))
+        db.session.commit()
+
+    assert walk(client, '/api/skills', per_page=3, between_pages=add_newer_skill) == skill_ids
+
+
+def test_include_total_and_invalid_cursor(client, skill_ids):
+    body = client.get('/api/skills?cursor=&per_page=2&include_total=true').get_json()
+    assert body['total'] == len(skill_ids)
+    assert client.get('/api/skills?cursor=garbage').status_code == 400
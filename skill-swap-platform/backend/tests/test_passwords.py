@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+
+from extensions import db, password_executor
+from models import User
+from passwords import BoundedExecutor, PasswordHasherBusy, bcrypt_cost
+
+
+def test_full_pool_rejects_instead_of_queueing():
+    executor = BoundedExecutor(max_workers=1, max_queue=0)
+    started, release = threading.Event(), threading.Event()
+
+    def hash_slowly():
+        started.set()
+        release.wait()
+    waiter = threading.Thread(target=executor.run, args=(hash_slowly,))
+    waiter.start()
+    started.wait()
+
+    with pytest.raises(PasswordHasherBusy):
+        executor.run(lambda: 'hashed')
+    assert executor.rejected == 1
+
+    release.set()
+    waiter.join()
+
+
+def test_slow_job_times_out():
+    executor = BoundedExecutor(max_workers=1, timeout=0.01)
+    release = threading.Event()
+    with pytest.raises(PasswordHasherBusy):
+        executor.run(release.wait)
+    release.set()
+
+
+def test_bcrypt_cost():
+    assert bcrypt_cost('$2b$12$' + 'x' * 53) == 12
+    assert bcrypt_cost('not a hash') is None
+    assert bcrypt_cost(None) is None
+
+
+def test_busy_hasher_returns_503(client, register, monkeypatch):
+    register()
+
+    def busy(*args):
+        raise PasswordHasherBusy('Password hashing capacity exhausted')
+    monkeypatch.setattr(password_executor._get_current_object(), 'run', busy)
+
+    response = client.post('/api/auth/login', json={'email': 'alice@example.com', 'password': 'secret123'})
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+
+
+def test_login_upgrades_the_work_factor(app, client, register):
+    register()
+    app.config['BCRYPT_LOG_ROUNDS'] = 5
+    response = client.post('/api/auth/login', json={'email': 'alice@example.com', 'password': 'secret123'})
+    assert response.status_code == 200
+    assert bcrypt_cost(db.session.query(User.password_hash).scalar()) == 5
@@ -0,0 +1,130 @@
+import logging
+
+from flask import jsonify
+
+import config
+from app import create_app
+from database import all_engines
+from extensions import db, metrics_registry, query_auditor
+from models import Request, Review, Skill, User
+from query_audit import normalize, query_budget, repeated_queries_expected
+
+
+def add_users(count):
+    for i in range(count):
+        user = User(name=f'User {i}', email=f'user{i}@example.com')
+        user.set_password('secret123')
+        db.session.add(user)
+    db.session.commit()
+
+
+def n_plus_one_app(**overrides):
+    """A test app with views that load every user's skills one query at a time."""
+    app = create_app(dict(config.TESTING, **overrides))
+
+    def owned_skills():
+        return jsonify({user.id: len(Skill.query.filter_by(owner_id=user.id).all()) for user in User.query.all()})
+
+    app.add_url_rule('/test/budgeted', 'budgeted', query_budget(2)(lambda: owned_skills()))
+    app.add_url_rule('/test/unbudgeted', 'unbudgeted', owned_skills)
+    app.add_url_rule('/test/batched', 'batched', repeated_queries_expected(lambda: owned_skills()))
+    return app
+
+
+def test_normalize_collapses_values():
+    first = normalize('SELECT * FROM skills\n WHERE id IN (?, ?, ?) LIMIT 20')
+    second = normalize('SELECT * FROM skills WHERE id IN (?) LIMIT 50')
+    assert first == second == 'SELECT * FROM skills WHERE id IN (?) LIMIT N'
+
+
+def test_over_budget_and_repeats_are_recorded(caplog):
+    app = n_plus_one_app()
+    with app.app_context():
+        db.create_all()
+        add_users(6)
+        client = app.test_client()
+
+        with caplog.at_level(logging.WARNING, logger='query_audit'):
+            assert client.get('/test/budgeted').status_code == 200
+        assert list(query_auditor.violations) == [('GET /test/budgeted', 7, 2)]
+        assert query_auditor.repeats[0][:2] == ('GET /test/budgeted', 6)
+        assert 'Query budget exceeded on GET /test/budgeted' in caplog.text
+        assert 'Possible N+1 on GET /test/budgeted: 6 x SELECT' in caplog.text
+
+        query_auditor.clear()
+        client.get('/test/unbudgeted')
+        assert not query_auditor.violations and len(query_auditor.repeats) == 1
+
+        query_auditor.clear()
+        client.get('/test/batched')
+        assert not query_auditor.violations and not query_auditor.repeats
+
+
+def test_audit_shares_the_metrics_statement_count():
+    app = n_plus_one_app(SLOW_QUERY_MS=1000)
+    with app.app_context():
+        db.create_all()
+        add_users(6)
+        app.test_client().get('/test/budgeted')
+        assert list(query_auditor.violations) == [('GET /test/budgeted', 7, 2)]
+        queries, count = metrics_registry.snapshot()['routes'][('GET', '/test/budgeted')]['queries']
+        assert (queries, count) == (7, 1)
+        for engine in all_engines(db):
+            assert len(engine.dispatch.after_cursor_execute) == 1
+
+
+def test_audit_is_off_by_default():
+    app = n_plus_one_app(QUERY_AUDIT=False)
+    with app.app_context():
+        db.create_all()
+        add_users(6)
+        app.test_client().get('/test/budgeted')
+        assert not query_auditor.violations and not query_auditor.repeats
+
+
+def test_slow_queries_are_logged_with_their_plan(caplog):
+    app = n_plus_one_app(QUERY_AUDIT=False, SLOW_QUERY_MS=0.0001)
+    with app.app_context():
+        db.create_all()
+        add_users(1)
+        with caplog.at_level(logging.WARNING, logger='query_audit'):
+            app.test_client().get('/test/budgeted')
+
+    slow = [record.getMessage() for record in caplog.records if record.getMessage().startswith('Slow query')]
+    assert any('GET /test/budgeted' in message and 'SCAN user' in message for message in slow), slow
+
+
+def test_routes_stay_within_budget(app, client, register):
+    # The app fixture fails the test on any budget violation
+    token = register()
+    headers = {'Authorization': f'Bearer {token}'}
+    for path in ('/api/profile', '/api/skills', '/api/skills/my-skills', '/api/requests/received',
+                 '/api/requests/sent', '/api/stats/dashboard', '/api/categories', '/api/tags', '/api/health'):
+        assert client.get(path, headers=headers).status_code == 200, path
+
+
+def route_statements(client, path, route):
+    """Statements one GET of ``path`` ran, from the metrics recorded for ``route``."""
+    before = metrics_registry.snapshot()['routes'].get(('GET', route), {}).get('queries', (0, 0))[0]
+    assert client.get(path).status_code == 200, path
+    return metrics_registry.snapshot()['routes'][('GET', route)]['queries'][0] - before
+
+
+def test_skill_listing_statements_do_not_grow_with_the_page(app, client):
+    add_users(5)
+    users = [user.id for user in User.query.order_by(User.id)]
+    # More skills than the larger page, so both pages are full and both run the count query
+    for i in range(60):
+        owner, learner = users[i % 5], users[(i + 1) % 5]
+        skill = Skill(name=f'Skill {i}', description='Lessons for beginners', tags='music, strings', owner_id=owner)
+        db.session.add(skill)
+        db.session.flush()
+        db.session.add(Request(skill_id=skill.id, requester_id=learner, status='completed'))
+        db.session.add(Review(skill_id=skill.id, reviewer_id=learner, reviewee_id=owner, rating=i % 5 + 1))
+    db.session.commit()
+
+    # The first request also checks once whether the search index exists
+    route_statements(client, '/api/skills?per_page=1', '/api/skills')
+    small = route_statements(client, '/api/skills?per_page=5', '/api/skills')
+    large = route_statements(client, '/api/skills?per_page=50', '/api/skills')
+    assert small == large
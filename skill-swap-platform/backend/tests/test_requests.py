@@ -0,0 +1,81 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from serializers import FastJSONProvider, build_field_tree, project
+
+
+@pytest.fixture
+def inbox(client, register):
+    """Alice owns two skills; Bob and Carol request both. Returns Alice's headers."""
+    alice = {'Authorization': f'Bearer {register()}'}
+    skill_ids = []
+    for name in ('Guitar', 'Piano'):
+        response = client.post('/api/skills', headers=alice, json={'name': name, 'description': 'Lessons for beginners'})
+        skill_ids.append(response.get_json()['skill']['id'])
+    for name in ('Bob', 'Carol'):
+        headers = {'Authorization': f'Bearer {register(name=f"{name} Example", email=f"{name.lower()}@example.com")}'}
+        for skill_id in skill_ids:
+            assert client.post('/api/requests', headers=headers, json={'skillId': skill_id}).status_code == 201
+    return alice
+
+
+def test_received_inbox_pages_by_cursor(client, inbox):
+    everything = client.get('/api/requests/received', headers=inbox).get_json()
+    assert len(everything) == 4
+
+    ids, cursor = [], ''
+    while cursor is not None:
+        body = client.get(f'/api/requests/received?cursor={cursor}&per_page=3', headers=inbox).get_json()
+        ids += [item['id'] for item in body['requests']]
+        cursor = body['next_cursor']
+    assert ids == [item['id'] for item in everything]
+
+
+def test_received_inbox_filters_by_status(client, inbox):
+    first = client.get('/api/requests/received', headers=inbox).get_json()[0]
+    response = client.put(f"/api/requests/{first['id']}", headers=inbox, json={'status': 'accepted'})
+    assert response.status_code == 200
+
+    accepted = client.get('/api/requests/received?status=accepted', headers=inbox).get_json()
+    assert [item['id'] for item in accepted] == [first['id']]
+    assert len(client.get('/api/requests/received?status=pending', headers=inbox).get_json()) == 3
+    assert len(client.get('/api/requests/received?status=all', headers=inbox).get_json()) == 4
+
+
+def test_inbox_is_only_the_owners(client, register, inbox):
+    dave = {'Authorization': f'Bearer {register(name="Dave Example", email="dave@example.com")}'}
+    assert client.get('/api/requests/received', headers=dave).get_json() == []
+
+
+def test_field_tree_projects_nested_keys():
+    tree = build_field_tree({'id', 'skill.name', 'skill.owner.id'})
+    assert tree == {'id': None, 'skill': {'name': None, 'owner': {'id': None}}}
+    data = {'id': 1, 'status': 'pending', 'skill': {'name': 'Guitar', 'level': 'beginner', 'owner': {'id': 7, 'bio': ''}}}
+    assert project([data], tree) == [{'id': 1, 'skill': {'name': 'Guitar', 'owner': {'id': 7}}}]
+
+
+def test_sparse_fields_and_expansions(client, inbox):
+    items = client.get('/api/requests/received?fields=id,status,skill.name', headers=inbox).get_json()
+    assert {tuple(sorted(item)) for item in items} == {('id', 'skill', 'status')}
+    assert {item['skill']['name'] for item in items} == {'Guitar', 'Piano'}
+
+    items = client.get('/api/requests/received?expand=skill', headers=inbox).get_json()
+    assert 'requester' not in items[0] and 'owner' not in items[0]['skill']
+    assert client.get('/api/requests/received?expand=nope', headers=inbox).status_code == 400
+
+
+def test_sideloaded_users_appear_once(client, inbox):
+    body = client.get('/api/requests/received?sideload=users', headers=inbox).get_json()
+    assert len(body['requests']) == 4
+    assert sorted(user['name'] for user in body['users'].values()) == ['Alice Example', 'Bob Example', 'Carol Example']
+    for item in body['requests']:
+        assert 'requester' not in item and 'owner' not in item['skill']
+        assert str(item['requester_id']) in body['users']
+
+
+def test_fast_json_matches_the_default_encoder(app):
+    payload = {'b': [1, 2.5, None], 'a': {'when': datetime(2026, 1, 2, 3, 4, 5)}, 'ids': {3: 'three', 10: 'ten'}, 'text': 'caf\u00e9'}
+    provider = FastJSONProvider(app)
+    assert json.loads(provider.dumps(payload)) == json.loads(super(FastJSONProvider, provider).dumps(payload))
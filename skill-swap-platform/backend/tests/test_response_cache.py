@@ -0,0 +1,55 @@
+from werkzeug.datastructures import MultiDict
+
+from cache import LocalCache, ResponseCache, normalize_params
+
+
+def test_invalidation_is_per_namespace():
+    cache = ResponseCache(LocalCache())
+    skills = cache.make_key('skills', '/api/skills', '')
+    categories = cache.make_key('categories', '/api/categories', '')
+    cache.set(skills, b'skills')
+    cache.set(categories, b'categories')
+
+    cache.invalidate('skills')
+    assert cache.make_key('skills', '/api/skills', '') != skills
+    assert cache.get(cache.make_key('skills', '/api/skills', '')) is None
+    assert cache.get(cache.make_key('categories', '/api/categories', '')) == b'categories'
+
+
+def test_eviction_keeps_generations():
+    backend = LocalCache(max_entries=2)
+    cache = ResponseCache(backend)
+    cache.invalidate('skills')
+    for i in range(3):
+        cache.set(cache.make_key('tags', '/api/tags', f'limit={i}'), b'[]')
+    assert backend.stats()['entries'] == 2
+    assert backend.get_counter('generation:skills') == 1
+
+
+def test_params_are_normalized():
+    args = MultiDict([('search', ' Guitar  Basics'), ('page', '1'), ('junk', 'x'), ('category', 'music')])
+    assert normalize_params(
+        args, ('page', 'category', 'search'), defaults={'page': '1'}, case_insensitive=('search',)
+    ) == 'category=music&search=guitar basics'
+
+
+def test_anonymous_reads_are_cached(client, register):
+    assert client.get('/api/categories').headers['X-Cache'] == 'MISS'
+    assert client.get('/api/categories').headers['X-Cache'] == 'HIT'
+    headers = {'Authorization': f'Bearer {register()}'}
+    assert 'X-Cache' not in client.get('/api/skills', headers=headers).headers
+
+
+def test_writes_invalidate_the_listings_they_change(client, register):
+    headers = {'Authorization': f'Bearer {register()}'}
+    client.post('/api/skills', headers=headers, json={
+        'name': 'Guitar', 'description': 'Chords, scales and songs', 'category': 'music'
+    })
+    assert client.get('/api/skills').headers['X-Cache'] == 'MISS'
+    assert client.get('/api/skills').headers['X-Cache'] == 'HIT'
+    assert client.get('/api/categories').get_json() == [{'name': 'music', 'count': 1}]
+
+    assert client.put('/api/profile', headers=headers, json={'name': 'Alice Renamed'}).status_code == 200
+    response = client.get('/api/skills')
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.get_json()['skills'][0]['owner']['name'] == 'Alice Renamed'
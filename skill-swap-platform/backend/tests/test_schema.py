@@ -0,0 +1,301 @@
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from flask_migrate import downgrade, upgrade
+from sqlalchemy import event, inspect, text
+
+import config
+import search as skill_search
+from aggregates import rebuild_rating_aggregates, rebuild_tag_usage, rebuild_user_stats
+from app import create_app
+from database import all_engines
+from extensions import db
+from helpers import get_skill_filters, skill_listing_query
+from models import Request, Skill, Tag, User, UserStats
+from schema import detect_revision, include_object, upgrade_schema
+from synthetic import Volumes, generate
+
+
+@pytest.fixture
+def empty_file_app(tmp_path):
+    app = create_app(dict(
+        config.TESTING, SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'test.db'}", SQLITE_READ_POOL=False
+    ))
+    with app.app_context():
+        yield app
+        db.session.remove()
+        for engine in all_engines(db):
+            engine.dispose()
+
+
+HEAD_REVISION = '0012'
+
+
+def schema_diff():
+    with db.engine.connect() as connection:
+        context = MigrationContext.configure(connection, opts={'include_object': include_object})
+        return compare_metadata(context, db.metadata)
+
+
+def revision():
+    with db.engine.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision()
+
+
+def test_migrations_build_the_model_schema(empty_file_app):
+    upgrade_schema(db)
+    assert schema_diff() == []
+    with db.engine.connect() as connection:
+        if skill_search.supports_fts5(connection):
+            assert skill_search.FTS_TABLE in inspect(connection).get_table_names()
+
+    downgrade(revision='base')
+    assert inspect(db.engine).get_table_names() == ['alembic_version']
+
+
+# The original app's db.create_all() schema, as SQLite stores it
+BASELINE_SCHEMA = (
+    """CREATE TABLE user (
+        id INTEGER NOT NULL, name VARCHAR(100) NOT NULL, email VARCHAR(120) NOT NULL,
+        password_hash VARCHAR(200) NOT NULL, bio TEXT, role VARCHAR(20), avatar_url VARCHAR(255),
+        is_active BOOLEAN, last_login DATETIME, created_at DATETIME, updated_at DATETIME,
+        PRIMARY KEY (id)
+    )""",
+    'CREATE INDEX ix_user_created_at ON user (created_at)',
+    'CREATE UNIQUE INDEX ix_user_email ON user (email)',
+    """CREATE TABLE skill (
+        id INTEGER NOT NULL, name VARCHAR(100) NOT NULL, description TEXT, category VARCHAR(50),
+        level VARCHAR(20), tags TEXT, duration_estimate VARCHAR(50), prerequisites TEXT,
+        is_active BOOLEAN, view_count INTEGER, owner_id INTEGER NOT NULL, created_at DATETIME,
+        updated_at DATETIME,
+        PRIMARY KEY (id), FOREIGN KEY(owner_id) REFERENCES user (id)
+    )""",
+    'CREATE INDEX ix_skill_created_at ON skill (created_at)',
+    'CREATE INDEX ix_skill_level ON skill (level)',
+    'CREATE INDEX ix_skill_name ON skill (name)',
+    'CREATE INDEX ix_skill_category ON skill (category)',
+    'CREATE INDEX ix_skill_owner_id ON skill (owner_id)',
+    """CREATE TABLE request (
+        id INTEGER NOT NULL, skill_id INTEGER NOT NULL, requester_id INTEGER NOT NULL, message TEXT,
+        status VARCHAR(20), priority VARCHAR(10), preferred_schedule TEXT, notes TEXT,
+        created_at DATETIME, updated_at DATETIME, completed_at DATETIME,
+        PRIMARY KEY (id), FOREIGN KEY(skill_id) REFERENCES skill (id),
+        FOREIGN KEY(requester_id) REFERENCES user (id)
+    )""",
+    'CREATE INDEX ix_request_requester_id ON request (requester_id)',
+    'CREATE INDEX ix_request_created_at ON request (created_at)',
+    'CREATE INDEX ix_request_skill_id ON request (skill_id)',
+    'CREATE INDEX ix_request_status ON request (status)',
+    """CREATE TABLE review (
+        id INTEGER NOT NULL, skill_id INTEGER NOT NULL, reviewer_id INTEGER NOT NULL,
+        reviewee_id INTEGER NOT NULL, rating INTEGER NOT NULL, comment TEXT, is_public BOOLEAN,
+        created_at DATETIME,
+        PRIMARY KEY (id), FOREIGN KEY(skill_id) REFERENCES skill (id),
+        FOREIGN KEY(reviewer_id) REFERENCES user (id), FOREIGN KEY(reviewee_id) REFERENCES user (id)
+    )""",
+)
+
+
+def create_baseline_schema():
+    with db.engine.begin() as connection:
+        for statement in BASELINE_SCHEMA:
+            connection.exec_driver_sql(statement)
+
+
+def sqlite_schema():
+    """``{(type, name): columns}`` for every table and index, to compare two databases."""
+    inspector = inspect(db.engine)
+    schema = {}
+    for table in inspector.get_table_names():
+        if table == 'alembic_version':
+            continue
+        schema[('table', table)] = sorted(
+            (c['name'], str(c['type']), c['nullable']) for c in inspector.get_columns(table)
+        )
+        for index in inspector.get_indexes(table):
+            schema[('index', index['name'])] = (table, tuple(index['column_names']), bool(index['unique']))
+    return schema
+
+
+def test_initial_revision_is_the_baseline_schema(empty_file_app):
+    create_baseline_schema()
+    baseline = sqlite_schema()
+    with db.engine.begin() as connection:
+        for table in ('review', 'request', 'skill', 'user'):
+            connection.exec_driver_sql(f'DROP TABLE {table}')
+
+    upgrade(revision='0001')
+    assert sqlite_schema() == baseline
+
+
+def test_baseline_database_is_adopted(empty_file_app):
+    create_baseline_schema()
+
+    upgrade_schema(db)
+    assert revision() == HEAD_REVISION
+    assert schema_diff() == []
+
+
+def test_upgrade_fills_the_read_models_from_existing_rows(empty_file_app):
+    create_baseline_schema()
+    with db.engine.begin() as connection:
+        for user_id in (1, 2, 3):
+            connection.exec_driver_sql(
+                "INSERT INTO user (id, name, email, password_hash, is_active) VALUES (?, ?, ?, 'x', 1)",
+                (user_id, f'User {user_id}', f'user{user_id}@example.com')
+            )
+        connection.exec_driver_sql(
+            "INSERT INTO skill (id, name, description, tags, is_active, owner_id) VALUES "
+            "(1, 'Guitar', 'Chords and scales', 'Music, guitar', 1, 1), "
+            "(2, 'Piano', 'Sight reading', '[\"music\", \"piano\"]', 1, 1), "
+            "(3, 'Old course', 'Retired', 'music', 0, 2)"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO request (skill_id, requester_id, status) VALUES "
+            "(1, 2, 'completed'), (2, 2, 'pending'), (1, 3, 'completed'), (3, 1, 'rejected')"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO review (skill_id, reviewer_id, reviewee_id, rating) VALUES (1, 2, 1, 5), (1, 3, 1, 4)"
+        )
+
+    upgrade_schema(db)
+
+    def read_models():
+        return (
+            db.session.query(User.id, User.rating_sum, User.rating_count, User.rating_5).order_by(User.id).all(),
+            db.session.query(Skill.id, Skill.rating_sum, Skill.rating_4).order_by(Skill.id).all(),
+            db.session.query(
+                UserStats.user_id, UserStats.skills_offered, UserStats.requests_received,
+                UserStats.requests_sent, UserStats.completed_sessions
+            ).order_by(UserStats.user_id).all(),
+            db.session.query(Tag.name, Tag.usage_count).order_by(Tag.name).all()
+        )
+
+    migrated = read_models()
+    assert migrated[0][0] == (1, 9, 2, 1)
+    assert migrated[3] == [('guitar', 1), ('music', 2), ('piano', 1)]
+    rebuild_rating_aggregates()
+    rebuild_user_stats()
+    rebuild_tag_usage()
+    assert read_models() == migrated
+
+    with db.engine.connect() as connection:
+        if skill_search.supports_fts5(connection):
+            matches = connection.exec_driver_sql(
+                f"SELECT rowid FROM {skill_search.FTS_TABLE} WHERE {skill_search.FTS_TABLE} MATCH 'chords'"
+            ).scalars().all()
+            assert matches == [1]
+
+
+@pytest.mark.parametrize('built_at', ['0002', '0006', '0009', '0010'])
+def test_unversioned_database_is_stamped_with_the_revision_it_matches(empty_file_app, built_at):
+    # A database made by db.create_all() of a later app version, before migrations existed
+    upgrade(revision=built_at)
+    with db.engine.begin() as connection:
+        connection.execute(text('DROP TABLE alembic_version'))
+        assert detect_revision(connection) == built_at
+
+    upgrade_schema(db)
+    assert revision() == HEAD_REVISION
+    assert schema_diff() == []
+
+
+def test_migrate_tags_upgrades_and_relinks(empty_file_app):
+    create_baseline_schema()
+    runner = empty_file_app.test_cli_runner()
+    assert runner.invoke(args=['migrate-tags']).exit_code == 0
+    assert revision() == HEAD_REVISION
+    assert schema_diff() == []
+
+    # Imported with raw SQL, so no tag links yet
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql("INSERT INTO user (id, name, email, password_hash) VALUES (1, 'A', 'a@example.com', 'x')")
+        connection.exec_driver_sql(
+            "INSERT INTO skill (id, name, tags, is_active, owner_id) VALUES (1, 'Guitar', 'Music, Strings', 1, 1)"
+        )
+    assert runner.invoke(args=['migrate-tags']).exit_code == 0
+    assert db.session.query(Tag.name, Tag.usage_count).order_by(Tag.name).all() == [('music', 1), ('strings', 1)]
+
+
+def query_plans(run):
+    """``EXPLAIN QUERY PLAN`` of every SELECT or UPDATE ``run()`` executes, one string each."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip()[:6].upper() in ('SELECT', 'UPDATE'):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        run()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    connection = db.session.connection()
+    return [
+        '\n'.join(row[-1] for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters))
+        for statement, parameters in statements
+    ]
+
+
+@pytest.fixture
+def seeded(app):
+    generate(Volumes(users=30, skills=120, requests=300, reviews=60), seed=5, log=lambda message: None)
+
+
+def listing_plan(app, query_string):
+    with app.test_request_context(f'/api/skills?{query_string}'):
+        query, order_by = skill_listing_query(*get_skill_filters())
+        return query_plans(lambda: query.order_by(*order_by).limit(20).all())[0]
+
+
+@pytest.mark.parametrize('query_string, index', [
+    ('', 'ix_skill_active_created'),
+    ('category=programming', 'ix_skill_active_category_created'),
+    ('level=beginner', 'ix_skill_active_level_created'),
+])
+def test_skill_listing_reads_in_index_order(app, seeded, query_string, index):
+    plan = listing_plan(app, query_string)
+    assert f'USING INDEX {index}' in plan, plan
+    assert 'TEMP B-TREE' not in plan, plan
+
+
+def test_sent_requests_read_in_index_order(app, seeded):
+    query = Request.query.filter_by(requester_id=3).order_by(Request.created_at.desc(), Request.id.desc())
+    plan = query_plans(lambda: query.all())[0]
+    assert 'USING INDEX ix_request_requester_created' in plan, plan
+    assert 'TEMP B-TREE' not in plan, plan
+
+
+def test_pending_lookup_uses_the_partial_index(app, seeded):
+    query = Request.query.filter_by(skill_id=7, requester_id=3, status='pending')
+    plan = query_plans(lambda: query.first())[0]
+    assert 'USING INDEX uq_request_pending' in plan, plan
+
+
+def test_rating_rebuild_uses_covering_indexes(app, seeded):
+    plans = query_plans(lambda: rebuild_rating_aggregates(user_ids=[2, 3], skill_ids=[4, 5]))
+    combined = '\n'.join(plans)
+    assert 'USING COVERING INDEX ix_review_reviewee_rating' in combined, combined
+    assert 'USING COVERING INDEX ix_review_skill_rating' in combined, combined
+    assert 'SCAN review' not in combined, combined
+
+
+def test_one_pending_request_per_skill_and_requester(client, register):
+    owner = {'Authorization': f'Bearer {register()}'}
+    requester = {'Authorization': f'Bearer {register(name="Bob Example", email="bob@example.com")}'}
+    skill = client.post('/api/skills', headers=owner, json={
+        'name': 'Guitar', 'description': 'Chords, scales and songs'
+    }).get_json()['skill']
+
+    first = client.post('/api/requests', headers=requester, json={'skillId': skill['id']})
+    assert first.status_code == 201
+    duplicate = client.post('/api/requests', headers=requester, json={'skillId': skill['id']})
+    assert duplicate.status_code == 400
+    assert duplicate.get_json()['error'] == 'You already have a pending request for this skill'
+
+    # Once answered, the pair is free again
+    request_id = first.get_json()['request']['id']
+    assert client.put(f'/api/requests/{request_id}', headers=owner, json={'status': 'rejected'}).status_code == 200
+    assert client.post('/api/requests', headers=requester, json={'skillId': skill['id']}).status_code == 201
+    sent = client.get('/api/requests/sent', headers=requester).get_json()
+    assert [req['status'] for req in sent] == ['pending', 'rejected']
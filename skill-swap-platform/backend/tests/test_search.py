@@ -0,0 +1,79 @@
+import pytest
+
+import search as skill_search
+from extensions import db
+from models import Skill
+
+
+@pytest.fixture
+def owner(client, register):
+    headers = {'Authorization': f'Bearer {register()}'}
+
+    def create(name, description, tags=''):
+        response = client.post('/api/skills', headers=headers, json={
+            'name': name, 'description': description, 'tags': tags
+        })
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()['skill']['id']
+    create.headers = headers
+    return create
+
+
+def search(client, terms):
+    response = client.get('/api/skills', query_string={'search': terms})
+    assert response.status_code == 200
+    return [skill['name'] for skill in response.get_json()['skills']]
+
+
+def indexed_ids(terms):
+    statement = f'SELECT rowid FROM {skill_search.FTS_TABLE} WHERE {skill_search.FTS_TABLE} MATCH :query'
+    return db.session.execute(db.text(statement), {'query': skill_search.build_match_query(terms)}).scalars().all()
+
+
+def test_build_match_query_quotes_prefix_terms():
+    assert skill_search.build_match_query('Guitar, "basics" OR') == '"guitar"* "basics"* "or"*'
+    assert skill_search.build_match_query(' -*- ') is None
+
+
+def test_search_matches_prefixes_and_ranks_names_first(client, owner):
+    owner('Jazz Piano', 'Voicings for guitarists moving to keys')
+    owner('Guitar Basics', 'Chords, strumming and your first songs')
+    owner('Cooking', 'Knife skills and simple weeknight dinners', tags='kitchen')
+
+    assert search(client, 'guit') == ['Guitar Basics', 'Jazz Piano']
+    assert search(client, 'kitchen') == ['Cooking']
+    assert search(client, '"guitar" *') == ['Guitar Basics', 'Jazz Piano']
+    assert search(client, 'violin') == []
+
+
+def test_index_follows_skill_writes(client, owner):
+    skill_id = owner('Guitar Basics', 'Chords, strumming and your first songs')
+    assert indexed_ids('guitar') == [skill_id]
+
+    response = client.put(f'/api/skills/{skill_id}', headers=owner.headers, json={'name': 'Ukulele Basics'})
+    assert response.status_code == 200
+    assert indexed_ids('guitar') == []
+    assert search(client, 'ukulele') == ['Ukulele Basics']
+
+    assert client.delete(f'/api/skills/{skill_id}', headers=owner.headers).status_code == 200
+    assert indexed_ids('ukulele') == []
+
+
+def test_rebuild_restores_a_dropped_index(app, owner):
+    skill_id = owner('Guitar Basics', 'Chords, strumming and your first songs')
+    db.session.execute(db.text(f'DROP TABLE {skill_search.FTS_TABLE}'))
+    assert skill_search.rebuild(db.session)
+    assert skill_search.is_available(db.session)
+    assert indexed_ids('chords') == [skill_id]
+
+
+def test_match_drives_the_count_query(app, owner):
+    owner('Guitar Basics', 'Chords, strumming and your first songs')
+    matches = skill_search.matching_skills(skill_search.build_match_query('guitar'))
+    listing = Skill.query.filter_by(is_active=True).join(matches, matches.c.skill_id == Skill.id)
+    # The count paginate runs; scanning skill first would run the MATCH once per active skill
+    count = db.select(db.func.count()).select_from(listing.subquery())
+    sql = count.compile(db.engine, compile_kwargs={'literal_binds': True})
+    plan = [row[-1] for row in db.session.execute(db.text(f'EXPLAIN QUERY PLAN {sql}'))]
+    assert plan[0].startswith(f'SCAN {skill_search.FTS_TABLE}'), plan
+    assert db.session.execute(count).scalar() == 1
@@ -0,0 +1,68 @@
+import pytest
+
+from aggregates import diff_platform_counters, rebuild_user_stats, repair_platform_counters
+from extensions import db
+from models import Review, UserStats
+
+
+@pytest.fixture
+def seeded_counters(app):
+    """Counters as on a database that has been through its first admin stats read."""
+    repair_platform_counters()
+    db.session.commit()
+
+
+@pytest.fixture
+def session(client, register):
+    """Alice offers two skills; Bob requests both and Alice completes one."""
+    alice = {'Authorization': f'Bearer {register()}'}
+    bob = {'Authorization': f'Bearer {register(name="Bob Example", email="bob@example.com")}'}
+    request_ids = []
+    for name in ('Guitar', 'Piano'):
+        skill = client.post('/api/skills', headers=alice, json={
+            'name': name, 'description': 'Lessons for beginners', 'category': 'music'
+        }).get_json()['skill']
+        request_ids.append(client.post('/api/requests', headers=bob, json={'skillId': skill['id']}).get_json()['request']['id'])
+    assert client.put(f'/api/requests/{request_ids[0]}', headers=alice, json={'status': 'completed'}).status_code == 200
+    return alice, bob
+
+
+def stored_stats():
+    return db.session.query(
+        UserStats.user_id, UserStats.skills_offered, UserStats.requests_received,
+        UserStats.requests_sent, UserStats.completed_sessions
+    ).order_by(UserStats.user_id).all()
+
+
+def test_dashboard_follows_writes(client, session):
+    alice, bob = session
+    stats = client.get('/api/stats/dashboard', headers=alice).get_json()
+    assert (stats['skills_offered'], stats['requests_received'], stats['requests_sent']) == (2, 2, 0)
+    # Completed sessions are counted for the learner
+    stats = client.get('/api/stats/dashboard', headers=bob).get_json()
+    assert (stats['requests_sent'], stats['completed_sessions']) == (2, 1)
+
+    stored = stored_stats()
+    rebuild_user_stats()
+    assert stored_stats() == stored
+
+
+def test_dashboard_rating_comes_from_the_aggregates(client, session):
+    alice, _ = session
+    skill_id = client.get('/api/skills/my-skills', headers=alice).get_json()[0]['id']
+    for rating in (4, 5):
+        db.session.add(Review(skill_id=skill_id, reviewer_id=2, reviewee_id=1, rating=rating))
+    db.session.commit()
+    stats = client.get('/api/stats/dashboard', headers=alice).get_json()
+    assert (stats['average_rating'], stats['total_reviews']) == (4.5, 2)
+
+
+def test_admin_stats_are_kept_by_the_writes(client, seeded_counters, session, login_admin):
+    stats = client.get('/api/admin/stats', headers=login_admin()).get_json()
+    assert stats == {
+        'total_users': 3, 'active_users': 3,
+        'total_skills': 2, 'active_skills': 2,
+        'total_requests': 2, 'pending_requests': 1, 'completed_requests': 1,
+        'categories': [['music', 2]],
+    }
+    assert diff_platform_counters() == {}
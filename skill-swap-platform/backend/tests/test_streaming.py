@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from extensions import db
+from models import Request, Skill, User
+
+
+@pytest.fixture
+def catalog(app, register):
+    """Five skills with a request each, streamed in batches of two."""
+    register()
+    register(name='Bob Example', email='bob@example.com')
+    owner, requester = [user.id for user in User.query.order_by(User.id)]
+    for i in range(5):
+        skill = Skill(name=f'Skill {i}', description='A skill to stream', owner_id=owner)
+        db.session.add(skill)
+        db.session.flush()
+        db.session.add(Request(skill_id=skill.id, requester_id=requester))
+    db.session.commit()
+    app.config['STREAM_BATCH_SIZE'] = 2
+
+
+def newest_first(model):
+    return [row.id for row in db.session.query(model.id).order_by(model.created_at.desc(), model.id.desc())]
+
+
+@pytest.mark.parametrize('path, model', [('/api/admin/skills', Skill), ('/api/admin/requests', Request)])
+def test_admin_lists_stream_a_json_array(client, login_admin, catalog, path, model):
+    response = client.get(path, headers=login_admin())
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == 'application/json'
+    assert [item['id'] for item in json.loads(response.get_data())] == newest_first(model)
+
+
+def test_ndjson_is_opt_in(client, login_admin, catalog):
+    headers = login_admin()
+    for query_string, accept in (({'format': 'ndjson'}, '*/*'), ({}, 'application/x-ndjson')):
+        response = client.get('/api/admin/skills', query_string=query_string, headers=dict(headers, Accept=accept))
+        assert response.mimetype == 'application/x-ndjson'
+        lines = response.get_data(as_text=True).splitlines()
+        assert [json.loads(line)['id'] for line in lines] == newest_first(Skill)
+
+
+def test_empty_stream_is_an_empty_array(client, login_admin):
+    response = client.get('/api/admin/skills', headers=login_admin())
+    assert response.get_json() == []
+
+
+def test_streams_are_admin_only(client, register, catalog):
+    headers = {'Authorization': f'Bearer {register(name="Carol Example", email="carol@example.com")}'}
+    assert client.get('/api/admin/skills', headers=headers).status_code == 403
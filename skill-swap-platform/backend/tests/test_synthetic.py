@@ -0,0 +1,57 @@
+import pytest
+
+import config
+from aggregates import diff_platform_counters
+from app import create_app
+from extensions import db
+from models import Request, Review, Skill, SkillTag, User, UserStats
+from synthetic import SYNTHETIC_PASSWORD, Volumes, _step_for, generate
+
+VOLUMES = Volumes(users=50, skills=200, requests=600, reviews=100)
+
+
+def snapshot():
+    return {
+        model.__tablename__: db.session.execute(
+            db.select(model.__table__).order_by(*model.__table__.primary_key.columns)
+        ).all()
+        for model in (User, Skill, SkillTag, Request, Review, UserStats)
+    }
+
+
+def test_same_seed_gives_same_rows(app):
+    counts = generate(VOLUMES, seed=7, log=lambda message: None)
+    assert counts['user'] == 50 and counts['skill'] == 200
+    first = snapshot()
+
+    other = create_app(config.TESTING)
+    with other.app_context():
+        db.create_all()
+        generate(VOLUMES, seed=7, log=lambda message: None)
+        assert snapshot() == first
+
+
+def test_generated_data_is_consistent(app, client):
+    counts = generate(VOLUMES, seed=7, log=lambda message: None)
+    assert 0 < counts['review'] <= VOLUMES.reviews
+    assert diff_platform_counters() == {}
+
+    self_requests = db.session.query(Request).join(Request.skill).filter(
+        Skill.owner_id == Request.requester_id
+    ).count()
+    duplicates = db.session.query(Request.skill_id, Request.requester_id).group_by(
+        Request.skill_id, Request.requester_id
+    ).having(db.func.count() > 1).count()
+    assert self_requests == 0 and duplicates == 0
+
+    response = client.post('/api/auth/login', json={
+        'email': 'user2@example.com', 'password': SYNTHETIC_PASSWORD
+    })
+    assert response.status_code == 200
+
+
+def test_step_for_rejects_counts_without_a_stride():
+    assert _step_for(50) == 7919
+    assert _step_for(7919 * 3) == 7907
+    with pytest.raises(ValueError, match='No stride for 0 users'):
+        _step_for(0)
@@ -0,0 +1,74 @@
+import pytest
+
+from aggregates import rebuild_tag_usage
+from extensions import db
+from models import Tag
+from tags import parse_tags
+
+
+@pytest.fixture
+def catalog(client, register):
+    """Three music and cooking skills with overlapping tags. Returns the owner's headers."""
+    alice = {'Authorization': f'Bearer {register()}'}
+    for name, category, level, tags in (
+        ('Guitar', 'music', 'beginner', 'Music, Strings'),
+        ('Violin', 'music', 'advanced', '["strings", "classical", "music"]'),
+        ('Baking', 'cooking', 'beginner', '#Baking,  bread '),
+    ):
+        response = client.post('/api/skills', headers=alice, json={
+            'name': name, 'description': 'Lessons for beginners', 'category': category, 'level': level, 'tags': tags
+        })
+        assert response.status_code == 201
+    return alice
+
+
+def tagged(client, *tags):
+    response = client.get('/api/skills', query_string=[('tag', tag) for tag in tags])
+    return sorted(skill['name'] for skill in response.get_json()['skills'])
+
+
+def usage():
+    return dict(db.session.query(Tag.name, Tag.usage_count).all())
+
+
+def test_parse_tags_accepts_every_format():
+    assert parse_tags('Python,  Web Dev , python') == ['python', 'web dev']
+    assert parse_tags('["#Python", "web"]') == ['python', 'web']
+    assert parse_tags(['Python', '']) == ['python']
+    assert parse_tags(None) == []
+
+
+def test_tag_filter_matches_exactly_and_combines(client, catalog):
+    assert tagged(client, 'strings') == ['Guitar', 'Violin']
+    assert tagged(client, 'STRINGS', 'classical') == ['Violin']
+    assert tagged(client, 'string') == []
+
+
+def test_usage_counts_follow_skill_writes(client, catalog):
+    assert client.get('/api/tags').get_json()[:2] == [{'name': 'music', 'count': 2}, {'name': 'strings', 'count': 2}]
+
+    guitar = client.get('/api/skills?tag=strings&search=guitar').get_json()['skills'][0]
+    client.put(f"/api/skills/{guitar['id']}", headers=catalog, json={'tags': 'music, acoustic'})
+    assert usage()['strings'] == 1 and usage()['acoustic'] == 1
+
+    client.delete(f"/api/skills/{guitar['id']}", headers=catalog)
+    stored = usage()
+    assert stored['music'] == 1 and stored['acoustic'] == 0
+    rebuild_tag_usage()
+    assert usage() == stored
+
+
+def test_facets_count_the_alternatives(client, catalog):
+    body = client.get('/api/skills/search?category=music&tag=strings').get_json()
+    assert sorted(skill['name'] for skill in body['skills']) == ['Guitar', 'Violin']
+    facets = body['facets']
+    # Every facet keeps the tag filter, so cooking (no 'strings' tag) drops out
+    assert facets['category'] == [{'name': 'music', 'count': 2}]
+    assert facets['level'] == [{'name': 'advanced', 'count': 1}, {'name': 'beginner', 'count': 1}]
+    assert {tag['name']: tag['count'] for tag in facets['tags']} == {'music': 2, 'strings': 2, 'classical': 1}
+
+    # The level facet ignores the level filter, so 'advanced' still shows what picking it gives
+    facets = client.get('/api/skills/search?level=beginner&tag_limit=1').get_json()['facets']
+    assert facets['category'] == [{'name': 'cooking', 'count': 1}, {'name': 'music', 'count': 1}]
+    assert facets['level'] == [{'name': 'beginner', 'count': 2}, {'name': 'advanced', 'count': 1}]
+    assert len(facets['tags']) == 1
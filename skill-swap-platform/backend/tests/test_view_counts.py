@@ -0,0 +1,47 @@
+import pytest
+
+from extensions import db, view_counter
+from models import Skill
+
+
+@pytest.fixture
+def skill_id(client, register):
+    owner = {'Authorization': f'Bearer {register()}'}
+    response = client.post('/api/skills', headers=owner, json={'name': 'Guitar', 'description': 'Chords, scales and songs'})
+    return response.get_json()['skill']['id']
+
+
+def test_revalidated_view_is_counted(client, skill_id):
+    etag = client.get(f'/api/skills/{skill_id}').headers['ETag']
+    assert client.get(f'/api/skills/{skill_id}', headers={'If-None-Match': etag}).status_code == 304
+    assert view_counter.pending(skill_id) == 2
+
+
+@pytest.mark.parametrize('missing', ['deleted', 'inactive', 'unknown'])
+def test_views_of_missing_skills_are_not_counted(client, skill_id, missing):
+    etag = client.get(f'/api/skills/{skill_id}').headers['ETag']
+    view_counter.flush()
+    if missing == 'unknown':
+        skill_id, etag = 999, etag.replace(f'-{skill_id}-', '-999-')
+    else:
+        # Raw SQL, so the catalog watermark (and so the ETag) stays the same
+        statement = 'DELETE FROM skill' if missing == 'deleted' else 'UPDATE skill SET is_active = 0'
+        db.session.execute(db.text(f'{statement} WHERE id = :id'), {'id': skill_id})
+        db.session.commit()
+
+    response = client.get(f'/api/skills/{skill_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 404
+    assert view_counter.pending(skill_id) == 0
+
+
+def test_buffered_views_are_flushed_as_one_increment(client, skill_id):
+    for _ in range(3):
+        client.get(f'/api/skills/{skill_id}')
+    assert client.get(f'/api/skills/{skill_id}').get_json()['view_count'] == 4
+    assert db.session.get(Skill, skill_id).view_count == 0
+
+    assert view_counter.flush() == 1
+    db.session.expire_all()
+    assert db.session.get(Skill, skill_id).view_count == 4
+    assert view_counter.pending(skill_id) == 0
+    assert view_counter.metrics()['flushed_views_total'] >= 4
@@ -0,0 +1,140 @@
+"""In-process accumulator for skill view counts.
+
+Reading a skill used to commit a ``view_count += 1`` write on every request.
+Instead, views are counted in memory and flushed periodically as one batch
+of ``view_count = view_count + n`` UPDATEs. Because flushes add deltas rather
+than write absolute values, any number of worker processes can each run
+their own buffer against the same database.
+"""
+import logging
+import threading
+import time
+
+import process_hooks
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCountBuffer:
+    """Coalesce view increments and hand them to ``flush_callback`` in batches.
+
+    ``flush_callback(counts)`` receives ``{skill_id: delta}`` and must apply it
+    atomically; if it raises, the counts are put back and retried on the next
+    flush. A flush happens every ``flush_interval`` seconds, as soon as
+    ``max_pending`` views have been buffered, and at interpreter exit.
+    """
+
+    def __init__(self, flush_callback, flush_interval=5.0, max_pending=1000):
+        self.flush_callback = flush_callback
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._reset()
+        # Views buffered before a fork belong to the parent; the child starts empty
+        process_hooks.register(self, after_fork='_reset', at_exit='close')
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._pending = {}
+        self._pending_total = 0
+        self._oldest_pending = None
+        self.flushed_total = 0
+        self.flush_count = 0
+        self.flush_errors = 0
+        self.last_flush_at = None
+        self.last_flush_duration = 0.0
+
+    def increment(self, skill_id, amount=1):
+        """Record views and return how many are buffered for this skill."""
+        with self._lock:
+            pending = self._pending.get(skill_id, 0) + amount
+            self._pending[skill_id] = pending
+            self._pending_total += amount
+            if self._oldest_pending is None:
+                self._oldest_pending = time.monotonic()
+            should_wake = self._pending_total >= self.max_pending
+            self._ensure_thread()
+        if should_wake:
+            self._wake.set()
+        return pending
+
+    def pending(self, skill_id):
+        with self._lock:
+            return self._pending.get(skill_id, 0)
+
+    def flush(self):
+        """Write buffered views now; returns the number of skills updated."""
+        with self._flush_lock:
+            with self._lock:
+                counts, self._pending = self._pending, {}
+                total, self._pending_total = self._pending_total, 0
+                oldest, self._oldest_pending = self._oldest_pending, None
+            if not counts:
+                return 0
+
+            started = time.monotonic()
+            try:
+                self.flush_callback(counts)
+            except Exception as e:
+                self.flush_errors += 1
+                logger.error(f"Failed to flush {total} buffered views: {str(e)}")
+                with self._lock:
+                    for skill_id, amount in counts.items():
+                        self._pending[skill_id] = self._pending.get(skill_id, 0) + amount
+                    self._pending_total += total
+                    if self._oldest_pending is None or oldest < self._oldest_pending:
+                        self._oldest_pending = oldest
+                return 0
+
+            self.flushed_total += total
+            self.flush_count += 1
+            self.last_flush_at = time.time()
+            self.last_flush_duration = time.monotonic() - started
+            return len(counts)
+
+    def lag(self):
+        """Seconds since the oldest view that has not been written yet (0 when empty)."""
+        with self._lock:
+            if self._oldest_pending is None:
+                return 0.0
+            return time.monotonic() - self._oldest_pending
+
+    def metrics(self):
+        with self._lock:
+            pending_views = self._pending_total
+            pending_skills = len(self._pending)
+        return {
+            'pending_views': pending_views,
+            'pending_skills': pending_skills,
+            'flush_lag_seconds': round(self.lag(), 3),
+            'flushed_views_total': self.flushed_total,
+            'flushes_total': self.flush_count,
+            'flush_errors_total': self.flush_errors,
+            'last_flush_duration_seconds': round(self.last_flush_duration, 4),
+        }
+
+    def close(self):
+        """Stop the background thread and write whatever is still buffered."""
+        self._stopped.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def _ensure_thread(self):
+        # Started lazily so a preloading master process never owns the thread
+        if self._thread is None and not self._stopped.is_set():
+            self._thread = threading.Thread(target=self._run, name='view-count-flusher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._stopped.is_set():
+                break
+            self.flush()
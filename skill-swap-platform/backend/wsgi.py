@@ -0,0 +1,10 @@
+"""WSGI entry point for production servers: ``gunicorn -c gunicorn.conf.py wsgi:app``."""
+from app import create_app
+from extensions import db
+from schema import upgrade_schema
+
+app = create_app()
+
+# Runs once in the gunicorn master when the app is preloaded
+with app.app_context():
+    upgrade_schema(db)
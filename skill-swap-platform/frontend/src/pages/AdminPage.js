@@ -51,9 +51,10 @@ const AdminPage = () => {
   const handleDeleteUser = async (userId) => {
     if (window.confirm('Are you sure you want to delete this user? This will also delete all their skills and requests.')) {
       try {
-        await api.delete(`/api/admin/users/${userId}`);
+        // Deletion runs in the background; the account is disabled straight away
+        const response = await api.delete(`/api/admin/users/${userId}`);
         fetchData();
-        alert('User deleted successfully');
+        alert(response.data.message);
       } catch (err) {
         alert(err.response?.data?.error || 'Failed to delete user');
       }